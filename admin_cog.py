@@ -0,0 +1,280 @@
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from ai_queue import ai_queue
+from ai_service import conversation_store
+from command_guard import bot_stats, command_executing, prevent_duplicate_execution, processed_messages, user_message_cache
+from gemini_gateway import gemini_gateway
+from guild_index import member_index, voice_index
+from metrics import loop_lag_monitor, metrics
+from rate_limiter import rate_limiter
+from recruits import reminder_scheduler
+from render_coordinator import render_coordinator
+from server_context import server_context_cache
+from storage import state_store
+from tracker_client import tracker_client
+
+
+def latency_summary_text():
+    """!botstatus 用: イベントループ遅延と遅いコマンド・外部API（p95）"""
+    lines = [
+        f"ループ遅延: 直近 {loop_lag_monitor.last * 1000:.0f}ms / p95 {loop_lag_monitor.p95() * 1000:.0f}ms "
+        f"/ 最大 {loop_lag_monitor.max * 1000:.0f}ms"
+    ]
+    for labels, p95, count in metrics.slowest('bot_command_duration_seconds'):
+        lines.append(f"!{labels['command']}: p95 {p95 * 1000:.0f}ms ({count}回)")
+    for labels, p95, count in metrics.slowest('bot_view_callback_duration_seconds', n=2):
+        lines.append(f"{labels['view']}.{labels['callback']}: p95 {p95 * 1000:.0f}ms ({count}回)")
+    for name, title in (('gemini_request_duration_seconds', 'Gemini'), ('tracker_request_duration_seconds', 'Tracker.gg')):
+        slowest = metrics.slowest(name, n=1)
+        if slowest:
+            lines.append(f"{title}: p95 {slowest[0][1] * 1000:.0f}ms")
+    return "\n".join(lines)
+
+
+class Admin(commands.Cog):
+    """管理者向けの状態表示・メンテナンスコマンド（!ext は本体に残す）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='botstatus', help='Botの状態とパフォーマンスを表示します')
+    @prevent_duplicate_execution
+    async def show_bot_status(self, ctx):
+        """Botの状態を表示"""
+        try:
+            current_time = datetime.now()
+            uptime = current_time - bot_stats['start_time']
+
+            # メモリ使用量を取得
+            import psutil
+            process = psutil.Process()
+            memory_usage = process.memory_info().rss / 1024 / 1024  # MB
+            cpu_usage = process.cpu_percent()
+
+            embed = discord.Embed(
+                title="🤖 Bot ステータス",
+                color=discord.Color.green() if bot_stats['errors_count'] < 10 else discord.Color.orange(),
+                timestamp=current_time
+            )
+
+            # 稼働時間
+            embed.add_field(
+                name="⏰ 稼働時間",
+                value=f"{uptime.days}日 {uptime.seconds//3600}時間 {(uptime.seconds%3600)//60}分",
+                inline=True
+            )
+
+            # パフォーマンス
+            embed.add_field(
+                name="💾 メモリ使用量",
+                value=f"{memory_usage:.1f} MB",
+                inline=True
+            )
+
+            embed.add_field(
+                name="🖥️ CPU使用率",
+                value=f"{cpu_usage:.1f}%",
+                inline=True
+            )
+
+            # 統計情報
+            embed.add_field(
+                name="📊 処理統計",
+                value=f"実行コマンド: {bot_stats['commands_executed']:,}回\n"
+                      f"処理メッセージ: {bot_stats['messages_processed']:,}件\n"
+                      f"エラー回数: {bot_stats['errors_count']:,}回",
+                inline=False
+            )
+
+            # 接続情報
+            embed.add_field(
+                name="🌐 接続情報",
+                value=f"レイテンシ: {round(self.bot.latency * 1000)}ms\n"
+                      f"サーバー数: {len(self.bot.guilds)}\n"
+                      f"総ユーザー数: {len(self.bot.users):,}人",
+                inline=False
+            )
+
+            # 最新エラー（あれば）
+            if bot_stats['last_error']:
+                embed.add_field(
+                    name="⚠️ 最新エラー",
+                    value=f"```{bot_stats['last_error'][:100]}...```",
+                    inline=False
+                )
+
+            # キャッシュ状況
+            embed.add_field(
+                name="🗄️ キャッシュ状況",
+                value=f"処理済みメッセージ: {processed_messages.stats_text()}\n"
+                      f"ユーザーキャッシュ: {user_message_cache.stats_text()}\n"
+                      f"会話履歴: {conversation_store.stats_text()}\n"
+                      f"メンバー索引: {member_index.stats_text()}\n"
+                      f"VC索引: {voice_index.stats_text()}\n"
+                      f"AI用サーバー情報: {server_context_cache.stats_text()}\n"
+                      f"実行中コマンド: {len(command_executing)}\n"
+                      f"未保存の変更: {state_store.pending}件 (保存 {state_store.stats['flushes']}回)",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🎯 Tracker.gg キャッシュ",
+                value=tracker_client.cache_stats_text(),
+                inline=False
+            )
+
+            embed.add_field(
+                name="🔗 同時リクエスト統合",
+                value=f"{tracker_client.flight.stats_text()}\n{gemini_gateway.flight.stats_text()}\nGemini {gemini_gateway.sdk_status_text()}",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🔔 リマインダー",
+                value=reminder_scheduler.stats_text(),
+                inline=False
+            )
+
+            embed.add_field(
+                name="📝 募集メッセージ更新",
+                value=render_coordinator.stats_text(),
+                inline=False
+            )
+
+            embed.add_field(
+                name="🚦 レート制限・AIキュー",
+                value=f"{rate_limiter.stats_text()}\n{ai_queue.stats_text()}",
+                inline=False
+            )
+
+            embed.add_field(
+                name="⏱️ 応答時間",
+                value=latency_summary_text(),
+                inline=False
+            )
+
+            embed.set_footer(text=f"起動時刻: {bot_stats['start_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+            await ctx.send(embed=embed)
+
+        except ImportError:
+            # psutil がない場合の簡易版
+            uptime = datetime.now() - bot_stats['start_time']
+
+            embed = discord.Embed(
+                title="🤖 Bot ステータス（簡易版）",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+
+            embed.add_field(
+                name="⏰ 稼働時間",
+                value=f"{uptime.days}日 {uptime.seconds//3600}時間 {(uptime.seconds%3600)//60}分",
+                inline=False
+            )
+
+            embed.add_field(
+                name="📊 処理統計",
+                value=f"実行コマンド: {bot_stats['commands_executed']:,}回\n"
+                      f"エラー回数: {bot_stats['errors_count']:,}回",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🌐 接続情報",
+                value=f"レイテンシ: {round(self.bot.latency * 1000)}ms\n"
+                      f"サーバー数: {len(self.bot.guilds)}",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🎯 Tracker.gg キャッシュ",
+                value=tracker_client.cache_stats_text(),
+                inline=False
+            )
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send(f"❌ ステータス取得エラー: {str(e)}")
+
+    @commands.command(name='cleanup', help='手動でメモリクリーンアップを実行します（管理者用）')
+    @prevent_duplicate_execution
+    async def manual_cleanup(self, ctx):
+        """手動メモリクリーンアップ"""
+        # 管理者権限チェック
+        if not ctx.author.guild_permissions.administrator:
+            await ctx.send("❌ このコマンドは管理者のみ使用できます。")
+            return
+
+        try:
+            # クリーンアップ前の状態
+            before_processed = len(processed_messages)
+            before_cache = len(user_message_cache)
+            before_history = len(conversation_store)
+
+            self.bot.cleanup_memory()
+
+            # クリーンアップ後の状態
+            after_processed = len(processed_messages)
+            after_cache = len(user_message_cache)
+            after_history = len(conversation_store)
+
+            embed = discord.Embed(
+                title="🧹 メモリクリーンアップ完了",
+                color=discord.Color.green()
+            )
+
+            embed.add_field(
+                name="📊 クリーンアップ結果",
+                value=f"処理済みメッセージ: {before_processed} → {after_processed}\n"
+                      f"ユーザーキャッシュ: {before_cache} → {after_cache}\n"
+                      f"会話履歴: {before_history} → {after_history}",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🛡️ 重複判定キャッシュ",
+                value=f"処理済みメッセージ: {processed_messages.stats_text()}\n"
+                      f"ユーザーキャッシュ: {user_message_cache.stats_text()}\n"
+                      f"※ 期限切れのみ削除（一括クリアはしません）",
+                inline=False
+            )
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send(f"❌ クリーンアップエラー: {str(e)}")
+
+    @commands.command(name='restart', help='Botを再起動します（管理者用）')
+    @prevent_duplicate_execution
+    async def restart_bot(self, ctx):
+        """Bot再起動コマンド（管理者用）"""
+        # 管理者権限チェック
+        if not ctx.author.guild_permissions.administrator:
+            await ctx.send("❌ このコマンドは管理者のみ使用できます。")
+            return
+
+        try:
+            await ctx.send("🔄 Botを再起動しています...")
+
+            # 統計情報を更新
+            bot_stats['restart_count'] += 1
+
+            # ログ出力
+            print(f"🔄 管理者 {ctx.author} によりBot再起動が要求されました")
+            print(f"📊 再起動回数: {bot_stats['restart_count']}")
+
+            # 安全な再起動処理
+            await self.bot.close()
+
+        except Exception as e:
+            await ctx.send(f"❌ 再起動エラー: {str(e)}")
+            print(f"再起動エラー: {e}")
+
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
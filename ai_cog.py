@@ -0,0 +1,326 @@
+import discord
+from discord.ext import commands
+
+from ai_service import ask_gemini, conversation_store, response_cache
+from command_guard import prevent_duplicate_execution
+from conversation_store import turn_text
+from guild_index import member_index
+from metrics import metrics
+from rate_limiter import SCOPE_NAMES, UNIT_NAMES, RateLimitExceeded, period_text, rate_limiter
+from server_context import server_context_cache
+from stream_reply import StreamingReply
+
+
+async def stream_ai_reply(ctx, profile, prompt, thinking_msg, title, color, footer):
+    """ストリーミングで生成し、考え中メッセージを生成途中の回答に順に書き換える"""
+    def render(text, index, count, streaming):
+        embed = discord.Embed(
+            title=f"{title} ({index + 1}/{count})" if count > 1 else title,
+            description=text,
+            color=color
+        )
+        embed.set_footer(text=f"{footer}（生成中...）" if streaming else footer)
+        return embed
+
+    async def send(embed):
+        return await ctx.send(embed=embed)
+
+    reply = StreamingReply(thinking_msg, send, render)
+    try:
+        await ask_gemini(profile, prompt, ctx.author, ctx.guild, thinking_msg, on_text=reply.feed)
+    except Exception as e:
+        if not reply.has_text:
+            raise  # まだ何も表示していなければ呼び出し元のエラー表示に任せる
+        await reply.finish(note=f"⚠️ 生成が途中で止まりました: {e}")
+        return
+    await reply.finish(note=None if reply.has_text else "すみません、応答を生成できませんでした。")
+    if reply.first_text_seconds is not None:
+        metrics.observe('ai_stream_first_text_seconds', reply.first_text_seconds, profile=profile)
+
+
+class AI(commands.Cog):
+    """Gemini AIのコマンド（会話履歴・応答キャッシュは ai_service にあり、再読み込みしても消えない）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='ai', help='Gemini AIと会話します（例: !ai こんにちは）')
+    @prevent_duplicate_execution
+    async def ask_ai(self, ctx, *, question):
+        """Gemini AIに質問するコマンド"""
+        try:
+            # 処理中メッセージを送信
+            thinking_msg = await ctx.send("🤔 考え中...")
+
+            # 過去の会話履歴を取得
+            channel_id = ctx.channel.id
+            context = conversation_store.context_text(channel_id)
+            history_text = f"\n\n{context}" if context else ""
+
+            # サーバー情報（サーバーごとに作った文章を変更イベントまで使い回す）
+            guild = ctx.guild
+            server_context = f"\n\n{server_context_cache.get(guild, member_index.get(guild))}" if guild else ""
+
+            # サーバー情報と履歴を含めた質問をGemini AIに送信
+            enhanced_question = f"""
+            {question}{server_context}{history_text}
+
+            指示：
+            - 質問に直接答える
+            - サーバー情報について聞かれた場合は、上記の具体的な数字を使って回答
+            - 過去の会話履歴がある場合は文脈を理解して返答
+            - 定型文や決まり文句は使わない
+            - 簡潔で自然な日本語で回答
+            - 「ちなみに〜」「他に何か〜」などの定型文は絶対に使わない
+            """
+            response = await ask_gemini('chat', enhanced_question, ctx.author, ctx.guild, thinking_msg)
+
+            # 応答が長すぎる場合は分割
+            if len(response.text) > 2000:
+                # Discordの文字数制限（2000文字）に合わせて分割
+                chunks = [response.text[i:i+1900] for i in range(0, len(response.text), 1900)]
+                await thinking_msg.delete()
+
+                for i, chunk in enumerate(chunks):
+                    embed = discord.Embed(
+                        title=f"🤖 Gemini AI の回答 ({i+1}/{len(chunks)})",
+                        description=chunk,
+                        color=discord.Color.blue()
+                    )
+                    embed.set_footer(text=f"質問者: {ctx.author.display_name}", icon_url=ctx.author.avatar.url if ctx.author.avatar else ctx.author.default_avatar.url)
+                    await ctx.send(embed=embed)
+            else:
+                # 通常の応答
+                embed = discord.Embed(
+                    title="🤖 Gemini AI の回答",
+                    description=response.text,
+                    color=discord.Color.blue()
+                )
+                embed.set_footer(text=f"質問者: {ctx.author.display_name}", icon_url=ctx.author.avatar.url if ctx.author.avatar else ctx.author.default_avatar.url)
+                await thinking_msg.edit(content="", embed=embed)
+
+            # 会話履歴に追加
+            conversation_store.add_turn(
+                channel_id, ctx.guild.id if ctx.guild else None, ctx.author.display_name, question, response.text
+            )
+
+        except RateLimitExceeded as e:
+            await thinking_msg.edit(content=f"⏰ {e}")
+        except Exception as e:
+            await thinking_msg.edit(content=f"❌ エラーが発生しました: {str(e)}")
+            print(f"Gemini AI エラー: {e}")
+
+    @commands.command(name='translate', help='テキストを翻訳します（例: !translate Hello）')
+    @prevent_duplicate_execution
+    async def translate_text(self, ctx, *, text):
+        """テキスト翻訳コマンド"""
+        try:
+            thinking_msg = await ctx.send("🌐 翻訳中...")
+
+            prompt = f"以下のテキストを日本語に翻訳してください。もし既に日本語の場合は英語に翻訳してください: {text}"
+
+            response = await ask_gemini('translate', prompt, ctx.author, ctx.guild, thinking_msg, cache=True)
+
+            embed = discord.Embed(
+                title="🌐 翻訳結果",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="原文", value=text[:1000], inline=False)
+            embed.add_field(name="翻訳", value=response.text[:1000], inline=False)
+            embed.set_footer(text=f"翻訳者: {ctx.author.display_name}")
+
+            await thinking_msg.edit(content="", embed=embed)
+
+        except RateLimitExceeded as e:
+            await thinking_msg.edit(content=f"⏰ {e}")
+        except Exception as e:
+            await thinking_msg.edit(content=f"❌ 翻訳エラー: {str(e)}")
+
+    @commands.command(name='summarize', help='テキストを要約します（例: !summarize 長いテキスト...）')
+    @prevent_duplicate_execution
+    async def summarize_text(self, ctx, *, text):
+        """テキスト要約コマンド"""
+        try:
+            thinking_msg = await ctx.send("📝 要約中...")
+
+            prompt = f"以下のテキストを分かりやすく要約してください（日本語で回答）: {text}"
+
+            response = await ask_gemini('summarize', prompt, ctx.author, ctx.guild, thinking_msg, cache=True)
+
+            embed = discord.Embed(
+                title="📝 要約結果",
+                description=response.text,
+                color=discord.Color.orange()
+            )
+            embed.set_footer(text=f"要約依頼者: {ctx.author.display_name}")
+
+            await thinking_msg.edit(content="", embed=embed)
+
+        except RateLimitExceeded as e:
+            await thinking_msg.edit(content=f"⏰ {e}")
+        except Exception as e:
+            await thinking_msg.edit(content=f"❌ 要約エラー: {str(e)}")
+
+    @commands.command(name='expert', help='専門的な質問に詳しく回答します（例: !expert 量子コンピュータについて）')
+    @prevent_duplicate_execution
+    async def expert_mode(self, ctx, *, question):
+        """エキスパートモード - より詳細で専門的な回答"""
+        try:
+            thinking_msg = await ctx.send("🎓 専門家として考え中...")
+
+            # 専門的なプロンプト
+            expert_prompt = f"""
+            あなたは専門知識を持つエキスパートです。以下の質問に対して、詳細で正確な回答をしてください：
+
+            質問: {question}
+
+            回答の形式:
+            1. 概要説明
+            2. 詳細な解説
+            3. 具体例（可能であれば）
+            4. 関連する重要なポイント
+
+            日本語で分かりやすく、かつ専門的に回答してください。
+            """
+
+            # 生成途中から表示し、長い回答は1900文字ごとに次の埋め込みへ続ける
+            await stream_ai_reply(ctx, 'expert', expert_prompt, thinking_msg, "🎓 エキスパート回答",
+                                  discord.Color.gold(), f"専門分野の質問者: {ctx.author.display_name}")
+
+        except RateLimitExceeded as e:
+            await thinking_msg.edit(content=f"⏰ {e}")
+        except Exception as e:
+            await thinking_msg.edit(content=f"❌ エキスパートモードエラー: {str(e)}")
+
+    @commands.command(name='creative', help='創作や想像力を使った回答をします（例: !creative 未来の世界を描いて）')
+    @prevent_duplicate_execution
+    async def creative_mode(self, ctx, *, prompt):
+        """クリエイティブモード - 創造性重視の回答"""
+        try:
+            thinking_msg = await ctx.send("🎨 創作中...")
+
+            # 創造的なプロンプト
+            creative_prompt = f"""
+            あなたは創造性豊かなクリエイターです。以下のテーマについて、想像力を働かせて魅力的で独創的な内容を作成してください：
+
+            テーマ: {prompt}
+
+            自由な発想で、面白く、印象的な内容にしてください。日本語で回答してください。
+            """
+
+            # 生成途中から表示し、長い回答は1900文字ごとに次の埋め込みへ続ける
+            await stream_ai_reply(ctx, 'creative', creative_prompt, thinking_msg, "🎨 クリエイティブ作品",
+                                  discord.Color.purple(), f"クリエイター: {ctx.author.display_name}")
+
+        except RateLimitExceeded as e:
+            await thinking_msg.edit(content=f"⏰ {e}")
+        except Exception as e:
+            await thinking_msg.edit(content=f"❌ クリエイティブモードエラー: {str(e)}")
+
+    @commands.command(name='history', help='このチャンネルの会話履歴を表示します')
+    @prevent_duplicate_execution
+    async def show_history(self, ctx):
+        """会話履歴を表示"""
+        channel_id = ctx.channel.id
+
+        record = conversation_store.get(channel_id)
+        if not record or not (record['turns'] or record['summary']):
+            await ctx.send("📝 このチャンネルには会話履歴がありません。")
+            return
+
+        embed = discord.Embed(
+            title="📝 会話履歴",
+            color=discord.Color.gold(),
+            timestamp=ctx.message.created_at
+        )
+
+        # 履歴を文字列として整理（要約＋最新10件）
+        lines = []
+        if record['summary']:
+            lines.append(f"📚 **これまでの要約**\n{record['summary']}\n")
+        lines.extend(turn_text(turn) for turn in record['turns'][-10:])
+        history_text = "\n".join(lines)
+
+        if len(history_text) > 4000:
+            # 長すぎる場合は分割
+            chunks = [history_text[i:i+1900] for i in range(0, len(history_text), 1900)]
+            for i, chunk in enumerate(chunks):
+                embed = discord.Embed(
+                    title=f"📝 会話履歴 ({i+1}/{len(chunks)})",
+                    description=chunk,
+                    color=discord.Color.gold()
+                )
+                await ctx.send(embed=embed)
+        else:
+            embed.description = history_text
+            await ctx.send(embed=embed)
+
+    @commands.command(name='clear_history', help='このチャンネルの会話履歴をクリアします')
+    @prevent_duplicate_execution
+    async def clear_history(self, ctx):
+        """会話履歴をクリア"""
+        channel_id = ctx.channel.id
+
+        if conversation_store.clear(channel_id):
+            await ctx.send("🗑️ このチャンネルの会話履歴をクリアしました。")
+        else:
+            await ctx.send("📝 このチャンネルには会話履歴がありません。")
+
+    @commands.command(name='usage', help='AI使用量と制限情報を表示します')
+    @prevent_duplicate_execution
+    async def show_usage(self, ctx):
+        """AI使用量情報を表示"""
+        embed = discord.Embed(
+            title="🔍 AI使用量情報",
+            color=discord.Color.blue()
+        )
+
+        # 現在のレート制限状況（ユーザー/サーバー/全体のバケットの残り）
+        guild_id = ctx.guild.id if ctx.guild else None
+        rows = rate_limiter.snapshot('ai', ctx.author.id, guild_id)
+        blocked = [wait for scope, unit, remaining, limit, period, wait in rows if unit == 'requests' and wait > 0]
+        if blocked:
+            embed.add_field(
+                name="⏰ 次回利用可能まで",
+                value=f"{max(blocked):.1f}秒（サーバー・全体の枠が足りない時は順番待ちになります）",
+                inline=True
+            )
+        else:
+            embed.add_field(
+                name="✅ 利用状況",
+                value="すぐに利用可能",
+                inline=True
+            )
+
+        lines = []
+        for scope, unit, remaining, limit, period, wait in rows:
+            lines.append(f"• {SCOPE_NAMES[scope]}: {period_text(period)}に{limit:,}{UNIT_NAMES[unit]}まで（今すぐ {remaining:,}{UNIT_NAMES[unit]}）")
+        embed.add_field(
+            name="📊 制限情報",
+            value="\n".join(lines) + "\n• 軽量モデル使用中（制限緩和）",
+            inline=False
+        )
+
+        today = rate_limiter.today('ai', guild_id)
+        today_text = f"Bot全体: {today['requests']}回・約{today['tokens']:,}トークン"
+        if today['guild_requests'] is not None:
+            today_text += f"\nこのサーバー: {today['guild_requests']}回"
+        embed.add_field(name="📈 本日の使用量", value=today_text, inline=False)
+
+        embed.add_field(
+            name="💾 応答キャッシュ（同じ文章の翻訳・要約は枠を使いません）",
+            value=response_cache.stats_text(),
+            inline=False
+        )
+
+        embed.add_field(
+            name="💡 ヒント",
+            value="• 短時間に多数のリクエストを避ける\n• 長すぎる文章は分割する\n• エラー時は少し待ってから再試行",
+            inline=False
+        )
+
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(AI(bot))
@@ -0,0 +1,281 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+
+from gemini_gateway import GEMINI_MAX_CONCURRENCY, gemini_gateway, response_tokens
+from metrics import metrics
+from rate_limiter import RateLimitExceeded, rate_limiter
+
+# プロファイルごとの優先度（小さいほど先）。短い出力の軽い依頼を、出力4096トークンの重い依頼より先に流す
+PROFILE_PRIORITY = {
+    'translate': 0,
+    'mention': 0,
+    'summarize': 1,
+    'chat': 1,
+    'expert': 2,
+    'creative': 2,
+    'history': 2,
+}
+# 待ち時間がこの秒数増えるごとに優先度を1段上げる（重い依頼が後回しにされ続けないように）
+AGING_SECONDS = 30
+# 順番待ちの上限（全体・1サーバーあたり）。全体の上限はおよそ2分ぶん（12 RPM）
+MAX_QUEUE_DEPTH = 24
+MAX_GUILD_DEPTH = 8
+# 同じ依頼の「N番目」表示を編集する最短間隔（秒）
+POSITION_EDIT_INTERVAL = 3
+# 順番待ちの最大秒数（これを過ぎても実行できない依頼は断る）
+MAX_WAIT_SECONDS = 90
+
+
+class QueueFull(RateLimitExceeded):
+    """順番待ちがいっぱいで受け付けられない"""
+
+    def __init__(self, depth, scope):
+        Exception.__init__(
+            self,
+            f"AIへのリクエストが混み合っています（順番待ち{depth}件）。少し時間をおいて再度お試しください。"
+        )
+        self.wait = None
+        self.scope = scope
+        self.depth = depth
+
+
+class _Job:
+    __slots__ = ('profile', 'prompt', 'options', 'user_id', 'guild_id', 'tokens', 'priority', 'seq', 'enqueued',
+                 'deadline', 'future', 'on_position', 'position', 'notified_at')
+
+    def __init__(self, profile, prompt, options, user_id, guild_id, tokens, seq, future, on_position, max_wait):
+        self.profile = profile
+        self.prompt = prompt
+        self.options = options
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.tokens = tokens
+        self.priority = PROFILE_PRIORITY.get(profile, 1)
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.deadline = self.enqueued + max_wait
+        self.future = future
+        self.on_position = on_position
+        self.position = None
+        self.notified_at = 0.0
+
+    def rank(self, now):
+        return self.priority - int((now - self.enqueued) / AGING_SECONDS)
+
+
+class AIQueue:
+    """Gemini ゲートウェイの手前の順番待ち
+
+    受付時にユーザー枠（連投防止）を確保し、順番が来たらサーバー・全体の枠を確保して実行する。
+    優先度の高い（軽い）依頼から、同じ優先度ならサーバーを順番に回して1件ずつ流す
+    （1つのサーバーの連投で他のサーバーが待たされない）。サーバー枠を使い切った
+    サーバーの依頼は飛ばして、他のサーバーの依頼を先に流す。max_wait 秒待っても
+    実行できない依頼は RateLimitExceeded で断る。
+    """
+
+    def __init__(self, limiter=rate_limiter, run=gemini_gateway.ask, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                 max_depth=MAX_QUEUE_DEPTH, max_guild_depth=MAX_GUILD_DEPTH, max_wait=MAX_WAIT_SECONDS):
+        self.limiter = limiter
+        self.run = run
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_depth = max_depth
+        self.max_guild_depth = max_guild_depth
+        self.max_wait = max_wait
+        self._guilds = OrderedDict()  # サーバーID -> [_Job, ...]（並び順が巡回の順番）
+        self._depth = 0
+        self._running = 0
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._task = None
+        self.stats = {'submitted': 0, 'queued': 0, 'dispatched': 0, 'full': 0, 'cancelled': 0, 'expired': 0,
+                      'max_depth': 0, 'wait_seconds': 0.0}
+
+    @property
+    def depth(self):
+        return self._depth
+
+    async def submit(self, profile, prompt, user_id, guild_id=None, tokens=0, on_position=None, on_text=None):
+        """依頼を順番待ちに入れ、実行結果を返す
+
+        on_position: 順番待ちの間に「N番目」（int）、実行開始時に None を受け取る async 関数
+        on_text: 渡すとストリーミングで実行し、生成途中の断片を順に渡す
+        ユーザー枠の超過・max_wait 秒待っても実行できない場合は RateLimitExceeded、
+        順番待ちがいっぱいなら QueueFull。取り消し・期限切れの依頼はユーザー枠を戻す
+        user_id が None の依頼（会話履歴の要約などBot自身の依頼）はユーザー枠を使わない
+        """
+        jobs = self._guilds.get(guild_id, ())
+        if self._depth >= self.max_depth:
+            self.stats['full'] += 1
+            raise QueueFull(self._depth, 'global')
+        if len(jobs) >= self.max_guild_depth:
+            self.stats['full'] += 1
+            raise QueueFull(len(jobs), 'guild')
+        if user_id is not None:
+            ok, wait, scope = self.limiter.try_acquire('ai', user_id, guild_id, tokens, scopes=('user',))
+            if not ok:
+                raise RateLimitExceeded(wait, scope)
+
+        loop = asyncio.get_running_loop()
+        options = {'on_text': on_text} if on_text is not None else {}
+        job = _Job(profile, prompt, options, user_id, guild_id, tokens, next(self._seq), loop.create_future(),
+                   on_position, self.max_wait)
+        self._guilds.setdefault(guild_id, []).append(job)
+        self._depth += 1
+        self.stats['submitted'] += 1
+        self.stats['max_depth'] = max(self.stats['max_depth'], self._depth)
+        self._ensure_dispatcher(loop)
+        self._wakeup.set()
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            if self._remove(job):
+                self.stats['cancelled'] += 1
+                self._refund(job)
+                self._wakeup.set()  # 後ろの依頼の「N番目」を繰り上げる
+            raise
+
+    def _ensure_dispatcher(self, loop):
+        if self._wakeup is None or self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._dispatch())
+
+    def _remove(self, job):
+        jobs = self._guilds.get(job.guild_id)
+        if not jobs or job not in jobs:
+            return False
+        jobs.remove(job)
+        if not jobs:
+            del self._guilds[job.guild_id]
+        self._depth -= 1
+        return True
+
+    def _refund(self, job):
+        if job.user_id is not None:
+            self.limiter.refund('ai', job.user_id, job.guild_id, job.tokens, scopes=('user',))
+
+    def _expire(self, now):
+        """期限を過ぎた依頼を断り、次の期限までの秒数を返す（依頼がなければ None）"""
+        expired = [job for jobs in self._guilds.values() for job in jobs if job.deadline <= now]
+        for job in expired:
+            wait, scope = self.limiter.wait_time('ai', job.user_id, job.guild_id, job.tokens,
+                                                 scopes=('guild', 'global'))
+            self._remove(job)
+            self._refund(job)
+            self.stats['expired'] += 1
+            if not job.future.done():
+                # 枠は空いていて同時実行数で詰まっている場合も、全体の混雑として断る
+                job.future.set_exception(RateLimitExceeded(wait, scope or 'global'))
+        deadlines = [job.deadline for jobs in self._guilds.values() for job in jobs]
+        return min(deadlines) - now if deadlines else None
+
+    def _ordered(self, now):
+        """実行する順に並べた順番待ち（優先度→サーバーの巡回順→受付順）"""
+        keyed = []
+        for turn, jobs in enumerate(self._guilds.values()):
+            for job in jobs:
+                keyed.append(((job.rank(now), turn, job.seq), job))
+        keyed.sort(key=lambda item: item[0])
+        return [job for _, job in keyed]
+
+    def _next_job(self, now):
+        """(実行できる依頼, 次に試すまでの秒数)。実行できる依頼がなければ依頼は None"""
+        if self._running >= self.max_concurrency:
+            return None, None  # 実行中の依頼が終われば起こされる
+        retry = None
+        tried = set()
+        for job in self._ordered(now):
+            # 各サーバーの先頭の依頼だけ試す（同じサーバーの後ろの依頼は同じ枠で詰まる）
+            if job.guild_id in tried:
+                continue
+            tried.add(job.guild_id)
+            ok, wait, _ = self.limiter.try_acquire('ai', job.user_id, job.guild_id, job.tokens,
+                                                  scopes=('guild', 'global'))
+            if ok:
+                return job, None
+            retry = wait if retry is None else min(retry, wait)
+        return None, retry
+
+    async def _dispatch(self):
+        while True:
+            now = time.monotonic()
+            expires = self._expire(now)
+            job, retry = self._next_job(now)
+            if job is None:
+                # 空くまで待つ（新しい依頼・実行の完了で起こされる）間に「N番目」を表示する。
+                # 期限切れと、間隔待ちで出せなかった「N番目」の更新の時刻にも起きる
+                pending = self._update_positions(now)
+                self._wakeup.clear()
+                timeouts = [seconds for seconds in (retry, expires, pending) if seconds is not None]
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), min(timeouts) if timeouts else None)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._remove(job)
+            # 実行したサーバーは巡回の最後に回す
+            if job.guild_id in self._guilds:
+                self._guilds.move_to_end(job.guild_id)
+            waited = now - job.enqueued
+            self.stats['dispatched'] += 1
+            self.stats['wait_seconds'] += waited
+            if job.position is not None:
+                self.stats['queued'] += 1
+            metrics.observe('ai_queue_wait_seconds', waited, profile=job.profile)
+            self._running += 1
+            asyncio.get_running_loop().create_task(self._execute(job))
+            self._announce(job, None)
+            self._update_positions(now)
+
+    async def _execute(self, job):
+        try:
+            result = await self.run(job.profile, job.prompt, **job.options)
+            self.limiter.settle('ai', job.user_id, job.guild_id, job.tokens, response_tokens(result))
+            if not job.future.done():
+                job.future.set_result(result)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._running -= 1
+            self._wakeup.set()
+
+    def _update_positions(self, now):
+        """「N番目」を更新し、間隔待ちで出せなかった更新を出せるまでの秒数を返す（なければ None）"""
+        pending = None
+        for position, job in enumerate(self._ordered(now), start=1):
+            if job.position == position:
+                continue
+            remaining = job.notified_at + POSITION_EDIT_INTERVAL - now
+            if remaining > 0:
+                pending = remaining if pending is None else min(pending, remaining)
+                continue
+            job.notified_at = now
+            self._announce(job, position)
+        return pending
+
+    def _announce(self, job, position):
+        previous, job.position = job.position, position
+        if job.on_position is None or (position is None and previous is None):
+            return  # すぐ実行された依頼は表示を変えない
+        # Discordへの編集を待つと後ろの依頼が遅れるので、別タスクで送る
+        asyncio.get_running_loop().create_task(self._safe_notify(job.on_position, position))
+
+    @staticmethod
+    async def _safe_notify(callback, position):
+        try:
+            await callback(position)
+        except Exception as e:
+            print(f"AIキューの表示更新エラー: {e}")
+
+    def stats_text(self):
+        dispatched = self.stats['dispatched']
+        average_wait = self.stats['wait_seconds'] / dispatched if dispatched else 0
+        return (f"待ち {self._depth}件 / 実行中 {self._running} / 実行 {dispatched} (順番待ち {self.stats['queued']}・"
+                f"平均 {average_wait:.1f}秒) / 満杯で拒否 {self.stats['full']} / 期限切れ {self.stats['expired']} "
+                f"/ 最大 {self.stats['max_depth']}件")
+
+
+ai_queue = AIQueue()
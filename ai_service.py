@@ -0,0 +1,77 @@
+from ai_queue import ai_queue
+from conversation_store import ConversationStore
+from gemini_gateway import AI_PROFILES
+from rate_limiter import estimate_tokens
+from response_cache import RESPONSE_CACHE_PERSIST, ResponseCache
+from storage import state_store
+
+# AIコマンド（ai_cog）とメンションへの応答（bot.py）で共有する状態。拡張機能を再読み込みしても消えないようにここに置く
+
+# 会話履歴管理（チャンネルごと。上限を超えた古いやり取りは要約にまとめる。上限値は conversation_store.py）
+async def summarize_conversation(summary, text, guild_id):
+    """会話履歴の古いやり取りを前回までの要約とまとめる（Bot自身の依頼としてAIキューに入れる）"""
+    prompt = f"""以下はDiscordのチャンネルでの会話です。これまでの要約と新しいやり取りをまとめて、
+今後の会話の文脈として必要な内容（話題・人の名前・決まったこと）だけを日本語で300文字以内に要約してください。
+
+【これまでの要約】
+{summary or 'なし'}
+
+【新しいやり取り】
+{text}"""
+    estimated = estimate_tokens(prompt, AI_PROFILES['history']['max_output_tokens'])
+    response = await ai_queue.submit('history', prompt, None, guild_id, estimated)
+    return response.text
+
+
+conversation_store = ConversationStore(
+    lambda key: state_store.mark_dirty('conversation_history', key),
+    summarize_conversation
+)
+state_store.register('conversation_history', conversation_store.channels)
+
+
+# 翻訳・要約の応答キャッシュ（AI_CACHE_PERSIST=0 でメモリのみ）
+response_cache = ResponseCache(lambda key: state_store.mark_dirty('ai_response_cache', key))
+if RESPONSE_CACHE_PERSIST:
+    state_store.register('ai_response_cache', response_cache.entries)
+
+
+async def ask_gemini(profile, prompt, user, guild, status_message=None, cache=False, on_text=None):
+    """AIキュー経由で Gemini に問い合わせる
+
+    サーバー・全体の枠が足りない間は順番待ちになり、status_message があれば
+    「N番目」と表示して、順番が来たら元の表示に戻す。ユーザー枠の超過は
+    RateLimitExceeded、順番待ちがいっぱいなら QueueFull（RateLimitExceeded の一種）。
+    トークン数は出力上限込みで見積もって確保し、応答後に実際の使用量で精算する。
+    cache=True なら、応答キャッシュの対象の用途では同じプロンプト（指示文を含む）に
+    前回の応答を返す（枠も使わない）。on_text を渡すとストリーミングで生成し、届いた断片を順に渡す。
+    """
+    use_cache = cache and response_cache.handles(profile)
+    if use_cache:
+        cached = response_cache.get(profile, prompt)
+        if cached is not None:
+            return cached
+
+    estimated = estimate_tokens(prompt, AI_PROFILES[profile].get('max_output_tokens', 0))
+    original = status_message.content if status_message is not None else None
+
+    async def on_position(position):
+        if status_message is None:
+            return
+        if position is None:
+            if on_text is None:  # ストリーミングでは最初の断片で表示が置き換わる
+                await status_message.edit(content=original)
+        else:
+            await status_message.edit(content=f"⏳ 順番待ち中...（{position}番目）")
+
+    response = await ai_queue.submit(profile, prompt, user.id, guild.id if guild else None, estimated, on_position,
+                                     on_text=on_text)
+    if use_cache:
+        try:
+            text = response.text
+        except ValueError:
+            text = None  # 安全フィルタで止められた応答はキャッシュしない
+        if text:
+            response_cache.set(profile, prompt, text)
+    return response
+
@@ -0,0 +1,108 @@
+"""AIキュー（優先度・サーバー巡回）のベンチマーク
+
+1つのサーバーが !expert を連投している間に、他のサーバーから !translate が
+来た場合を再現し、置き換え前（各依頼が個別に RateLimiter の枠を待つ）と
+AIQueue で、プロファイル別・サーバー別の待ち時間を比べる。Gemini の応答は
+プロファイルごとの時間だけ待つ関数で置き換え、時間は scale 倍に縮めて実行する。
+
+使い方: python bench_ai_queue.py [連投する依頼数] [他サーバー数] [scale]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from ai_queue import AIQueue
+from bench_rate_limiter import scaled_limits
+from rate_limiter import RateLimiter, RateLimitExceeded
+
+# 応答にかかる秒数（実時間）
+RESPONSE_SECONDS = {'translate': 1.5, 'expert': 12.0}
+
+
+def make_run(scale):
+    async def run(profile, prompt):
+        await asyncio.sleep(RESPONSE_SECONDS[profile] / scale)
+        return None
+    return run
+
+
+async def acquire_directly(limiter, user_id, guild_id, tokens, max_wait):
+    """置き換え前の待ち方: 各依頼が枠の空く時刻まで個別に sleep して取り合う"""
+    waited = 0.0
+    while True:
+        ok, wait, scope = limiter.try_acquire('ai', user_id, guild_id, tokens)
+        if ok:
+            return waited
+        if scope == 'user' or waited + wait > max_wait:
+            raise RateLimitExceeded(wait, scope)
+        await asyncio.sleep(wait + 0.05)
+        waited += wait + 0.05
+
+
+def workload(flood, guilds):
+    """(遅延秒, プロファイル, ユーザーID, サーバーID)。サーバー0が先に連投し、他は少し後から"""
+    jobs = [(0.0, 'expert', 1000 + i, 0) for i in range(flood)]
+    for guild in range(1, guilds + 1):
+        for i in range(2):
+            jobs.append((5.0 + i * 10, 'translate', guild * 100 + i, guild))
+    return jobs
+
+
+async def run_direct(flood, guilds, scale):
+    limiter = RateLimiter(scaled_limits(scale))
+    run = make_run(scale)
+    results = []
+
+    async def job(delay, profile, user_id, guild_id):
+        await asyncio.sleep(delay / scale)
+        started = time.perf_counter()
+        try:
+            await acquire_directly(limiter, user_id, guild_id, 1000, 600 / scale)
+        except RateLimitExceeded:
+            results.append((profile, guild_id, None))
+            return
+        waited = time.perf_counter() - started
+        await run(profile, '')
+        results.append((profile, guild_id, waited * scale))
+
+    await asyncio.gather(*(job(*spec) for spec in workload(flood, guilds)))
+    return results
+
+
+async def run_queue(flood, guilds, scale):
+    queue = AIQueue(RateLimiter(scaled_limits(scale)), make_run(scale), max_concurrency=4,
+                    max_depth=100, max_guild_depth=100, max_wait=600 / scale)
+    results = []
+
+    async def job(delay, profile, user_id, guild_id):
+        await asyncio.sleep(delay / scale)
+        started = time.perf_counter()
+        try:
+            await queue.submit(profile, '', user_id, guild_id, tokens=1000)
+        except RateLimitExceeded:
+            results.append((profile, guild_id, None))
+            return
+        elapsed = time.perf_counter() - started - RESPONSE_SECONDS[profile] / scale
+        results.append((profile, guild_id, max(0.0, elapsed) * scale))
+
+    await asyncio.gather(*(job(*spec) for spec in workload(flood, guilds)))
+    return results
+
+
+def report(label, results):
+    print(label)
+    for profile in RESPONSE_SECONDS:
+        waits = [wait for name, _, wait in results if name == profile and wait is not None]
+        rejected = sum(1 for name, _, wait in results if name == profile and wait is None)
+        if waits:
+            print(f"    {profile:<10} 待ち 中央値 {statistics.median(waits):6.1f}秒 / 最大 {max(waits):6.1f}秒"
+                  f" / 拒否 {rejected}")
+
+
+if __name__ == "__main__":
+    flood = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    guilds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    scale = float(sys.argv[3]) if len(sys.argv) > 3 else 30
+    report("個別に待つ (置き換え前)", asyncio.run(run_direct(flood, guilds, scale)))
+    report("AIQueue", asyncio.run(run_queue(flood, guilds, scale)))
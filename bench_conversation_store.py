@@ -0,0 +1,66 @@
+"""会話履歴ストアのベンチマーク
+
+1. チャンネルの削除: 活発なチャンネルほど何度も会話する（Zipf分布）状況で、置き換え前
+   （チャンネルIDの小さい順に削除）と ConversationStore（最後に使われた時刻の古い順）で、
+   会話時に履歴が残っていた割合を比べる。
+2. プロンプトの大きさ: 1つのチャンネルで長く会話した時に、プロンプトに入る履歴の文字数と、
+   それまでのやり取りのうち何件が（そのまま、または要約として）文脈に残っているかを表示する。
+
+使い方: python bench_conversation_store.py [チャンネル数] [会話数]
+"""
+import asyncio
+import random
+import sys
+
+from conversation_store import MAX_CONVERSATIONS, ConversationStore
+
+
+def channel_workload(channels, turns, seed=1):
+    rng = random.Random(seed)
+    ids = [rng.randrange(10**17, 10**18) for _ in range(channels)]
+    weights = [1 / (rank + 1) for rank in range(channels)]
+    return [rng.choices(ids, weights)[0] for _ in range(turns)]
+
+
+def run_sorted_id(workload):
+    history, kept = {}, 0
+    for channel_id in workload:
+        kept += channel_id in history
+        history.setdefault(channel_id, []).append("turn")
+        if len(history) > MAX_CONVERSATIONS:
+            for old in sorted(history)[:len(history) - MAX_CONVERSATIONS]:
+                del history[old]
+    return kept
+
+
+async def run_store(workload):
+    store, kept = ConversationStore(), 0
+    for channel_id in workload:
+        kept += store.get(channel_id) is not None
+        store.add_turn(channel_id, None, "user", "質問", "応答")
+    return kept
+
+
+async def prompt_growth(turns):
+    async def summarizer(summary, text, guild_id):
+        return (summary + " " if summary else "") + f"[{text.count(chr(10)) // 2 + 1}件の要約]"
+
+    store = ConversationStore(summarizer=summarizer)
+    rows = []
+    for i in range(1, turns + 1):
+        store.add_turn(1, None, "user", f"{i}回目の質問です。" * 5, f"{i}回目の応答です。" * 30)
+        await asyncio.sleep(0)
+        if i % 10 == 0:
+            rows.append((i, len(store.context_text(1)), len(store.get(1)['turns'])))
+    return rows
+
+
+if __name__ == "__main__":
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    workload = channel_workload(channels, turns)
+    sorted_kept = run_sorted_id(workload)
+    store_kept = asyncio.run(run_store(workload))
+    print(f"履歴が残っていた割合 | ID順に削除 {sorted_kept / turns * 100:5.1f}% | LRU {store_kept / turns * 100:5.1f}%")
+    for count, chars, recent in asyncio.run(prompt_growth(40)):
+        print(f"{count:3}回目 | プロンプトの履歴 {chars:5}文字 | そのまま {recent}件・残りは要約")
@@ -0,0 +1,81 @@
+"""Geminiゲートウェイのベンチマーク
+
+N件のAIリクエストを同時に処理している間のイベントループ遅延を計測する。
+実際のAPIは呼ばず、generate_content() を time.sleep で模した疑似モデルを使う。
+
+使い方: python bench_gemini_gateway.py [同時リクエスト数...]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from gemini_gateway import GeminiGateway
+
+API_LATENCY_SECONDS = 0.5  # 疑似的なAPI応答時間
+PROBE_INTERVAL = 0.01      # ループ遅延の計測間隔
+
+
+class FakeModel:
+    """generate_content() がブロッキングで応答を返す疑似モデル"""
+
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(API_LATENCY_SECONDS)
+        return prompt
+
+
+async def probe_loop_lag(samples, stop):
+    """sleepの予定時刻からのズレ（＝ループ遅延）を記録"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append((loop.time() - expected) * 1000)
+
+
+async def run_direct(model, n):
+    # 修正前の書き方: コルーチン内で同期呼び出し
+    async def call(i):
+        return model.generate_content(f"q{i}")
+    return await asyncio.gather(*(call(i) for i in range(n)))
+
+
+async def run_gateway(model, n, concurrency):
+    gateway = GeminiGateway(max_concurrency=concurrency, timeout=30)
+    try:
+        return await asyncio.gather(*(gateway.generate(model, f"q{i}") for i in range(n)))
+    finally:
+        gateway.shutdown()
+
+
+async def measure(label, coro):
+    samples = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(samples, stop))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    if not samples:
+        samples = [0.0]
+    p99 = sorted(samples)[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<28} 所要 {elapsed:6.2f}s | ループ遅延 平均 {statistics.mean(samples):8.2f}ms "
+          f"p99 {p99:8.2f}ms 最大 {max(samples):8.2f}ms")
+
+
+async def main(counts):
+    model = FakeModel()
+    print(f"疑似API応答時間: {API_LATENCY_SECONDS * 1000:.0f}ms / 計測間隔: {PROBE_INTERVAL * 1000:.0f}ms")
+    print("=" * 100)
+    for n in counts:
+        await measure(f"direct   N={n}", run_direct(model, n))
+        await measure(f"gateway  N={n} (並列4)", run_gateway(model, n, 4))
+        await measure(f"gateway  N={n} (並列{n})", run_gateway(model, n, n))
+        print("-" * 100)
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, 4, 8]
+    asyncio.run(main(counts))
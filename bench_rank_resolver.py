@@ -0,0 +1,82 @@
+"""ランク入力解決のベンチマーク
+
+置き換え前の parse_rank_input（別名辞書を毎回作成して前方一致で線形探索）と
+1件あたりの時間を比べる。結果が正しいかは test_rank_resolver.py で確認する。
+
+使い方: python bench_rank_resolver.py [繰り返し回数]
+"""
+import sys
+import time
+
+from rank_resolver import RankResolver
+
+# VALORANT_RANKS と同じキー・tier・value（bot.py を読み込まずに済むように）
+TIER_NAMES = {1: "アイアン", 2: "ブロンズ", 3: "シルバー", 4: "ゴールド", 5: "プラチナ",
+              6: "ダイヤ", 7: "アセンダント", 8: "イモータル"}
+RANKS = {"レディアント": {"tier": 9, "value": 900}}
+for _tier, _name in TIER_NAMES.items():
+    for _division in (3, 2, 1):
+        RANKS[f"{_name}{_division}"] = {"tier": _tier, "value": _tier * 100 + _division}
+
+# 表の確認は test_rank_resolver.py（ここでは時間だけを測る）
+INPUTS = [
+    "ダイヤ2", "ダイヤモンド ２", "だいや1", "ﾀﾞｲﾔ3", "d2", "D 1", "diamond", "dia2", "ir1", "iron2",
+    "アイアン", "i1", "imm3", "イモ2", "a2", "asc", "p3", "plat1", "ｐｌａｔ１", "g1",
+    "gold", "s2", "b3", "bro1", "r", "Radiant", "レディアント", "", "xyz", ("ダイヤ", "2"),
+]
+
+
+def legacy_parse_rank_input(rank_input):
+    """置き換え前の実装（デバッグ出力のみ削除）"""
+    if isinstance(rank_input, (list, tuple)):
+        if len(rank_input) == 0:
+            return None
+        rank_input = " ".join(str(x) for x in rank_input)
+    rank_input = rank_input.strip()
+    if not rank_input:
+        return None
+    rank_input = rank_input.replace(" ", "").replace("　", "")
+    rank_input = rank_input.replace("１", "1").replace("２", "2").replace("３", "3")
+    rank_input = rank_input.replace("ダイヤモンド", "ダイヤ")
+    for rank_key in RANKS.keys():
+        if rank_input.lower() == rank_key.lower():
+            return rank_key
+    rank_mappings = {"レディアント": "レディアント", "radiant": "レディアント", "rad": "レディアント", "r": "レディアント"}
+    for aliases, name in ((("イモータル", "immortal", "imm", "i"), "イモータル"),
+                          (("アセンダント", "ascendant", "asc", "a"), "アセンダント"),
+                          (("ダイヤ", "diamond", "dia", "d"), "ダイヤ"),
+                          (("プラチナ", "platinum", "plat", "p"), "プラチナ"),
+                          (("ゴールド", "gold", "g"), "ゴールド"),
+                          (("シルバー", "silver", "sil", "s"), "シルバー"),
+                          (("ブロンズ", "bronze", "bro", "b"), "ブロンズ"),
+                          (("アイアン", "iron", "ir"), "アイアン")):
+        for alias in aliases:
+            rank_mappings[alias] = [f"{name}3", f"{name}2", f"{name}1"]
+    for base_name, ranks in rank_mappings.items():
+        if rank_input.lower().startswith(base_name.lower()):
+            if isinstance(ranks, list):
+                for i in range(3, 0, -1):
+                    if str(i) in rank_input:
+                        return ranks[3 - i]
+                return ranks[0]
+            return ranks
+    return None
+
+
+def bench(name, func, inputs, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            func(text)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<10} | 1件あたり {elapsed / (repeat * len(inputs)) * 1e6:6.2f}µs")
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    started = time.perf_counter()
+    resolver = RankResolver(RANKS)
+    print(f"別名表の作成: {(time.perf_counter() - started) * 1000:.2f}ms")
+    print("=" * 60)
+    bench("旧実装", legacy_parse_rank_input, INPUTS, repeat)
+    bench("新実装", resolver.resolve, INPUTS, repeat)
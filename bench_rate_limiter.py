@@ -0,0 +1,90 @@
+"""AIリクエストのレート制限のベンチマーク
+
+複数サーバーのユーザーが一斉にAIコマンドを使った場合を再現し、置き換え前
+（ユーザーごとに30秒間隔のみ）と RateLimiter（本番と同じく AIQueue 経由で
+枠を待つ）で、断られた数・Gemini の 15 RPM を超えて送った数（実際には 429 で
+失敗する）・待ち時間を比べる。
+時間は scale 倍に縮めて実行する（1分の枠を 60/scale 秒で扱う）。
+
+使い方: python bench_rate_limiter.py [ユーザー数] [サーバー数] [1人あたりの回数] [scale]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from ai_queue import MAX_WAIT_SECONDS, AIQueue
+from rate_limiter import FEATURE_LIMITS, RateLimiter, RateLimitExceeded
+
+GEMINI_RPM = 15
+
+
+def scaled_limits(scale):
+    return {
+        feature: tuple((scope, unit, limit, period / scale, burst) for scope, unit, limit, period, burst in specs)
+        for feature, specs in FEATURE_LIMITS.items()
+    }
+
+
+def over_rpm(sent, window):
+    """直近 window 秒に15件を超えて送った件数"""
+    sent = sorted(sent)
+    return sum(1 for i, ts in enumerate(sent) if i >= GEMINI_RPM and ts - sent[i - GEMINI_RPM] < window)
+
+
+async def run_cooldown(users, guilds, repeat, scale):
+    cooldown = 30 / scale
+    last = {}
+    sent, rejected = [], 0
+
+    async def user(user_id):
+        nonlocal rejected
+        for _ in range(repeat):
+            now = time.perf_counter()
+            if user_id in last and now - last[user_id] < cooldown:
+                rejected += 1
+            else:
+                last[user_id] = now
+                sent.append(now)
+            await asyncio.sleep(cooldown / 2)
+
+    await asyncio.gather(*(user(u) for u in range(users)))
+    return len(sent), rejected, over_rpm(sent, 60 / scale), []
+
+
+async def run_limiter(users, guilds, repeat, scale):
+    sent, rejected, waits = [], 0, []
+
+    async def run(profile, prompt):
+        sent.append(time.perf_counter())  # 応答の時間は測らない（送った時刻だけ記録）
+
+    queue = AIQueue(RateLimiter(scaled_limits(scale)), run, max_wait=MAX_WAIT_SECONDS / scale)
+
+    async def user(user_id):
+        nonlocal rejected
+        for _ in range(repeat):
+            started = time.perf_counter()
+            try:
+                await queue.submit('chat', '', user_id, user_id % guilds, tokens=3000)
+                waits.append((time.perf_counter() - started) * scale)
+            except RateLimitExceeded:
+                rejected += 1
+            await asyncio.sleep(30 / scale / 2)
+
+    await asyncio.gather(*(user(u) for u in range(users)))
+    return len(sent), rejected, over_rpm(sent, 60 / scale), waits
+
+
+def report(label, result):
+    sent, rejected, over, waits = result
+    wait_text = f"待機 中央値 {statistics.median(waits):5.1f}秒 / 最大 {max(waits):5.1f}秒" if waits else ""
+    print(f"{label:<14} | 送信 {sent:4} | 拒否 {rejected:4} | RPM超過(429) {over:4} | {wait_text}")
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    guilds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    scale = float(sys.argv[4]) if len(sys.argv) > 4 else 60
+    report("30秒間隔のみ", asyncio.run(run_cooldown(users, guilds, repeat, scale)))
+    report("RateLimiter", asyncio.run(run_limiter(users, guilds, repeat, scale)))
@@ -0,0 +1,97 @@
+"""リマインダースケジューラのベンチマーク
+
+置き換え前の方式（リマインダーごとに asyncio.sleep するタスクを作成）と、
+ReminderScheduler（ヒープ＋1タスク）で、N件の登録・半数の取り消し・送信までの
+時間を比べる。停止中に過ぎた予定の再送（restore）と期限切れの破棄も確認する。
+
+使い方: python bench_reminder_scheduler.py [件数]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from reminder_scheduler import ReminderScheduler
+
+
+async def bench_tasks(count):
+    fired = 0
+    tasks = {}
+
+    async def reminder_task(delay):
+        nonlocal fired
+        await asyncio.sleep(delay)
+        fired += 1
+
+    started = time.perf_counter()
+    for i in range(count):
+        tasks[i] = asyncio.create_task(reminder_task(0.2 + (i % 100) / 1000))
+    for i in range(0, count, 2):
+        tasks.pop(i).cancel()
+    registered = time.perf_counter() - started
+    await asyncio.gather(*tasks.values())
+    total = time.perf_counter() - started
+    return registered, total, fired
+
+
+async def bench_scheduler(count):
+    fired = 0
+    scheduler = ReminderScheduler()
+
+    @scheduler.handler('bench')
+    async def on_fire(reminder, late):
+        nonlocal fired
+        fired += 1
+
+    scheduler.start()
+    started = time.perf_counter()
+    base = datetime.now() + timedelta(seconds=0.2)
+    for i in range(count):
+        scheduler.schedule(f"bench:{i}", 'bench', base + timedelta(milliseconds=i % 100))
+    for i in range(0, count, 2):
+        scheduler.cancel(f"bench:{i}")
+    registered = time.perf_counter() - started
+    while scheduler.reminders:
+        await asyncio.sleep(0.01)
+    total = time.perf_counter() - started
+    scheduler.stop()
+    return registered, total, fired
+
+
+async def check_catch_up():
+    """停止中に過ぎた予定は送り、開始時刻まで過ぎたものは捨てる"""
+    sent = []
+    scheduler = ReminderScheduler()
+
+    @scheduler.handler('check')
+    async def on_fire(reminder, late):
+        sent.append(reminder['payload']['name'])
+
+    now = datetime.now()
+    # StateStore から読み込んだ状態を再現
+    scheduler.reminders['check:missed'] = {'kind': 'check', 'due': now - timedelta(minutes=3),
+                                           'expires': now + timedelta(minutes=2), 'payload': {'name': 'missed'}}
+    scheduler.reminders['check:stale'] = {'kind': 'check', 'due': now - timedelta(hours=2),
+                                          'expires': now - timedelta(hours=1), 'payload': {'name': 'stale'}}
+    scheduler.restore()
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    scheduler.stop()
+    ok = sent == ['missed'] and scheduler.stats['expired'] == 1 and not scheduler.reminders
+    print(f"再起動後の再送: {'✅' if ok else '❌'} 送信={sent} 期限切れ={scheduler.stats['expired']}")
+    return ok
+
+
+async def main(count):
+    ok = await check_catch_up()
+    print("=" * 60)
+    for name, bench in (("タスク方式", bench_tasks), ("スケジューラ", bench_scheduler)):
+        registered, total, fired = await bench(count)
+        print(f"{name:<8} | 登録+取り消し {registered * 1000:7.1f}ms | 全送信まで {total * 1000:7.1f}ms | 送信 {fired}件")
+        ok = ok and fired == count // 2
+    return ok
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sys.exit(0 if asyncio.run(main(count)) else 1)
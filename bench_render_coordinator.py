@@ -0,0 +1,94 @@
+"""募集メッセージ更新のまとめ処理のベンチマーク
+
+10人が数秒以内に参加ボタンを押した場合を再現し、置き換え前（クリックごとに
+描画・編集・通知）と RenderCoordinator で、編集回数・通知回数・最後の編集までの
+時間を比べる。編集1回はDiscordへの往復を想定して待ち時間を入れる。
+
+使い方: python bench_render_coordinator.py [人数] [クリック間隔ms] [編集の往復ms]
+"""
+import asyncio
+import sys
+import time
+
+from render_coordinator import RenderCoordinator
+
+
+def make_embed(participants):
+    return {'title': 'カスタムゲーム募集', 'fields': [{'name': '参加者', 'value': '\n'.join(participants)}]}
+
+
+async def run_direct(names, gap, latency):
+    participants = []
+    counts = {'edits': 0, 'notices': 0}
+    lock = asyncio.Lock()  # 同じチャンネルへの編集はレート制限で実質的に直列になる
+
+    async def click(name):
+        participants.append(name)
+        embed = make_embed(list(participants))
+        async with lock:
+            await asyncio.sleep(latency)
+            counts['edits'] += 1
+            await asyncio.sleep(latency)
+            counts['notices'] += 1
+        return embed
+
+    started = time.perf_counter()
+    tasks = []
+    for name in names:
+        tasks.append(asyncio.create_task(click(name)))
+        await asyncio.sleep(gap)
+    await asyncio.gather(*tasks)
+    return counts, time.perf_counter() - started
+
+
+async def run_coordinated(names, gap, latency):
+    participants = []
+    counts = {'edits': 0, 'notices': 0}
+    coordinator = RenderCoordinator()
+    shown = []
+
+    async def render():
+        return make_embed(list(participants))
+
+    async def edit(embed):
+        await asyncio.sleep(latency)
+        counts['edits'] += 1
+        shown.append(embed)
+
+    async def notify(text):
+        await asyncio.sleep(latency)
+        counts['notices'] += 1
+
+    started = time.perf_counter()
+    for name in names:
+        participants.append(name)
+        coordinator.request('message', render, edit, notify, ("参加しました！", name),
+                            lambda: f"({len(participants)}/10)")
+        await asyncio.sleep(gap)
+    while coordinator._tasks:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    # 同じ内容の再描画は編集しない
+    coordinator.request('message', render, edit)
+    while coordinator._tasks:
+        await asyncio.sleep(0.01)
+    ok = shown[-1] == make_embed(names) and coordinator.stats['unchanged'] == 1
+    return counts, elapsed, ok, coordinator
+
+
+async def main(players, gap, latency):
+    names = [f"player{i}" for i in range(players)]
+    counts, elapsed = await run_direct(names, gap, latency)
+    print(f"クリックごと | 編集 {counts['edits']:3}回 | 通知 {counts['notices']:3}通 | 最終表示まで {elapsed * 1000:6.0f}ms")
+    counts, elapsed, ok, coordinator = await run_coordinated(names, gap, latency)
+    print(f"まとめ処理   | 編集 {counts['edits']:3}回 | 通知 {counts['notices']:3}通 | 最終表示まで {elapsed * 1000:6.0f}ms")
+    print(f"最終表示が全員分・同内容の再描画を省略: {'✅' if ok else '❌'}")
+    print(coordinator.stats_text())
+    return ok
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    gap = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.15
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.25
+    sys.exit(0 if asyncio.run(main(players, gap, latency)) else 1)
@@ -0,0 +1,67 @@
+"""翻訳・要約の応答キャッシュのベンチマーク
+
+よく使われる定型文ほど何度も来る（Zipf分布）依頼を、空白・改行・全角/半角の
+揺れを付けて流し、入力そのままをキーにした場合と正規化したキーの場合で
+ヒット率と Gemini の呼び出し回数・合計待ち時間を比べる。
+
+使い方: python bench_response_cache.py [依頼数] [文章の種類] [Geminiの応答ms]
+"""
+import random
+import sys
+
+from response_cache import ResponseCache
+
+PHRASES = ["Good game everyone", "nice try", "Patch 9.04 notes: agents and maps updated",
+           "Let's play ranked tonight", "I'll be late 10 minutes", "gg wp"]
+
+
+def variant(text, rng):
+    """コピー&ペーストで起きる揺れ（前後・連続の空白、改行、全角英数）"""
+    choice = rng.randrange(4)
+    if choice == 1:
+        return f"  {text} "
+    if choice == 2:
+        return text.replace(" ", "  ", 1) + "\n"
+    if choice == 3:
+        return text.translate(str.maketrans("0123456789", "０１２３４５６７８９"))
+    return text
+
+
+def workload(requests, kinds, seed=1):
+    rng = random.Random(seed)
+    texts = [f"{PHRASES[i % len(PHRASES)]} #{i // len(PHRASES)}" if i >= len(PHRASES) else PHRASES[i]
+             for i in range(kinds)]
+    weights = [1 / (rank + 1) for rank in range(kinds)]
+    return [variant(rng.choices(texts, weights)[0], rng) for _ in range(requests)]
+
+
+def run_raw(inputs):
+    """入力の文字列そのものをキーにする（揺れごとに別の依頼になる）"""
+    seen = set()
+    calls = 0
+    for text in inputs:
+        if text not in seen:
+            seen.add(text)
+            calls += 1
+    return calls
+
+
+def run_cache(inputs):
+    cache = ResponseCache()
+    calls = 0
+    for text in inputs:
+        if cache.get('translate', text) is None:
+            calls += 1
+            cache.set('translate', text, "translated")
+    return calls
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    kinds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 1500
+    inputs = workload(requests, kinds)
+    for label, calls in (("キャッシュなし", requests), ("入力そのまま", run_raw(inputs)),
+                         ("ResponseCache", run_cache(inputs))):
+        print(f"{label:<14} | Gemini呼び出し {calls:5} | ヒット率 {(1 - calls / requests) * 100:5.1f}% "
+              f"| 合計待ち {calls * latency / 1000:7.0f}秒")
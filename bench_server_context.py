@@ -0,0 +1,68 @@
+"""!ai のサーバー情報のベンチマーク
+
+置き換え前（呼び出しごとに guild.channels を走査し、絵文字付きの詳細な形式で
+作り直す）と ServerContextCache（サーバーごとに作った短い形式を使い回す）で、
+1回あたりの作成時間とプロンプトに入る文字数（≒入力トークン数）を比べる。
+Discord のサーバーは属性だけを持つ簡易オブジェクトで置き換える。
+
+使い方: python bench_server_context.py [メンバー数] [チャンネル数] [回数]
+"""
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from guild_index import GuildIndex
+from server_context import ServerContextCache
+
+
+def make_guild(members, channels):
+    guild = SimpleNamespace(id=123456789012345678, name="VALORANT部", member_count=members,
+                            created_at=datetime(2021, 4, 1, tzinfo=timezone.utc))
+    guild.channels = [SimpleNamespace(name=f"channel-{i}", type='voice' if i % 3 == 0 else 'text')
+                      for i in range(channels)]
+    guild.text_channels = [channel for channel in guild.channels if channel.type == 'text']
+    index = GuildIndex(guild.id)
+    for i in range(members):
+        index.add(SimpleNamespace(id=i, name=f"player{i}", display_name=f"プレイヤー{i}" if i % 2 else f"player{i}",
+                                  bot=i % 50 == 0, status='online', joined_at=None, guild_permissions=None))
+    return guild, index
+
+
+def build_old(guild, index):
+    """置き換え前の ask_ai のサーバー情報"""
+    members_list = [f"• {member.display_name} ({member.name})" for member in index.human_members(limit=15)]
+    text_channels = [f"#{ch.name}" for ch in guild.channels if hasattr(ch, 'name') and not str(ch.type).startswith('voice')][:8]
+    return f"""
+
+【詳細サーバー情報】
+🏷️ サーバー名: {guild.name}
+👥 総メンバー数: {guild.member_count}人
+🆔 ID: {guild.id}
+📅 作成: {guild.created_at.strftime("%Y年%m月%d日")}
+
+👤 メンバー:
+{chr(10).join(members_list)}
+
+💬 チャンネル:
+{chr(10).join([f"• {ch}" for ch in text_channels])}
+"""
+
+
+def measure(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        text = func()
+    return (time.perf_counter() - started) / repeat, text
+
+
+if __name__ == "__main__":
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    channels = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    guild, index = make_guild(members, channels)
+    cache = ServerContextCache()
+    for label, func in (("毎回作成", lambda: build_old(guild, index)),
+                        ("ServerContextCache", lambda: cache.get(guild, index))):
+        seconds, text = measure(func, repeat)
+        print(f"{label:<20} | 1回 {seconds * 1e6:8.1f}µs | {len(text):4}文字")
@@ -0,0 +1,102 @@
+"""起動時間（bot.py の import）のベンチマーク
+
+指定した2つのリビジョンをそれぞれ一時ディレクトリに展開し、`import bot` を
+別プロセスで繰り返して所要時間を比べる。-X importtime の結果から、
+時間のかかったモジュール（累積）も表示する。拡張機能がある版では、
+setup_hook と同じ読み込み（ポートを使う web_cog は除く）の時間も測る。
+Discordへの接続はしない。discord.py が入っていない環境では測らずに終了する。
+
+使い方: python bench_startup.py [比較元リビジョン] [比較先リビジョン] [回数]
+       比較先に "." を指定すると作業ツリーをそのまま使う（既定: HEAD~1 と .）
+"""
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def export_tree(rev, directory):
+    archive = subprocess.run(['git', 'archive', rev], check=True, capture_output=True).stdout
+    subprocess.run(['tar', '-x', '-C', directory], input=archive, check=True)
+    return directory
+
+
+def measure(directory, repeat):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    code = "import bot"
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], cwd=directory, env=env, capture_output=True, text=True)
+        times.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            print(f"❌ import に失敗しました ({directory}):\n{result.stderr.strip().splitlines()[-1]}")
+            return None, []
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=directory, env=env,
+                            capture_output=True, text=True)
+    return statistics.median(times), slowest_imports(result.stderr)
+
+
+# bot.py を読み込んだあと、setup_hook と同じ順で拡張機能を読み込む時間（ms）を出力する
+EXTENSION_CODE = """
+import asyncio, time
+import bot
+names = [name for name in getattr(bot, 'EXTENSIONS', []) if name != 'web_cog']
+async def main():
+    started = time.perf_counter()
+    for name in names:
+        await bot.bot.load_extension(name)
+    print(len(names), (time.perf_counter() - started) * 1000)
+asyncio.run(main())
+"""
+
+
+def measure_extensions(directory):
+    """(拡張機能の数, 読み込み時間ms)。拡張機能のない版や失敗時は None"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-c', EXTENSION_CODE], cwd=directory, env=env, capture_output=True,
+                            text=True)
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    count, elapsed = result.stdout.split()[-2:]
+    return (int(count), float(elapsed)) if int(count) else None
+
+
+def slowest_imports(importtime_output, n=8):
+    """-X importtime の出力から、トップレベルのパッケージを累積時間の大きい順に返す"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        if not name.startswith(' ') and '.' not in name.strip():
+            rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:n]
+
+
+def report(label, median, imports, extensions=None):
+    if median is None:
+        return
+    print(f"{label:<12} | import bot 中央値 {median * 1000:7.0f}ms")
+    if extensions is not None:
+        print(f"{'':<12} | 拡張機能 {extensions[0]}個の読み込み {extensions[1]:7.0f}ms")
+    for cumulative, name in imports:
+        print(f"    {name:<28} {cumulative / 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    base = sys.argv[1] if len(sys.argv) > 1 else 'HEAD~1'
+    target = sys.argv[2] if len(sys.argv) > 2 else '.'
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    if importlib.util.find_spec('discord') is None:
+        print("⚠️ discord.py が入っていないため計測できません（pip install -r requirements.txt）")
+        sys.exit(0)
+    with tempfile.TemporaryDirectory() as base_dir, tempfile.TemporaryDirectory() as target_dir:
+        base_tree = export_tree(base, base_dir)
+        target_tree = os.getcwd() if target == '.' else export_tree(target, target_dir)
+        report(base, *measure(base_tree, repeat), measure_extensions(base_tree))
+        report(target, *measure(target_tree, repeat), measure_extensions(target_tree))
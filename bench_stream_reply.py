@@ -0,0 +1,101 @@
+"""ストリーミング表示のベンチマーク
+
+出力上限近くまで生成する !expert を再現し、置き換え前（全文の生成を待ってから
+1900文字ごとに埋め込みを送る）と StreamingReply で、最初に文章が見えるまでの
+時間・全文が見えるまでの時間・メッセージの編集/送信回数を比べる。
+Gemini の生成と Discord への編集は待ち時間で置き換える。
+
+使い方: python bench_stream_reply.py [生成する文字数] [生成秒数] [編集の往復ms]
+"""
+import asyncio
+import sys
+import time
+
+from stream_reply import PAGE_SIZE, StreamingReply
+
+CHUNK_CHARS = 120  # Gemini のストリーミングの1断片あたりの文字数の目安
+
+
+class FakeMessage:
+    def __init__(self, clock, latency):
+        self.clock = clock
+        self.latency = latency
+        self.edits = 0
+        self.shown = ""
+
+    async def edit(self, content=None, embed=None):
+        await asyncio.sleep(self.latency)
+        self.edits += 1
+        self.shown = embed['description']
+        self.clock.seen(self.shown)
+
+
+class Clock:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first = None
+        self.complete = None
+
+    def seen(self, text):
+        if self.first is None and text.strip():
+            self.first = time.perf_counter() - self.started
+
+    def done(self):
+        self.complete = time.perf_counter() - self.started
+
+
+def render(text, index, count, streaming):
+    return {'title': f"回答 ({index + 1}/{count})", 'description': text}
+
+
+async def generate(chars, seconds, on_text):
+    text = ("専門的な解説の文章です。" * (chars // 12 + 1))[:chars]
+    for start in range(0, chars, CHUNK_CHARS):
+        await asyncio.sleep(seconds * CHUNK_CHARS / chars)
+        on_text(text[start:start + CHUNK_CHARS])
+    return text
+
+
+async def run_blocking(chars, seconds, latency):
+    clock = Clock()
+    first = FakeMessage(clock, latency)
+    sent = []
+    text = await generate(chars, seconds, lambda _: None)
+    pages = [text[i:i + PAGE_SIZE] for i in range(0, len(text), PAGE_SIZE)]
+    for page in pages:
+        message = FakeMessage(clock, latency)
+        await message.edit(embed={'description': page})  # 送信1回分
+        sent.append(message)
+    clock.done()
+    return clock.first, clock.complete, first.edits + sum(m.edits for m in sent)
+
+
+async def run_streaming(chars, seconds, latency):
+    clock = Clock()
+    first = FakeMessage(clock, latency)
+    messages = [first]
+
+    async def send(embed):
+        message = FakeMessage(clock, latency)
+        await message.edit(embed=embed)
+        messages.append(message)
+        return message
+
+    reply = StreamingReply(first, send, render)
+    await generate(chars, seconds, reply.feed)
+    await reply.finish()
+    clock.done()
+    return clock.first, clock.complete, sum(m.edits for m in messages)
+
+
+def report(label, result):
+    first, complete, edits = result
+    print(f"{label:<16} | 最初の表示 {first:5.2f}秒 | 全文表示 {complete:5.2f}秒 | 編集・送信 {edits:3}回")
+
+
+if __name__ == "__main__":
+    chars = int(sys.argv[1]) if len(sys.argv) > 1 else 6000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 12
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.15
+    report("全文を待って送信", asyncio.run(run_blocking(chars, seconds, latency)))
+    report("StreamingReply", asyncio.run(run_streaming(chars, seconds, latency)))
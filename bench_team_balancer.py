@@ -0,0 +1,70 @@
+"""チーム分けエンジンのベンチマーク
+
+ランダムなランク値で 5v5 などを解き、1回あたりの処理時間と
+旧来の貪欲法とのバランス差（平均ランク値の差）を比較する。
+
+使い方: python bench_team_balancer.py [試行回数]
+"""
+import random
+import statistics
+import sys
+import time
+
+from team_balancer import EXACT_MAX_PLAYERS, find_best_splits
+
+# VALORANT_RANKS の value と同じ分布（tier * 100 + division、レディアントは900）
+RANK_VALUES = [tier * 100 + division for tier in range(1, 9) for division in (1, 2, 3)] + [900]
+
+
+def greedy_split(values, team_size):
+    """置き換え前の貪欲法（比較用）"""
+    order = sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+    team1, team2 = [], []
+    for index in order:
+        total1 = sum(values[i] for i in team1)
+        total2 = sum(values[i] for i in team2)
+        if len(team1) >= team_size:
+            team2.append(index)
+        elif len(team2) >= team_size:
+            team1.append(index)
+        elif total1 <= total2:
+            team1.append(index)
+        else:
+            team2.append(index)
+    avg1 = sum(values[i] for i in team1) / len(team1)
+    avg2 = sum(values[i] for i in team2) / len(team2)
+    return abs(avg1 - avg2)
+
+
+def bench(players, trials, k=1):
+    timings = []
+    diffs = []
+    greedy_diffs = []
+    for _ in range(trials):
+        values = [random.choice(RANK_VALUES) for _ in range(players)]
+        started = time.perf_counter()
+        splits = find_best_splits(values, players // 2, k=k)
+        timings.append((time.perf_counter() - started) * 1000)
+        diffs.append(splits[0][0])
+        greedy_diffs.append(greedy_split(values, players // 2))
+
+    method = "全探索" if players <= EXACT_MAX_PLAYERS else "局所探索"
+    timings.sort()
+    print(f"{players:>3}人 k={k:<2} ({method}) | 平均 {statistics.mean(timings):7.3f}ms "
+          f"p99 {timings[int(len(timings) * 0.99) - 1]:7.3f}ms | "
+          f"平均差 {statistics.mean(diffs):6.1f} (貪欲法 {statistics.mean(greedy_diffs):6.1f}) | "
+          f"完全一致 {sum(1 for d in diffs if d == 0) / trials * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(0)
+    print(f"試行回数: {trials}")
+    print("=" * 100)
+    for players in (4, 6, 8, 10):
+        bench(players, trials)
+    bench(10, trials, k=5)
+    for players in (16, 20):
+        bench(players, max(1, trials // 10))
+    for players in (30, 50):
+        bench(players, max(1, trials // 10))
@@ -0,0 +1,65 @@
+"""チームスコアリングのベンチマーク
+
+ランダムなスキル値と直近のチーム分け履歴を用意し、1クリックあたりの
+評価時間（候補数・NumPy有無）と、履歴ペナルティで同じチームメイトが
+どれだけ減るかを計測する。
+
+使い方: python bench_team_scoring.py [試行回数]
+"""
+import random
+import statistics
+import sys
+import time
+
+import team_scoring
+from team_scoring import TeammateHistory, _candidates, score_teams
+
+RANK_VALUES = [tier * 100 + division for tier in range(1, 9) for division in (1, 2, 3)] + [900]
+
+
+def repeated_pairs(previous, team1, team2):
+    """前回と同じチームになったペアの数"""
+    count = 0
+    for team in (team1, team2):
+        ids = {p['id'] for p in team}
+        for old in previous:
+            shared = len(ids & old)
+            count += shared * (shared - 1) // 2
+    return count
+
+
+def bench(players, trials, use_history):
+    timings = []
+    diffs = []
+    repeats = []
+    for _ in range(trials):
+        history = TeammateHistory() if use_history else None
+        skills = [team_scoring.player_skill(random.choice(RANK_VALUES)) for _ in range(players)]
+        previous = None
+        # 同じロビーで3回続けてチーム分けする
+        for _ in range(3):
+            lobby = [{'id': i, 'skill': s} for i, s in enumerate(skills)]
+            started = time.perf_counter()
+            team1, team2, diff = score_teams(lobby, history=history, channel_id=1, tolerance=15)
+            timings.append((time.perf_counter() - started) * 1000)
+            diffs.append(diff)
+            if previous is not None:
+                repeats.append(repeated_pairs(previous, team1, team2))
+            previous = [{p['id'] for p in team1}, {p['id'] for p in team2}]
+
+    candidates = len(_candidates([0] * players, players // 2, random))
+    timings.sort()
+    label = "履歴あり" if use_history else "履歴なし"
+    print(f"{players:>3}人 {label} 候補 {candidates:>5} | 平均 {statistics.mean(timings):7.2f}ms "
+          f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:7.2f}ms | "
+          f"平均差 {statistics.mean(diffs):5.1f} | 前回と同じペア {statistics.mean(repeats):4.1f}組")
+
+
+if __name__ == "__main__":
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    random.seed(0)
+    print(f"試行回数: {trials} / NumPy: {'あり' if team_scoring._load_numpy() is not None else 'なし（純Python）'}")
+    print("=" * 100)
+    for players in (6, 10, 14, 20):
+        for use_history in (False, True):
+            bench(players, trials if players <= 14 else max(1, trials // 10), use_history)
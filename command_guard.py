@@ -0,0 +1,75 @@
+import functools
+import time
+from datetime import datetime
+
+from discord.ext import commands
+
+from dedupe_cache import DedupeCache
+from metrics import metrics
+
+# 拡張機能（Cog）からも同じ状態を使うため、bot.py ではなくここに置く
+command_executing = {}  # コマンド実行中フラグ（ユーザーID: コマンド名）
+
+# Bot統計情報
+bot_stats = {
+    'start_time': datetime.now(),
+    'commands_executed': 0,
+    'messages_processed': 0,
+    'errors_count': 0,
+    'last_error': None,
+    'last_heartbeat': datetime.now(),
+    'restart_count': 0
+}
+
+# メッセージの重複処理防止（on_message で使い、!botstatus・!cleanup でも参照する）
+PROCESSED_MESSAGE_TTL = 600     # 処理済みメッセージIDを覚えておく秒数（再接続時の再配信対策）
+DUPLICATE_WINDOW_SECONDS = 3     # 同じユーザーの同じ内容をこの秒数内なら重複とみなす
+processed_messages = DedupeCache(PROCESSED_MESSAGE_TTL, 5000)  # 処理済みメッセージIDの記録
+user_message_cache = DedupeCache(DUPLICATE_WINDOW_SECONDS, 1000)  # ユーザー別の最後のメッセージ内容とタイムスタンプ
+
+
+# 重複実行防止デコレーター
+def prevent_duplicate_execution(func):
+    """全コマンドに統一的な重複実行防止を適用するデコレーター（Cogのメソッドにも使える）
+
+    functools.wraps で元の関数のシグネチャを残し、discord.py が引数の型変換・
+    キーワード専用引数（残り全部）を正しく扱えるようにする。
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        ctx = args[1] if isinstance(args[0], commands.Cog) else args[0]
+        # ユーザーIDベースの実行中チェック
+        user_id = ctx.author.id
+        command_name = func.__name__
+
+        if user_id in command_executing:
+            await ctx.send(f"⚠️ 他のコマンドが実行中です。少しお待ちください。")
+            return
+
+        # 実行中フラグを設定
+        command_executing[user_id] = command_name
+        started = time.perf_counter()
+        status = 'ok'
+
+        try:
+            # 元のコマンドを実行
+            await func(*args, **kwargs)
+            # 成功時に統計を更新
+            bot_stats['commands_executed'] += 1
+        except Exception as e:
+            # エラー時に統計を更新
+            status = 'error'
+            bot_stats['errors_count'] += 1
+            bot_stats['last_error'] = str(e)
+            raise  # 元のエラーを再発生
+        finally:
+            # 実行中フラグをクリアし、実行時間を記録
+            command_executing.pop(user_id, None)
+            metrics.observe(
+                'bot_command_duration_seconds',
+                time.perf_counter() - started,
+                command=getattr(getattr(ctx, 'command', None), 'name', None) or command_name,
+                status=status
+            )
+
+    return wrapper
@@ -0,0 +1,185 @@
+import asyncio
+from datetime import datetime
+
+from rate_limiter import estimate_tokens
+
+BOT_NAME = "リオン"
+MAX_CONVERSATIONS = 50        # 保存するチャンネル数の上限（最近使われていないチャンネルから削除）
+HISTORY_TOKEN_BUDGET = 1200   # 1チャンネルの履歴（要約を除く）の見積もりトークン数の上限
+KEEP_RECENT_TURNS = 4         # 要約にまとめる時もそのまま残す直近のやり取りの数
+RESPONSE_CHARS = 400          # 履歴に残す応答の文字数
+SUMMARY_MAX_CHARS = 600       # 要約の文字数の上限
+
+
+def turn_text(turn):
+    return f"{turn['user']}: {turn['message']}\n{BOT_NAME}: {turn['response']}"
+
+
+def turn_tokens(turn):
+    return estimate_tokens(turn['message']) + estimate_tokens(turn['response'])
+
+
+def clip(text, limit):
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class ConversationStore:
+    """チャンネルごとの会話履歴
+
+    1回のやり取り（質問と応答）を1件として保存し、見積もりトークン数が上限を
+    超えたら古いやり取りを要約にまとめる（要約は summarizer で作り、失敗したら
+    抜き出しで作る）。チャンネル数が上限を超えたら最後に使われた時刻が最も古い
+    チャンネルから削除する。channels は StateStore に登録して再起動後も残す。
+    """
+
+    def __init__(self, mark_dirty=None, summarizer=None, max_channels=MAX_CONVERSATIONS,
+                 token_budget=HISTORY_TOKEN_BUDGET, keep_turns=KEEP_RECENT_TURNS):
+        self.channels = {}  # channel_id -> {'guild_id', 'summary', 'turns': [...], 'updated'}
+        self._mark_dirty = mark_dirty
+        # async def summarizer(前回までの要約, まとめるやり取りの文章, guild_id) -> 新しい要約
+        self.summarizer = summarizer
+        self.max_channels = max_channels
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self._compacting = {}  # channel_id -> 要約タスク
+        self.stats = {'turns': 0, 'compactions': 0, 'fallbacks': 0, 'evicted': 0}
+
+    def __len__(self):
+        return len(self.channels)
+
+    def _changed(self, channel_id):
+        if self._mark_dirty is not None:
+            self._mark_dirty(channel_id)
+
+    def get(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def add_turn(self, channel_id, guild_id, user, message, response):
+        """やり取りを追加する（必要なら古いやり取りの要約をバックグラウンドで始める）"""
+        record = self.channels.get(channel_id)
+        if record is None:
+            record = self.channels[channel_id] = {'guild_id': guild_id, 'summary': "", 'turns': [], 'updated': None}
+        record['turns'].append({
+            'user': user,
+            'message': message,
+            'response': clip(response, RESPONSE_CHARS),
+            'timestamp': datetime.now()
+        })
+        record['updated'] = datetime.now()
+        self.stats['turns'] += 1
+        self._changed(channel_id)
+        self.evict()
+        if self._over_budget(record) and channel_id not in self._compacting:
+            self._compacting[channel_id] = asyncio.get_running_loop().create_task(self._compact(channel_id))
+
+    def clear(self, channel_id):
+        """チャンネルの履歴と要約を削除する。削除したら True"""
+        task = self._compacting.pop(channel_id, None)
+        if task is not None:
+            task.cancel()
+        if self.channels.pop(channel_id, None) is None:
+            return False
+        self._changed(channel_id)
+        return True
+
+    def evict(self):
+        """上限を超えた分を、最後に使われた時刻が古いチャンネルから削除する"""
+        removed = 0
+        while len(self.channels) > self.max_channels:
+            channel_id = min(self.channels, key=lambda key: self.channels[key]['updated'] or datetime.min)
+            self.clear(channel_id)
+            removed += 1
+        self.stats['evicted'] += removed
+        return removed
+
+    def _over_budget(self, record):
+        return (len(record['turns']) > self.keep_turns
+                and sum(turn_tokens(turn) for turn in record['turns']) > self.token_budget)
+
+    async def _compact(self, channel_id):
+        try:
+            record = self.channels.get(channel_id)
+            if record is None or not self._over_budget(record):
+                return
+            # 要約中に追加されたやり取りは残すので、まとめる対象をここで確定する
+            folded = record['turns'][:-self.keep_turns]
+            text = "\n".join(turn_text(turn) for turn in folded)
+            summary = None
+            if self.summarizer is not None:
+                try:
+                    summary = await self.summarizer(record['summary'], text, record['guild_id'])
+                except Exception as e:
+                    print(f"会話履歴の要約エラー ({channel_id}): {e}")
+            if not summary:
+                self.stats['fallbacks'] += 1
+                summary = "\n".join(filter(None, [record['summary']] + [
+                    f"{turn['user']}: {clip(turn['message'], 60)}" for turn in folded
+                ]))
+            if self.channels.get(channel_id) is not record:
+                return  # 要約中に削除された
+            record['summary'] = summary[-SUMMARY_MAX_CHARS:]
+            record['turns'] = record['turns'][len(folded):]
+            self.stats['compactions'] += 1
+            self._changed(channel_id)
+        finally:
+            self._compacting.pop(channel_id, None)
+
+    def context_text(self, channel_id):
+        """プロンプトに入れる履歴（要約＋トークン上限内の直近のやり取り）。履歴がなければ空文字"""
+        record = self.channels.get(channel_id)
+        if record is None:
+            return ""
+        recent, used = [], 0
+        for turn in reversed(record['turns']):
+            used += turn_tokens(turn)
+            if recent and used > self.token_budget:
+                break
+            recent.append(turn_text(turn))
+        parts = []
+        if record['summary']:
+            parts.append(f"【これまでの会話の要約】\n{record['summary']}")
+        if recent:
+            parts.append("【最近の会話履歴】\n" + "\n".join(reversed(recent)))
+        return "\n\n".join(parts)
+
+    def restore(self):
+        """StateStore から読み込んだ旧形式の履歴（文字列や辞書のリスト）を変換する。変換したチャンネル数を返す"""
+        converted = 0
+        for channel_id, value in list(self.channels.items()):
+            if isinstance(value, dict):
+                continue
+            self.channels[channel_id] = {
+                'guild_id': None,
+                'summary': "",
+                'turns': self._legacy_turns(value),
+                'updated': datetime.now()
+            }
+            self._changed(channel_id)
+            converted += 1
+        self.evict()
+        return converted
+
+    @staticmethod
+    def _legacy_turns(entries):
+        # メンション: {'user', 'message', 'response', 'timestamp'} / !ai: "名前: 質問", "リオン: 応答" の交互
+        turns = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                turns.append({
+                    'user': entry.get('user', ''),
+                    'message': entry.get('message', ''),
+                    'response': clip(entry.get('response', ''), RESPONSE_CHARS),
+                    'timestamp': entry.get('timestamp') or datetime.now()
+                })
+                continue
+            name, _, text = str(entry).partition(": ")
+            if name == BOT_NAME and turns and not turns[-1]['response']:
+                turns[-1]['response'] = clip(text, RESPONSE_CHARS)
+            else:
+                turns.append({'user': name, 'message': text, 'response': '', 'timestamp': datetime.now()})
+        return turns
+
+    def stats_text(self):
+        turns = sum(len(record['turns']) for record in self.channels.values() if isinstance(record, dict))
+        return (f"{len(self.channels)}チャンネル・{turns}件 / 要約 {self.stats['compactions']}回 "
+                f"(抜き出し {self.stats['fallbacks']}) / LRU削除 {self.stats['evicted']}")
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+
+
+class DedupeCache:
+    """重複判定用の時間順キャッシュ（上限件数つき）
+
+    全エントリが同じTTLなので、OrderedDict の先頭が常に一番古い。追加のたびに
+    先頭から期限切れを少しずつ捨てるため、一括クリアで重複判定の抜けが生じない。
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (期限, 値)
+        self.hits = 0        # 重複として検出した回数
+        self.expired = 0
+        self.evictions = 0   # 上限超過で捨てた件数
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def _expire(self, now):
+        data = self._data
+        while data:
+            key, (expires, _) = next(iter(data.items()))
+            if expires > now:
+                break
+            data.popitem(last=False)
+            self.expired += 1
+
+    def get(self, key, default=None):
+        """期限内の値を返す"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value=True):
+        """値を記録（既存のキーは期限を延長して末尾へ）"""
+        now = time.monotonic()
+        self._expire(now)
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def check_and_add(self, key):
+        """既に記録済みなら True（重複）、初めてなら記録して False"""
+        if key in self:
+            self.hits += 1
+            return True
+        self.set(key)
+        return False
+
+    def purge_expired(self):
+        """期限切れを削除し、削除件数を返す"""
+        before = len(self._data)
+        self._expire(time.monotonic())
+        return before - len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats_text(self):
+        return f"{len(self._data)}/{self.maxsize}件 (重複 {self.hits} / 期限切れ {self.expired} / 上限超過 {self.evictions})"
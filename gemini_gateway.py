@@ -0,0 +1,271 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+from single_flight import SingleFlight
+
+# 同時にGemini APIへ投げるリクエスト数の上限と、1リクエストあたりのタイムアウト（秒）
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv('GEMINI_TIMEOUT_SECONDS', '60'))
+# 既定のモデル
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+# 用途ごとのAIプロファイル（モデルと生成設定）。応答時間に効く出力トークン数の上限はここで調整する
+AI_PROFILES = {
+    'chat': {'temperature': 0.7, 'top_p': 0.8, 'top_k': 40, 'max_output_tokens': 2048},       # !ai
+    'mention': {'temperature': 0.7, 'top_p': 0.8, 'top_k': 40, 'max_output_tokens': 2048},    # メンションへの返信
+    'expert': {'temperature': 0.3, 'top_p': 0.9, 'top_k': 50, 'max_output_tokens': 4096},     # !expert（正確性重視）
+    'creative': {'temperature': 0.9, 'top_p': 0.95, 'top_k': 60, 'max_output_tokens': 3072},  # !creative
+    'translate': {'temperature': 0.2, 'max_output_tokens': 1024},                            # !translate（表示は1000文字まで）
+    'summarize': {'temperature': 0.3, 'max_output_tokens': 1024},                            # !summarize（表示は1000文字まで）
+    'history': {'temperature': 0.2, 'max_output_tokens': 256},                               # 会話履歴の要約（裏で実行）
+}
+
+
+def response_tokens(response):
+    """応答の実際の使用トークン数（usage_metadata がなければ None）"""
+    usage = getattr(response, 'usage_metadata', None)
+    return getattr(usage, 'total_token_count', None) or None
+
+
+class GeminiTimeoutError(Exception):
+    """Gemini APIの応答がタイムアウトした"""
+
+
+def request_key(model, prompt, generation_config=None):
+    """統合判定用のキー（空白の違いは無視する）"""
+    model_name = getattr(model, 'model_name', None) or id(model)
+    normalized = " ".join(str(prompt).split())
+    return (model_name, repr(generation_config), normalized)
+
+
+class GeminiGateway:
+    """同期的なGemini SDK呼び出しを専用スレッドで実行し、イベントループを止めないゲートウェイ"""
+
+    def __init__(self, max_concurrency=GEMINI_MAX_CONCURRENCY, timeout=GEMINI_TIMEOUT_SECONDS):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # スレッドの空き枠。タイムアウト後もスレッドが実際に終わるまで枠は返さない
+        self._slots = None
+        self._slots_loop = None
+        self.stats = {
+            'requests': 0,
+            'completed': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'cancelled': 0,
+            'in_flight': 0,
+            'waiting': 0,
+        }
+        # 同じモデル・設定・プロンプトの同時リクエストは1回にまとめる
+        self.flight = SingleFlight('Gemini')
+        # SDK（google.generativeai）は初回のAI利用時かウォームアップで読み込む
+        self._genai = None
+        self._genai_lock = threading.Lock()
+        self.sdk_load_seconds = None
+        self._models = {}   # モデル名 -> GenerativeModel
+        self._configs = {}  # 設定値のタプル -> GenerationConfig
+        self._profiles = {}  # プロファイル名 -> (GenerativeModel, GenerationConfig)
+
+    # --- SDKとモデルの遅延初期化 ---
+
+    def _load_sdk(self):
+        # import に1秒前後かかるため、イベントループ上ではなくワーカースレッドで呼ぶ
+        with self._genai_lock:
+            if self._genai is None:
+                started = time.perf_counter()
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+                self.sdk_load_seconds = time.perf_counter() - started
+                self._genai = genai
+                print(f"🤖 Gemini SDKを初期化しました ({self.sdk_load_seconds * 1000:.0f}ms)")
+        return self._genai
+
+    async def sdk(self):
+        if self._genai is None:
+            await asyncio.to_thread(self._load_sdk)
+        return self._genai
+
+    async def get_model(self, name=GEMINI_MODEL_NAME):
+        """モデルを返す（モデル名ごとに1回だけ作成して使い回す）"""
+        model = self._models.get(name)
+        if model is None:
+            genai = await self.sdk()
+            model = self._models.setdefault(name, genai.GenerativeModel(name))
+        return model
+
+    async def get_config(self, **params):
+        """GenerationConfig を返す（同じ設定値なら同じオブジェクト）"""
+        key = tuple(sorted(params.items()))
+        config = self._configs.get(key)
+        if config is None:
+            genai = await self.sdk()
+            config = self._configs.setdefault(key, genai.types.GenerationConfig(**params))
+        return config
+
+    async def profile(self, name):
+        """AI_PROFILES の (モデル, 生成設定) を返す（初回だけ作成）"""
+        prepared = self._profiles.get(name)
+        if prepared is None:
+            params = dict(AI_PROFILES[name])
+            model = await self.get_model(params.pop('model', GEMINI_MODEL_NAME))
+            prepared = self._profiles.setdefault(name, (model, await self.get_config(**params)))
+        return prepared
+
+    async def ask(self, profile_name, prompt, timeout=None, on_text=None):
+        """プロファイルのモデル・設定でプロンプトを生成する（on_text を渡すとストリーミング）"""
+        model, config = await self.profile(profile_name)
+        if on_text is not None:
+            return await self.stream(model, prompt, on_text, generation_config=config, timeout=timeout)
+        return await self.generate(model, prompt, generation_config=config, timeout=timeout)
+
+    async def warm_up(self):
+        """起動後のバックグラウンドでSDKと全プロファイルを用意しておく（APIキー未設定なら何もしない）"""
+        if not os.getenv('GEMINI_API_KEY'):
+            return
+        try:
+            for name in AI_PROFILES:
+                await self.profile(name)
+        except Exception as e:
+            print(f"Gemini SDKのウォームアップエラー: {e}")
+
+    def sdk_status_text(self):
+        if self._genai is None:
+            return "SDK 未読み込み"
+        return (f"SDK 読み込み {self.sdk_load_seconds * 1000:.0f}ms / プロファイル {len(self._profiles)}/{len(AI_PROFILES)} "
+                f"/ モデル {len(self._models)}")
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix='gemini'
+                    )
+        return self._executor
+
+    def _get_slots(self, loop):
+        # セマフォはイベントループ上で遅延生成する（再起動でループが変わった場合も作り直す）
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """任意の同期関数をワーカースレッドで実行して結果を待つ"""
+        loop = asyncio.get_running_loop()
+        slots = self._get_slots(loop)
+        timeout = self.timeout if timeout is None else timeout
+
+        self.stats['requests'] += 1
+        self.stats['waiting'] += 1
+        call = getattr(func, '__name__', 'call')
+        queued = time.perf_counter()
+        try:
+            await slots.acquire()
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            raise
+        finally:
+            self.stats['waiting'] -= 1
+
+        self.stats['in_flight'] += 1
+        started = time.perf_counter()
+        metrics.observe('gemini_queue_wait_seconds', started - queued, call=call)
+
+        def _release(_):
+            # ワーカースレッドから呼ばれるのでループ側で枠を返す
+            def _done():
+                self.stats['in_flight'] -= 1
+                slots.release()
+            try:
+                loop.call_soon_threadsafe(_done)
+            except RuntimeError:
+                pass  # ループ終了後は何もしない
+
+        try:
+            future = self._get_executor().submit(func, *args, **kwargs)
+        except Exception:
+            self.stats['in_flight'] -= 1
+            slots.release()
+            raise
+        future.add_done_callback(_release)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), timeout=timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            self.stats['timeouts'] += 1
+            self._observe(call, started, 'timeout')
+            raise GeminiTimeoutError(f"Gemini APIが{timeout:.0f}秒以内に応答しませんでした")
+        except asyncio.CancelledError:
+            # 未開始なら実行自体を取り消す（開始済みのスレッドは完了まで枠を保持）
+            future.cancel()
+            self.stats['cancelled'] += 1
+            self._observe(call, started, 'cancelled')
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            self._observe(call, started, 'error')
+            raise
+
+        self.stats['completed'] += 1
+        self._observe(call, started, 'ok')
+        return result
+
+    @staticmethod
+    def _observe(call, started, outcome):
+        metrics.observe('gemini_request_duration_seconds', time.perf_counter() - started, call=call, outcome=outcome)
+
+    async def generate(self, model, prompt, generation_config=None, timeout=None):
+        """model.generate_content() を非同期に実行（同一リクエストは統合）"""
+        key = request_key(model, prompt, generation_config)
+        if generation_config is None:
+            return await self.flight.do(key, lambda: self.run(model.generate_content, prompt, timeout=timeout))
+        return await self.flight.do(
+            key,
+            lambda: self.run(model.generate_content, prompt, generation_config=generation_config, timeout=timeout)
+        )
+
+    async def stream(self, model, prompt, on_text, generation_config=None, timeout=None):
+        """ストリーミング生成。断片が届くたびにイベントループ上で on_text(断片) を呼び、最後に応答全体を返す
+
+        断片を受け取る側がそれぞれ違うため、同一リクエストの統合はしない。
+        タイムアウト・取り消し後はワーカースレッドも次の断片で読むのをやめる。
+        """
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+
+        def generate_content_stream():
+            response = model.generate_content(prompt, generation_config=generation_config, stream=True)
+            for chunk in response:
+                if stop.is_set():
+                    break
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # 本文のない断片（終了理由だけの断片など）
+                if text:
+                    loop.call_soon_threadsafe(on_text, text)
+            return response
+
+        try:
+            return await self.run(generate_content_stream, timeout=timeout)
+        finally:
+            stop.set()
+
+    def shutdown(self):
+        """ワーカースレッドを停止（実行中のリクエストは待たない）"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+gemini_gateway = GeminiGateway()
@@ -0,0 +1,274 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
+OFFLINE = 'offline'
+STATUSES = ('online', 'idle', 'dnd', OFFLINE)
+
+_EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)  # joined_at 不明のメンバー用
+
+
+def _status(member):
+    status = str(getattr(member, 'status', OFFLINE))
+    return status if status in STATUSES else OFFLINE  # invisible なども他人からはオフライン
+
+
+def _is_admin(member):
+    permissions = getattr(member, 'guild_permissions', None)
+    return bool(permissions and permissions.administrator)
+
+
+class GuildIndex:
+    """1サーバー分のメンバー索引（人間/Bot・ステータス別・参加日順）"""
+
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.members = {}   # id -> member
+        self.humans = {}    # id -> member（Bot以外、guild.members の順）
+        self.bots = set()
+        self.admins = set()                                # 管理者権限を持つ人間
+        self.by_status = {status: set() for status in STATUSES}        # 全メンバー
+        self.humans_by_status = {status: set() for status in STATUSES}  # 人間のみ
+        self._status = {}   # id -> 現在のバケット
+        self._joined = []   # (参加日時, id) の昇順
+        self._join_key = {}  # id -> _joined のキー
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, member):
+        if member.id in self.members:
+            self.remove(member.id)
+        member_id = member.id
+        self.members[member_id] = member
+        if member.bot:
+            self.bots.add(member_id)
+        else:
+            self.humans[member_id] = member
+            if _is_admin(member):
+                self.admins.add(member_id)
+        self._set_status(member_id, _status(member), member.bot)
+        key = (member.joined_at or _EPOCH, member_id)
+        self._join_key[member_id] = key
+        insort(self._joined, key)
+
+    def remove(self, member_id):
+        member = self.members.pop(member_id, None)
+        if member is None:
+            return
+        self.humans.pop(member_id, None)
+        self.bots.discard(member_id)
+        self.admins.discard(member_id)
+        status = self._status.pop(member_id, OFFLINE)
+        self.by_status[status].discard(member_id)
+        self.humans_by_status[status].discard(member_id)
+        key = self._join_key.pop(member_id, None)
+        if key is not None:
+            pos = bisect_left(self._joined, key)
+            if pos < len(self._joined) and self._joined[pos] == key:
+                del self._joined[pos]
+
+    def update(self, member):
+        """ロール・ステータス・表示名の変更を反映（参加日は変わらない）"""
+        if member.id not in self.members:
+            self.add(member)
+            return
+        self.members[member.id] = member
+        if not member.bot:
+            self.humans[member.id] = member
+            if _is_admin(member):
+                self.admins.add(member.id)
+            else:
+                self.admins.discard(member.id)
+        self._set_status(member.id, _status(member), member.bot)
+
+    def _set_status(self, member_id, status, is_bot):
+        old = self._status.get(member_id)
+        if old == status:
+            return
+        if old is not None:
+            self.by_status[old].discard(member_id)
+            self.humans_by_status[old].discard(member_id)
+        self._status[member_id] = status
+        self.by_status[status].add(member_id)
+        if not is_bot:
+            self.humans_by_status[status].add(member_id)
+
+    # --- 参照 ---
+
+    def status_counts(self):
+        """{'online': n, 'idle': n, 'dnd': n, 'offline': n}（Botを含む）"""
+        return {status: len(ids) for status, ids in self.by_status.items()}
+
+    def human_members(self, limit=None):
+        members = self.humans.values()
+        if limit is None:
+            return list(members)
+        result = []
+        for member in members:
+            if len(result) >= limit:
+                break
+            result.append(member)
+        return result
+
+    def online_humans(self):
+        """オフライン以外の人間メンバー"""
+        return [
+            self.humans[member_id]
+            for status in STATUSES if status != OFFLINE
+            for member_id in self.humans_by_status[status]
+        ]
+
+    def recent_members(self, k=5):
+        """参加日が新しい順に k 人"""
+        return [self.members[member_id] for _, member_id in reversed(self._joined[-k:])]
+
+    def admin_members(self):
+        return [self.humans[member_id] for member_id in self.admins]
+
+
+class MemberIndex:
+    """サーバーごとの GuildIndex をゲートウェイイベントで更新する"""
+
+    def __init__(self):
+        self._guilds = {}
+        self.rebuilds = 0
+
+    def build(self, guild):
+        index = GuildIndex(guild.id)
+        for member in guild.members:
+            index.add(member)
+        self._guilds[guild.id] = index
+        self.rebuilds += 1
+        return index
+
+    def get(self, guild):
+        """索引を返す（まだなければ guild.members から作る）"""
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = self.build(guild)
+        return index
+
+    def drop(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    def member_join(self, member):
+        self.get(member.guild).add(member)
+
+    def member_remove(self, member):
+        index = self._guilds.get(member.guild.id)
+        if index is not None:
+            index.remove(member.id)
+
+    def member_update(self, member):
+        index = self._guilds.get(member.guild.id)
+        if index is not None:
+            index.update(member)
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def stats_text(self):
+        total = sum(len(index) for index in self._guilds.values())
+        return f"{len(self._guilds)}サーバー / {total}人 (再構築 {self.rebuilds}回)"
+
+
+class VoiceIndex:
+    """サーバーごとに「どのVCに誰がいるか」を on_voice_state_update で更新する索引"""
+
+    def __init__(self):
+        self._channels = {}  # guild_id -> {channel_id: {member_id: member}}
+        self._where = {}     # guild_id -> {member_id: channel_id}
+        self._objects = {}   # channel_id -> channel（名前・並び順の表示用）
+        self.rebuilds = 0
+        self.updates = 0
+
+    @staticmethod
+    def _is_voice(channel):
+        # guild.voice_channels と同じ対象（ステージチャンネルは除く）
+        return channel is not None and str(getattr(channel, 'type', '')) == 'voice'
+
+    def build(self, guild):
+        channels = {}
+        where = {}
+        for channel in guild.voice_channels:
+            self._objects[channel.id] = channel
+            if channel.members:
+                channels[channel.id] = {member.id: member for member in channel.members}
+                for member in channel.members:
+                    where[member.id] = channel.id
+        self._channels[guild.id] = channels
+        self._where[guild.id] = where
+        self.rebuilds += 1
+
+    def _ensure(self, guild):
+        if guild.id not in self._channels:
+            self.build(guild)
+
+    def drop(self, guild_id):
+        for channel_id in self._channels.pop(guild_id, {}):
+            self._objects.pop(channel_id, None)
+        self._where.pop(guild_id, None)
+
+    def drop_channel(self, channel):
+        members = self._channels.get(channel.guild.id, {}).pop(channel.id, {})
+        where = self._where.get(channel.guild.id, {})
+        for member_id in members:
+            where.pop(member_id, None)
+        self._objects.pop(channel.id, None)
+
+    def voice_state_update(self, member, before, after):
+        guild = member.guild
+        if guild.id not in self._channels:
+            self.build(guild)  # 作成時点の状態に既に反映されている
+            return
+        self.updates += 1
+        channels = self._channels[guild.id]
+        where = self._where[guild.id]
+
+        old_channel_id = where.pop(member.id, None)
+        if old_channel_id is not None:
+            members = channels.get(old_channel_id)
+            if members is not None:
+                members.pop(member.id, None)
+                if not members:
+                    del channels[old_channel_id]
+
+        channel = after.channel
+        if self._is_voice(channel):
+            self._objects[channel.id] = channel
+            channels.setdefault(channel.id, {})[member.id] = member
+            where[member.id] = channel.id
+
+    def channel_of(self, member):
+        """メンバーがいるVCのID（いなければ None）"""
+        return self._where.get(member.guild.id, {}).get(member.id)
+
+    def channel_members(self, guild, channel_id, include_bots=False):
+        self._ensure(guild)
+        members = self._channels[guild.id].get(channel_id, {}).values()
+        return [m for m in members if include_bots or not m.bot]
+
+    def lobby(self, guild, include_bots=False):
+        """全VCのメンバーと、[(VC名, 人数), ...]（VCの並び順）を返す"""
+        self._ensure(guild)
+        members = []
+        channels = []
+        occupied = self._channels[guild.id]
+        order = sorted(occupied, key=lambda cid: getattr(self._objects.get(cid), 'position', 0))
+        for channel_id in order:
+            channel_members = [m for m in occupied[channel_id].values() if include_bots or not m.bot]
+            if channel_members:
+                members.extend(channel_members)
+                channel = self._objects.get(channel_id)
+                channels.append((getattr(channel, 'name', str(channel_id)), len(channel_members)))
+        return members, channels
+
+    def stats_text(self):
+        occupied = sum(len(channels) for channels in self._channels.values())
+        connected = sum(len(where) for where in self._where.values())
+        return f"{occupied}VC / {connected}人 (更新 {self.updates}回・再構築 {self.rebuilds}回)"
+
+
+# サーバーごとのメンバー索引・VC参加者索引（ゲートウェイイベントで差分更新。拡張機能からも同じものを使う）
+member_index = MemberIndex()
+voice_index = VoiceIndex()
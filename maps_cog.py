@@ -0,0 +1,245 @@
+import random
+
+import discord
+from discord.ext import commands
+
+from command_guard import prevent_duplicate_execution
+
+# VALORANTマップ情報
+VALORANT_MAPS = {
+    "Ascent": {
+        "name": "アセント",
+        "sites": "A・B",
+        "description": "イタリア・ヴェネツィアをモチーフにした標準的なマップ",
+        "emoji": "🏛️",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/ascent.png"
+    },
+    "Bind": {
+        "name": "バインド",
+        "sites": "A・B",
+        "description": "モロッコをモチーフにしたテレポーター付きマップ",
+        "emoji": "🕌",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/bind.png"
+    },
+    "Haven": {
+        "name": "ヘイヴン",
+        "sites": "A・B・C",
+        "description": "ブータンをモチーフにした3サイトマップ",
+        "emoji": "🏔️",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/haven.png"
+    },
+    "Split": {
+        "name": "スプリット",
+        "sites": "A・B",
+        "description": "日本・東京をモチーフにした縦長マップ",
+        "emoji": "🏙️",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/split.png"
+    },
+    "Icebox": {
+        "name": "アイスボックス",
+        "sites": "A・B",
+        "description": "ロシア・シベリアをモチーフにした寒冷地マップ",
+        "emoji": "🧊",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/icebox.png"
+    },
+    "Breeze": {
+        "name": "ブリーズ",
+        "sites": "A・B",
+        "description": "カリブ海の島をモチーフにした開放的なマップ",
+        "emoji": "🏝️",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/breeze.png"
+    },
+    "Fracture": {
+        "name": "フラクチャー",
+        "sites": "A・B",
+        "description": "アメリカをモチーフにした特殊構造マップ",
+        "emoji": "⚡",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/fracture.png"
+    },
+    "Pearl": {
+        "name": "パール",
+        "sites": "A・B",
+        "description": "ポルトガル・リスボンをモチーフにした水中都市マップ",
+        "emoji": "🐚",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/pearl.png"
+    },
+    "Lotus": {
+        "name": "ロータス",
+        "sites": "A・B・C",
+        "description": "インドをモチーフにした3サイトマップ",
+        "emoji": "🪷",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/lotus.png"
+    },
+    "Sunset": {
+        "name": "サンセット",
+        "sites": "A・B",
+        "description": "アメリカ・ロサンゼルスをモチーフにしたマップ",
+        "emoji": "🌅",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/sunset.png"
+    },
+    "Abyss": {
+        "name": "アビス",
+        "sites": "A・B",
+        "description": "OMEGA EARTHの実験施設をモチーフにしたマップ",
+        "emoji": "🕳️",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/abyss.png"
+    },
+    "Carod": {
+        "name": "カロード",
+        "sites": "A・B",
+        "description": "フランス城下町を舞台にした多層構造マップ",
+        "emoji": "🏰",
+        "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/maps/carod.jpg"
+    }
+}
+
+
+class Maps(commands.Cog):
+    """VALORANTのマップルーレット・一覧・詳細"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='map', aliases=['マップ', 'valmap'], help='VALORANTのマップをランダムに選択します')
+    @prevent_duplicate_execution
+    async def valorant_map_roulette(self, ctx, count: int = 1):
+        """VALORANTマップルーレット"""
+        try:
+            # カウント数の制限
+            if count < 1:
+                count = 1
+            elif count > 5:
+                count = 5
+                await ctx.send("⚠️ 一度に選択できるマップは最大5つまでです。")
+
+            # マップをランダムに選択
+            selected_maps = random.sample(list(VALORANT_MAPS.keys()), min(count, len(VALORANT_MAPS)))
+
+            if count == 1:
+                # 単一マップの場合は詳細表示
+                map_key = selected_maps[0]
+                map_info = VALORANT_MAPS[map_key]
+
+                embed = discord.Embed(
+                    title="🎯 VALORANTマップルーレット",
+                    description=f"**{map_info['emoji']} {map_key} ({map_info['name']})**",
+                    color=0xff4655
+                )
+
+                embed.add_field(name="📍 サイト", value=map_info['sites'], inline=True)
+                embed.add_field(name="ℹ️ 説明", value=map_info['description'], inline=False)
+
+                # マップ画像を表示
+                if 'image_url' in map_info:
+                    embed.set_image(url=map_info['image_url'])
+
+                embed.set_footer(text="Good luck, have fun! 🎮")
+
+            else:
+                # 複数マップの場合はリスト表示
+                embed = discord.Embed(
+                    title=f"🎯 VALORANTマップルーレット ({count}マップ)",
+                    color=0xff4655
+                )
+
+                map_list = []
+                for i, map_key in enumerate(selected_maps, 1):
+                    map_info = VALORANT_MAPS[map_key]
+                    map_list.append(f"{i}. {map_info['emoji']} **{map_key}** ({map_info['name']})")
+
+                embed.description = "\n".join(map_list)
+                embed.set_footer(text="Good luck, have fun! 🎮")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            print(f"マップルーレットエラー: {e}")
+            await ctx.send("❌ マップルーレットでエラーが発生しました。")
+
+    @commands.command(name='maplist', aliases=['マップ一覧', 'allmaps'], help='VALORANTの全マップ一覧を表示します')
+    @prevent_duplicate_execution
+    async def valorant_map_list(self, ctx):
+        """VALORANTマップ一覧表示"""
+        try:
+            embed = discord.Embed(
+                title="🗺️ VALORANT マップ一覧",
+                description="現在のマッププール",
+                color=0xff4655
+            )
+
+            # 全マップを一覧表示
+            map_list = []
+            for map_key, map_info in VALORANT_MAPS.items():
+                map_text = f"{map_info['emoji']} **{map_key}** ({map_info['name']}) - {map_info['sites']}"
+                map_list.append(map_text)
+
+            # 全マップを一つのフィールドにまとめて表示
+            embed.add_field(
+                name="🗺️ 全マップ",
+                value="\n".join(map_list),
+                inline=False
+            )
+
+            embed.add_field(
+                name="🎲 使用方法",
+                value="`!map` - ランダムに1マップ選択\n`!map 3` - ランダムに3マップ選択",
+                inline=False
+            )
+
+            embed.set_footer(text=f"総マップ数: {len(VALORANT_MAPS)}マップ")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            print(f"マップ一覧エラー: {e}")
+            await ctx.send("❌ マップ一覧の表示でエラーが発生しました。")
+
+    @commands.command(name='mapinfo', aliases=['マップ情報'], help='特定のVALORANTマップの詳細情報を表示します')
+    @prevent_duplicate_execution
+    async def valorant_map_info(self, ctx, *, map_name=None):
+        """特定マップの詳細情報表示"""
+        try:
+            if not map_name:
+                await ctx.send("❌ マップ名を指定してください。例: `!mapinfo Ascent`")
+                return
+
+            # マップ名の検索（部分一致対応）
+            found_map = None
+            map_name_lower = map_name.lower()
+
+            for map_key, map_info in VALORANT_MAPS.items():
+                if (map_name_lower in map_key.lower() or 
+                    map_name_lower in map_info['name'].lower()):
+                    found_map = (map_key, map_info)
+                    break
+
+            if not found_map:
+                await ctx.send(f"❌ マップ「{map_name}」が見つかりません。`!maplist` で一覧を確認してください。")
+                return
+
+            map_key, map_info = found_map
+
+            embed = discord.Embed(
+                title=f"{map_info['emoji']} {map_key} ({map_info['name']})",
+                description=map_info['description'],
+                color=0xff4655
+            )
+
+            embed.add_field(name="📍 サイト構成", value=map_info['sites'], inline=True)
+            embed.add_field(name="🎯 特徴", value=map_info['description'], inline=False)
+
+            # マップ画像を表示
+            if 'image_url' in map_info:
+                embed.set_image(url=map_info['image_url'])
+
+            embed.set_footer(text="!map でランダム選択 | !maplist で全マップ一覧")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            print(f"マップ情報エラー: {e}")
+            await ctx.send("❌ マップ情報の表示でエラーが発生しました。")
+
+
+async def setup(bot):
+    await bot.add_cog(Maps(bot))
@@ -0,0 +1,177 @@
+import asyncio
+import functools
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# レイテンシ用のバケット（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+# イベントループ遅延の計測間隔と警告の閾値（秒）
+LOOP_LAG_INTERVAL = float(os.getenv('LOOP_LAG_INTERVAL', '0.25'))
+LOOP_LAG_WARN_SECONDS = float(os.getenv('LOOP_LAG_WARN_SECONDS', '1.0'))
+
+
+class Histogram:
+    """固定バケットのヒストグラム（Prometheus形式で出力できる）"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 最後は +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """バケット内を線形補間した分位点の概算"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1]  # +Inf バケットは上限で代用
+
+    def cumulative(self):
+        total = 0
+        for upper, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield upper, total
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_bound(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metrics:
+    """ラベル別のレイテンシヒストグラムをまとめて管理する"""
+
+    def __init__(self):
+        self._families = {}  # 名前 -> {'help', 'buckets', 'series': {ラベル: Histogram}}
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        """ヒストグラムを登録（同じ名前なら既存のものを使う）"""
+        return self._families.setdefault(name, {'help': help_text, 'buckets': buckets, 'series': {}})
+
+    def observe(self, name, value, **labels):
+        family = self._families.get(name) or self.histogram(name, name)
+        key = tuple(sorted(labels.items()))
+        series = family['series'].get(key)
+        if series is None:
+            series = family['series'][key] = Histogram(family['buckets'])
+        series.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with ブロックの実行時間を記録（例外時も記録する）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name, func, **labels):
+        """非同期関数をラップして実行時間を記録する"""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with self.timer(name, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+
+    def series(self, name):
+        family = self._families.get(name)
+        return family['series'] if family else {}
+
+    def slowest(self, name, n=3, q=0.95):
+        """分位点が大きい順に [(ラベル辞書, 分位点秒, 件数), ...]"""
+        rows = [(dict(key), hist.quantile(q), hist.count) for key, hist in self.series(name).items() if hist.count]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:n]
+
+    def render(self, gauges=()):
+        """Prometheusのテキスト形式で出力。gauges は (名前, 説明, 値) のリスト"""
+        lines = []
+        for name, help_text, value in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {float(value)!r}")
+        for name, family in self._families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in family['series'].items():
+                for upper, total in hist.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_bound(upper)))} {total}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+class LoopLagMonitor:
+    """一定間隔で sleep し、予定より遅れた時間をイベントループの遅延として記録する"""
+
+    def __init__(self, registry, interval=LOOP_LAG_INTERVAL, warn_seconds=LOOP_LAG_WARN_SECONDS):
+        self.registry = registry
+        self.interval = interval
+        self.warn_seconds = warn_seconds
+        self.last = 0.0
+        self.max = 0.0
+        self._task = None
+        registry.histogram('bot_event_loop_lag_seconds', 'Event loop lag measured by a periodic sleep', LOOP_LAG_BUCKETS)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            self.registry.observe('bot_event_loop_lag_seconds', lag)
+            if lag >= self.warn_seconds:
+                print(f"🐢 イベントループが {lag * 1000:.0f}ms 止まっていました")
+
+    def start(self):
+        """計測を開始（on_readyが複数回呼ばれても1つだけ）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def p95(self):
+        hist = self.registry.series('bot_event_loop_lag_seconds').get(())
+        return hist.quantile(0.95) if hist else 0.0
+
+
+metrics = Metrics()
+metrics.histogram('bot_command_duration_seconds', 'Prefix command latency measured in prevent_duplicate_execution')
+metrics.histogram('bot_view_callback_duration_seconds', 'discord.ui View/Modal callback latency')
+metrics.histogram('gemini_queue_wait_seconds', 'Time spent waiting for a Gemini worker slot')
+metrics.histogram('gemini_request_duration_seconds', 'Gemini SDK call latency in the worker thread')
+metrics.histogram('tracker_request_duration_seconds', 'Tracker.gg HTTP request latency')
+loop_lag_monitor = LoopLagMonitor(metrics)
@@ -0,0 +1,772 @@
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from command_guard import prevent_duplicate_execution
+from guild_index import voice_index
+from ranks import VALORANT_RANKS, get_rank_leaderboard, parse_rank_input, update_rank_leaderboard, user_ranks
+from storage import state_store
+from team_balancer import balance_teams
+from team_scoring import performance_from_profile
+
+RANK_LIST_PAGE_SIZE = 15
+
+
+class Ranks(commands.Cog):
+    """VALORANTランクの登録・一覧・ランク別チーム分けのコマンド（ランク情報は ranks にあり、再読み込みしても消えない）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='rank', help='VALORANTランクを管理します（例: !rank set current ダイヤ2, !rank show）')
+    @prevent_duplicate_execution
+    async def rank_system(self, ctx, action=None, rank_type=None, *rank_input):
+        """VALORANTランクシステム"""
+        try:
+            if not action:
+                # ヘルプ表示
+                embed = discord.Embed(
+                    title="🎯 VALORANTランクシステム",
+                    description="現在ランクと最高ランクを管理できます",
+                    color=0xff4655
+                )
+
+                embed.add_field(
+                    name="📝 ランク設定",
+                    value="`!rank set current [ランク]` - 現在ランク設定\n`!rank set peak [ランク]` - 最高ランク設定",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="📊 ランク表示",
+                    value="`!rank show` - 自分のランク表示\n`!rank show @ユーザー` - 他人のランク表示\n`!rank list [ページ]` - サーバー内ランキング",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="🔗 Riot ID連携",
+                    value="`!rank riot 名前#タグ` - Tracker.gg の成績をチーム分けに反映",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="🏆 ランク入力例",
+                    value="• `ダイヤ2`, `ダイヤモンド ２`\n• `イモータル3`, `imm3`\n• `プラチナ1`, `plat1`\n• `レディアント`, `radiant`\n※ スペースや全角数字も対応",
+                    inline=False
+                )
+
+                embed.set_footer(text="例: !rank set current ダイヤ2")
+                await ctx.send(embed=embed)
+                return
+
+            if action.lower() == "set":
+                if not rank_type or not rank_input:
+                    await ctx.send("❌ 使用方法: `!rank set current/peak [ランク名]`")
+                    return
+
+                if rank_type.lower() not in ["current", "peak", "現在", "最高"]:
+                    await ctx.send("❌ ランクタイプは `current`（現在）または `peak`（最高）を指定してください")
+                    return
+
+                # ランクをパース（rank_inputはタプルなのでparse_rank_input関数内で処理）
+                try:
+                    parsed_rank = parse_rank_input(rank_input)
+                except Exception as e:
+                    print(f"ランクパースエラー: {e}")
+                    await ctx.send(f"❌ ランクパース中にエラーが発生しました: {str(e)}")
+                    return
+
+                if not parsed_rank:
+                    rank_list = ", ".join(list(VALORANT_RANKS.keys())[:10]) + "..."
+                    await ctx.send(f"❌ 無効なランクです。\n入力された値: `{' '.join(rank_input) if rank_input else 'なし'}`\n利用可能なランク例: {rank_list}")
+                    return
+
+                user_id = ctx.author.id
+
+                if user_id not in user_ranks:
+                    user_ranks[user_id] = {"current": None, "peak": None, "updated": datetime.now()}
+
+                # ランクタイプを統一
+                rank_type_key = "current" if rank_type.lower() in ["current", "現在"] else "peak"
+                old_rank = user_ranks[user_id].get(rank_type_key)
+
+                user_ranks[user_id][rank_type_key] = parsed_rank
+                user_ranks[user_id]["updated"] = datetime.now()
+                state_store.mark_dirty('user_ranks', user_id)
+                update_rank_leaderboard(user_id, self.bot.guilds)
+
+                rank_info = VALORANT_RANKS[parsed_rank]
+                type_display = "現在ランク" if rank_type_key == "current" else "最高ランク"
+
+                embed = discord.Embed(
+                    title="✅ ランク設定完了",
+                    description=f"{type_display}を **{rank_info['display']}** に設定しました",
+                    color=rank_info['color']
+                )
+
+                # ランク画像を表示
+                if 'image_url' in rank_info:
+                    embed.set_thumbnail(url=rank_info['image_url'])
+
+                if old_rank and old_rank != parsed_rank:
+                    old_info = VALORANT_RANKS[old_rank]
+                    embed.add_field(
+                        name="📈 変更",
+                        value=f"{old_info['display']} → {rank_info['display']}",
+                        inline=False
+                    )
+
+                embed.set_footer(text=f"更新者: {ctx.author.display_name}")
+                await ctx.send(embed=embed)
+
+            elif action.lower() == "riot":
+                # Riot ID連携（チーム分けでキャッシュ済みのKD・勝率を使う）
+                riot_id = " ".join((rank_type,) + rank_input) if rank_type else ""
+                if '#' not in riot_id:
+                    await ctx.send("❌ 使用方法: `!rank riot 名前#タグ`\n例: `!rank riot Player#JP1`")
+                    return
+
+                name, tag = riot_id.split('#', 1)
+                data, error = await self.bot.tracker_client.get_profile(name, tag)
+                if error:
+                    await ctx.send(f"❌ {error}")
+                    return
+
+                user_id = ctx.author.id
+                if user_id not in user_ranks:
+                    user_ranks[user_id] = {"current": None, "peak": None, "updated": datetime.now()}
+                user_ranks[user_id]["riot_id"] = f"{name}#{tag}"
+                state_store.mark_dirty('user_ranks', user_id)
+
+                kd, win_rate = performance_from_profile(data)
+                detail = []
+                if kd is not None:
+                    detail.append(f"KD: {kd:.2f}")
+                if win_rate is not None:
+                    detail.append(f"勝率: {win_rate:.1f}%")
+                await ctx.send(f"✅ Riot ID **{name}#{tag}** を連携しました" + (f"（{' / '.join(detail)}）" if detail else ""))
+
+            elif action.lower() == "show":
+                # ユーザー指定の確認
+                target_user = ctx.author
+                if rank_type:
+                    # メンション解析
+                    if ctx.message.mentions:
+                        target_user = ctx.message.mentions[0]
+                    else:
+                        await ctx.send("❌ ユーザーが見つかりません。`@ユーザー名` でメンションしてください。")
+                        return
+
+                user_id = target_user.id
+                if user_id not in user_ranks or (not user_ranks[user_id]["current"] and not user_ranks[user_id]["peak"]):
+                    if target_user == ctx.author:
+                        await ctx.send("❌ ランクが設定されていません。`!rank set current [ランク]` で設定してください。")
+                    else:
+                        await ctx.send(f"❌ {target_user.display_name} のランクは設定されていません。")
+                    return
+
+                user_data = user_ranks[user_id]
+                current_rank = user_data.get("current")
+                peak_rank = user_data.get("peak")
+
+                # 表示色を決定（現在ランクがあればそれを、なければピークランクを使用）
+                display_color = 0xff4655
+                if current_rank:
+                    display_color = VALORANT_RANKS[current_rank]['color']
+                elif peak_rank:
+                    display_color = VALORANT_RANKS[peak_rank]['color']
+
+                embed = discord.Embed(
+                    title=f"🎯 {target_user.display_name} のVALORANTランク",
+                    color=display_color
+                )
+
+                # 現在ランクと最高ランクを表示
+                if current_rank:
+                    current_info = VALORANT_RANKS[current_rank]
+                    embed.add_field(
+                        name="📊 現在ランク",
+                        value=f"**{current_info['display']}**",
+                        inline=True
+                    )
+                else:
+                    embed.add_field(
+                        name="📊 現在ランク",
+                        value="未設定",
+                        inline=True
+                    )
+
+                if peak_rank:
+                    peak_info = VALORANT_RANKS[peak_rank]
+                    embed.add_field(
+                        name="🏆 最高ランク",
+                        value=f"**{peak_info['display']}**",
+                        inline=True
+                    )
+                else:
+                    embed.add_field(
+                        name="🏆 最高ランク",
+                        value="未設定",
+                        inline=True
+                    )
+
+                # 空のフィールドで改行
+                embed.add_field(name="\u200b", value="\u200b", inline=True)
+
+                if user_data.get("riot_id"):
+                    embed.add_field(name="🔗 Riot ID", value=user_data["riot_id"], inline=False)
+
+                # 最終更新日時
+                if "updated" in user_data:
+                    embed.add_field(
+                        name="📅 最終更新",
+                        value=user_data["updated"].strftime("%Y/%m/%d %H:%M"),
+                        inline=False
+                    )
+
+                # 画像設定：最高ランクを優先してメイン画像に、現在ランクが異なる場合はサムネイルに
+                if current_rank and peak_rank and current_rank != peak_rank:
+                    # 最高ランクをメイン画像、現在ランクをサムネイルに表示
+                    current_info = VALORANT_RANKS[current_rank]
+                    peak_info = VALORANT_RANKS[peak_rank]
+
+                    if 'image_url' in peak_info:
+                        embed.set_image(url=peak_info['image_url'])
+                    if 'image_url' in current_info:
+                        embed.set_thumbnail(url=current_info['image_url'])
+
+                elif current_rank:
+                    # 現在ランクのみの場合
+                    current_info = VALORANT_RANKS[current_rank]
+                    if 'image_url' in current_info:
+                        embed.set_image(url=current_info['image_url'])
+                        embed.set_thumbnail(url=target_user.display_avatar.url)
+
+                elif peak_rank:
+                    # 最高ランクのみの場合
+                    peak_info = VALORANT_RANKS[peak_rank]
+                    if 'image_url' in peak_info:
+                        embed.set_image(url=peak_info['image_url'])
+                        embed.set_thumbnail(url=target_user.display_avatar.url)
+                else:
+                    # どちらもない場合
+                    embed.set_thumbnail(url=target_user.display_avatar.url)
+                await ctx.send(embed=embed)
+
+            elif action.lower() == "list" or action.lower() == "ranking":
+                # サーバー内ランキング表示（!rank list [ページ]）
+                leaderboard = get_rank_leaderboard(ctx.guild)
+                total = leaderboard.count(ctx.guild.id)
+
+                if total == 0:
+                    await ctx.send("❌ このサーバーにはランクを設定したユーザーがいません。")
+                    return
+
+                total_pages = (total + RANK_LIST_PAGE_SIZE - 1) // RANK_LIST_PAGE_SIZE
+                page = int(rank_type) if rank_type and rank_type.isdigit() else 1
+                page = max(1, min(page, total_pages))
+
+                embed = discord.Embed(
+                    title="🏆 サーバー内VALORANTランキング",
+                    description=f"登録者数: {total}人" + (f"（{page}/{total_pages}ページ）" if total_pages > 1 else ""),
+                    color=0xff4655
+                )
+
+                for i, user_id, rank_value in leaderboard.page(ctx.guild.id, page, RANK_LIST_PAGE_SIZE):
+                    user = ctx.guild.get_member(user_id)
+                    if not user:
+                        continue
+                    current = user_ranks[user_id].get("current")
+                    peak = user_ranks[user_id].get("peak")
+                    rank_info = VALORANT_RANKS[current or peak]
+
+                    # メダル表示
+                    medal = ""
+                    if i == 1:
+                        medal = "🥇 "
+                    elif i == 2:
+                        medal = "🥈 "
+                    elif i == 3:
+                        medal = "🥉 "
+                    else:
+                        medal = f"{i}. "
+
+                    # ランク詳細
+                    rank_detail = rank_info['display']
+                    if current and peak and current != peak:
+                        peak_info = VALORANT_RANKS[peak]
+                        rank_detail += f" (最高: {peak_info['display']})"
+
+                    embed.add_field(
+                        name=f"{medal}{user.display_name}",
+                        value=rank_detail,
+                        inline=False
+                    )
+
+                # フッター: 自分の順位と次のページ
+                footer = []
+                my_position = leaderboard.position(ctx.guild.id, ctx.author.id)
+                if my_position:
+                    footer.append(f"あなたの順位: {my_position}位 / {total}人")
+                if page < total_pages:
+                    footer.append(f"次のページ: !rank list {page + 1}")
+                if footer:
+                    embed.set_footer(text=" | ".join(footer))
+
+                await ctx.send(embed=embed)
+
+            else:
+                await ctx.send("❌ 無効なアクション。利用可能: `set`, `show`, `list`, `riot`")
+
+        except Exception as e:
+            print(f"ランクシステムエラー: {e}")
+            import traceback
+            traceback.print_exc()
+            await ctx.send(f"❌ ランクシステムでエラーが発生しました: {str(e)}\n\n使用方法: `!rank set current/peak [ランク名]`\n例: `!rank set current ダイヤ2`")
+
+    @commands.command(name='ranklist', aliases=['ranks'], help='利用可能なVALORANTランク一覧を表示します')
+    @prevent_duplicate_execution
+    async def rank_list(self, ctx):
+        """利用可能なランク一覧表示 - 絵文字付きで見やすく整理"""
+        try:
+            embed = discord.Embed(
+                title="🏆 VALORANT ランク一覧",
+                description="**全27ランク対応** • 設定可能なランクと超短縮形",
+                color=0xff4655
+            )
+
+            # ティア別にランクを整理
+            tier_names = {
+                9: {"name": "レディアント", "emoji": "👑", "color": "🟡"},
+                8: {"name": "イモータル", "emoji": "💎", "color": "🟣"},
+                7: {"name": "アセンダント", "emoji": "🌟", "color": "🔵"},
+                6: {"name": "ダイヤモンド", "emoji": "💠", "color": "💎"},
+                5: {"name": "プラチナ", "emoji": "⚡", "color": "🟦"},
+                4: {"name": "ゴールド", "emoji": "⭐", "color": "🟨"},
+                3: {"name": "シルバー", "emoji": "🔘", "color": "⚪"},
+                2: {"name": "ブロンズ", "emoji": "🟫", "color": "🟫"},
+                1: {"name": "アイアン", "emoji": "⚫", "color": "⚫"}
+            }
+
+            # ランクを価値順にソート
+            sorted_ranks = sorted(VALORANT_RANKS.items(), key=lambda x: x[1]['value'], reverse=True)
+
+            # ティア別にグループ化
+            tiers = {}
+            for rank_key, rank_info in sorted_ranks:
+                tier = rank_info['tier']
+                if tier not in tiers:
+                    tiers[tier] = []
+                tiers[tier].append((rank_key, rank_info))
+
+            # 上位ティアから表示（絵文字付き）
+            tier_groups = []
+            for tier in sorted(tiers.keys(), reverse=True):
+                tier_info = tier_names.get(tier, {"name": f"ティア{tier}", "emoji": "🔸", "color": "⚪"})
+                tier_ranks = tiers[tier]
+
+                # ティア内のランク一覧を作成（絵文字＋超短縮形付き）
+                rank_list = []
+                for rank_key, rank_info in tier_ranks:
+                    # 超短縮形の生成
+                    if rank_key == "レディアント":
+                        shorthand = "r"
+                    elif "イモータル" in rank_key:
+                        shorthand = f"i{rank_key[-1]}"
+                    elif "アセンダント" in rank_key:
+                        shorthand = f"a{rank_key[-1]}"
+                    elif "ダイヤ" in rank_key:
+                        shorthand = f"d{rank_key[-1]}"
+                    elif "プラチナ" in rank_key:
+                        shorthand = f"p{rank_key[-1]}"
+                    elif "ゴールド" in rank_key:
+                        shorthand = f"g{rank_key[-1]}"
+                    elif "シルバー" in rank_key:
+                        shorthand = f"s{rank_key[-1]}"
+                    elif "ブロンズ" in rank_key:
+                        shorthand = f"b{rank_key[-1]}"
+                    elif "アイアン" in rank_key:
+                        shorthand = f"ir{rank_key[-1]}"
+                    else:
+                        shorthand = rank_key.lower()
+
+                    # 絵文字付きの表示
+                    rank_list.append(f"{tier_info['color']} **{rank_info['display']}** (`{shorthand}`)")
+
+                tier_groups.append({
+                    'name': f"{tier_info['emoji']} {tier_info['name']}",
+                    'value': "\n".join(rank_list)
+                })
+
+            # ティアを3つずつのグループに分けて表示（Discordの3列レイアウトを活用）
+            for i in range(0, len(tier_groups), 3):
+                group = tier_groups[i:i+3]
+                for tier_data in group:
+                    embed.add_field(
+                        name=tier_data['name'],
+                        value=tier_data['value'],
+                        inline=True
+                    )
+
+                # 3つ未満の場合はスペーサーを追加
+                while len(group) < 3:
+                    embed.add_field(name="", value="", inline=True)
+                    group.append({"name": "", "value": ""})
+
+            # 使用方法を詳しく説明
+            embed.add_field(
+                name="📝 設定方法",
+                value=(
+                    "**現在ランク設定:**\n"
+                    "`!rank set current ダイヤ2` または `!rank set current d2`\n\n"
+                    "**最高ランク設定:**\n"
+                    "`!rank set peak レディアント` または `!rank set peak r`"
+                ),
+                inline=False
+            )
+
+            embed.add_field(
+                name="💡 超短縮形の使用例",
+                value=(
+                    "• **ダイヤ1:** `d1` • **イモータル3:** `i3` • **アセンダント2:** `a2`\n"
+                    "• **プラチナ3:** `p3` • **ゴールド1:** `g1` • **シルバー2:** `s2`\n"
+                    "• **ブロンズ3:** `b3` • **アイアン1:** `ir1` • **レディアント:** `r`"
+                ),
+                inline=False
+            )
+
+            embed.add_field(
+                name="✨ 便利な機能",
+                value=(
+                    "🎯 **ランクチーム分け:** `!rank_team` でバランス調整\n"
+                    "🏆 **ランクマッチ募集:** `!ranked create ダイヤ帯` で条件付き募集\n"
+                    "📊 **ランク確認:** `!rank show` または `!rank show @ユーザー`\n"
+                    "🏅 **ランキング:** `!rank list` でサーバー内ランキング表示"
+                ),
+                inline=False
+            )
+
+            embed.set_footer(text="💎 ランクを設定してもっと楽しくVALORANTをプレイしよう！ | パネルUI: !panel → VALORANTランク")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            print(f"ランク一覧エラー: {e}")
+            import traceback
+            traceback.print_exc()
+            await ctx.send("❌ ランク一覧の表示でエラーが発生しました。")
+
+    @commands.command(name='rank_team', aliases=['rt', 'vc_rank_team'], help='VC内メンバーをランクでバランス調整してチーム分けします')
+    @prevent_duplicate_execution
+    async def rank_based_team_divide(self, ctx, rank_type="current", format_type=None):
+        """ランクベースでVC内メンバーをチーム分け"""
+        try:
+            guild = ctx.guild
+            if not guild:
+                await ctx.send("❌ このコマンドはサーバー内でのみ使用できます。")
+                return
+
+            # ランクタイプのバリデーション
+            if rank_type.lower() not in ["current", "peak", "現在", "最高"]:
+                # 第一引数がフォーマットタイプの場合
+                if rank_type.lower() in ['2v2', '3v3', '5v5', '2v1', '1v1', '4v4']:
+                    format_type = rank_type
+                    rank_type = "current"
+                else:
+                    await ctx.send("❌ ランクタイプは `current`（現在）または `peak`（最高）を指定してください")
+                    return
+
+            # ランクタイプを統一
+            rank_key = "current" if rank_type.lower() in ["current", "現在"] else "peak"
+            rank_display = "現在ランク" if rank_key == "current" else "最高ランク"
+
+            # VC内メンバーをVC参加者索引から取得
+            vc_members, active_channels = voice_index.lobby(guild)
+            voice_channels_with_members = [f"🔊 {name} ({count}人)" for name, count in active_channels]
+
+            if len(vc_members) < 2:
+                embed = discord.Embed(
+                    title="❌ VC内メンバー不足", 
+                    color=discord.Color.red()
+                )
+                embed.add_field(
+                    name="現在の状況",
+                    value=f"VC内人間メンバー: {len(vc_members)}人\nランクチーム分けには最低2人必要です。",
+                    inline=False
+                )
+                await ctx.send(embed=embed)
+                return
+
+            # メンバーのランク情報を取得
+            ranked_members = []
+            unranked_members = []
+            total_rank_value = 0
+            rank_count = 0
+
+            for member in vc_members:
+                user_id = member.id
+                if user_id in user_ranks and user_ranks[user_id].get(rank_key):
+                    rank_name = user_ranks[user_id][rank_key]
+                    rank_value = VALORANT_RANKS[rank_name]['value']
+                    ranked_members.append({
+                        'member': member,
+                        'rank': rank_name,
+                        'value': rank_value
+                    })
+                    total_rank_value += rank_value
+                    rank_count += 1
+                else:
+                    unranked_members.append(member)
+
+            # 平均ランク値を計算（未設定者用）
+            if rank_count > 0:
+                avg_rank_value = total_rank_value / rank_count
+            else:
+                avg_rank_value = 300  # シルバー1レベル
+
+            # 未ランクメンバーを平均ランクとして追加
+            for member in unranked_members:
+                ranked_members.append({
+                    'member': member,
+                    'rank': None,
+                    'value': avg_rank_value
+                })
+
+            if len(ranked_members) < 2:
+                await ctx.send("❌ チーム分けには最低2人必要です。")
+                return
+
+            # フォーマット別チーム分け
+            embed = discord.Embed(title=f"🎯 ランクバランスチーム分け ({rank_display})", color=0xff4655)
+
+            if format_type:
+                format_type = format_type.lower()
+
+                if format_type in ['2v2', '2対2']:
+                    if len(ranked_members) < 4:
+                        await ctx.send("❌ 2v2には最低4人必要です。")
+                        return
+
+                    team1, team2 = balance_teams(ranked_members[:4], 2)
+                    extras = ranked_members[4:] if len(ranked_members) > 4 else []
+
+                elif format_type in ['3v3', '3対3']:
+                    if len(ranked_members) < 6:
+                        await ctx.send(f"⚠️ 3v3には6人必要ですが、{len(ranked_members)}人しかいません。")
+                        if len(ranked_members) >= 4:
+                            team_size = len(ranked_members) // 2
+                            team1, team2 = balance_teams(ranked_members, team_size)
+                            extras = []
+                        else:
+                            await ctx.send("❌ チーム分けには最低4人必要です。")
+                            return
+                    else:
+                        team1, team2 = balance_teams(ranked_members[:6], 3)
+                        extras = ranked_members[6:]
+
+                elif format_type in ['5v5', '5対5']:
+                    if len(ranked_members) < 10:
+                        await ctx.send(f"⚠️ 5v5には10人必要ですが、{len(ranked_members)}人しかいません。")
+                        if len(ranked_members) >= 6:
+                            team_size = len(ranked_members) // 2
+                            team1, team2 = balance_teams(ranked_members, team_size)
+                            extras = []
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1, team2 = balance_teams(ranked_members[:10], 5)
+                        extras = ranked_members[10:]
+
+                elif format_type in ['2v1', '2対1']:
+                    if len(ranked_members) < 3:
+                        await ctx.send("❌ 2v1には最低3人必要です。")
+                        return
+
+                    # 2v1は特別処理（最強者1人 vs 他2人）
+                    sorted_members = sorted(ranked_members, key=lambda x: x['value'], reverse=True)
+                    team1 = sorted_members[1:3]  # 2-3位
+                    team2 = [sorted_members[0]]   # 1位
+                    extras = sorted_members[3:] if len(sorted_members) > 3 else []
+
+                elif format_type in ['1v1', '1対1']:
+                    if len(ranked_members) < 2:
+                        await ctx.send("❌ 1v1には最低2人必要です。")
+                        return
+
+                    # 1v1は最もランクが近い者同士
+                    sorted_members = sorted(ranked_members, key=lambda x: x['value'], reverse=True)
+                    team1 = [sorted_members[0]]
+                    team2 = [sorted_members[1]]
+                    extras = sorted_members[2:]
+
+                elif format_type in ['4v4', '4対4']:
+                    if len(ranked_members) < 8:
+                        await ctx.send(f"⚠️ 4v4には8人必要ですが、{len(ranked_members)}人しかいません。")
+                        if len(ranked_members) >= 6:
+                            team_size = len(ranked_members) // 2
+                            team1, team2 = balance_teams(ranked_members, team_size)
+                            extras = []
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1, team2 = balance_teams(ranked_members[:8], 4)
+                        extras = ranked_members[8:]
+                else:
+                    await ctx.send("❌ 対応していない形式です。使用可能: `2v1`, `3v3`, `2v2`, `1v1`, `4v4`, `5v5`")
+                    return
+            else:
+                # 自動フォーマット選択
+                member_count = len(ranked_members)
+
+                if member_count >= 10:
+                    team1, team2 = balance_teams(ranked_members[:10], 5)
+                    extras = ranked_members[10:]
+                    format_type = "5v5"
+                elif member_count >= 8:
+                    team1, team2 = balance_teams(ranked_members[:8], 4)
+                    extras = ranked_members[8:]
+                    format_type = "4v4"
+                elif member_count >= 6:
+                    team1, team2 = balance_teams(ranked_members[:6], 3)
+                    extras = ranked_members[6:]
+                    format_type = "3v3"
+                elif member_count >= 4:
+                    team1, team2 = balance_teams(ranked_members[:4], 2)
+                    extras = ranked_members[4:]
+                    format_type = "2v2"
+                elif member_count == 3:
+                    sorted_members = sorted(ranked_members, key=lambda x: x['value'], reverse=True)
+                    team1 = sorted_members[1:3]
+                    team2 = [sorted_members[0]]
+                    extras = []
+                    format_type = "2v1"
+                else:
+                    sorted_members = sorted(ranked_members, key=lambda x: x['value'], reverse=True)
+                    team1 = [sorted_members[0]]
+                    team2 = [sorted_members[1]]
+                    extras = []
+                    format_type = "1v1"
+
+            # チーム情報を表示
+            def format_team_info(team, team_name, team_color):
+                if not team:
+                    return
+
+                team_display = []
+                team_total = 0
+                rank_counts = {}
+
+                for member_data in team:
+                    member = member_data['member']
+                    rank = member_data['rank']
+                    value = member_data['value']
+                    team_total += value
+
+                    if rank:
+                        rank_info = VALORANT_RANKS[rank]
+                        member_display = f"• {member.display_name} ({rank_info['display']})"
+                        rank_counts[rank_info['display']] = rank_counts.get(rank_info['display'], 0) + 1
+                    else:
+                        member_display = f"• {member.display_name} (ランク未設定)"
+                        rank_counts['ランク未設定'] = rank_counts.get('ランク未設定', 0) + 1
+
+                    team_display.append(member_display)
+
+                avg_rank = team_total / len(team) if team else 0
+
+                embed.add_field(
+                    name=f"{team_color} {team_name} ({len(team)}人)",
+                    value="\n".join(team_display),
+                    inline=True
+                )
+
+                # チーム平均ランク値を表示
+                embed.add_field(
+                    name=f"📊 {team_name} 平均値",
+                    value=f"{avg_rank:.0f}",
+                    inline=True
+                )
+
+                return avg_rank
+
+            # チーム1の情報
+            avg1 = format_team_info(team1, "チーム1", "🔴")
+
+            # スペーサー（3列レイアウト用）
+            embed.add_field(name="", value="", inline=True)
+
+            # チーム2の情報
+            avg2 = format_team_info(team2, "チーム2", "🔵")
+
+            # バランス情報
+            balance_diff = abs(avg1 - avg2) if avg1 and avg2 else 0
+            balance_quality = "完璧" if balance_diff < 50 else "良好" if balance_diff < 100 else "やや偏り" if balance_diff < 150 else "偏りあり"
+
+            embed.add_field(
+                name="⚖️ バランス評価",
+                value=f"{balance_quality} (差: {balance_diff:.0f})",
+                inline=False
+            )
+
+            # 待機メンバー
+            if extras:
+                extras_display = []
+                for member_data in extras:
+                    member = member_data['member']
+                    rank = member_data['rank']
+                    if rank:
+                        rank_info = VALORANT_RANKS[rank]
+                        extras_display.append(f"• {member.display_name} ({rank_info['display']})")
+                    else:
+                        extras_display.append(f"• {member.display_name} (ランク未設定)")
+
+                embed.add_field(
+                    name="⚪ 待機",
+                    value="\n".join(extras_display),
+                    inline=False
+                )
+
+            # 統計情報
+            ranked_count = len([m for m in ranked_members if m['rank']])
+            unranked_count = len(unranked_members)
+
+            embed.add_field(
+                name="📊 統計情報",
+                value=f"基準: {rank_display}\n"
+                      f"ランク設定済み: {ranked_count}人\n"
+                      f"未設定: {unranked_count}人\n"
+                      f"形式: {format_type}",
+                inline=False
+            )
+
+            # VC情報
+            if voice_channels_with_members:
+                embed.add_field(
+                    name="🎤 対象VC", 
+                    value="\n".join(voice_channels_with_members), 
+                    inline=False
+                )
+
+            embed.set_footer(text=f"🎯 ランクバランス調整 | 未設定者は平均ランク({avg_rank_value:.0f})として計算")
+
+            await ctx.send(embed=embed)
+
+            # 追加メッセージ
+            balance_msg = "⚖️ ランクバランスを考慮したチーム分けを行いました！"
+            if unranked_count > 0:
+                balance_msg += f"\n💡 {unranked_count}人がランク未設定のため、平均ランクで計算しています。"
+
+            await ctx.send(balance_msg)
+
+        except Exception as e:
+            await ctx.send(f"❌ ランクベースチーム分けでエラーが発生しました: {str(e)}")
+            print(f"ランクベースチーム分けエラー: {e}")
+            import traceback
+            traceback.print_exc()
+
+
+async def setup(bot):
+    await bot.add_cog(Ranks(bot))
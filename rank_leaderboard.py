@@ -0,0 +1,83 @@
+from bisect import bisect_left, insort
+
+
+class RankLeaderboard:
+    """サーバーごとのランク順リスト（ランク変更時に二分探索で差分更新）
+
+    各サーバーの並びは (-ランク値, ユーザーID) の昇順リストで、上位k件・
+    ページ単位の範囲・自分の順位を全件ソートせずに取り出せる。
+    位置の検索は O(log n) だが、リストへの挿入・削除は要素をずらすので O(n)
+    （1サーバーのランク登録者は多くても数千人で、ずらすのは memmove 1回で済む）。
+    """
+
+    def __init__(self):
+        self._boards = {}  # guild_id -> [(-value, user_id), ...]
+        self._keys = {}    # guild_id -> {user_id: (-value, user_id)}
+        self.updates = 0
+
+    def has(self, guild_id):
+        return guild_id in self._boards
+
+    def build(self, guild_id, entries):
+        """entries: (user_id, value) のイテラブルから作り直す"""
+        keys = {user_id: (-value, user_id) for user_id, value in entries if value is not None}
+        self._keys[guild_id] = keys
+        self._boards[guild_id] = sorted(keys.values())
+
+    def drop(self, guild_id):
+        self._boards.pop(guild_id, None)
+        self._keys.pop(guild_id, None)
+
+    def clear(self):
+        self._boards.clear()
+        self._keys.clear()
+
+    def update(self, guild_id, user_id, value):
+        """ユーザーのランク値を更新（None なら削除）。未作成のサーバーは無視。挿入・削除は O(n)"""
+        board = self._boards.get(guild_id)
+        if board is None:
+            return
+        self._discard(guild_id, user_id)
+        if value is not None:
+            key = (-value, user_id)
+            insort(board, key)
+            self._keys[guild_id][user_id] = key
+        self.updates += 1
+
+    def remove(self, guild_id, user_id):
+        if guild_id in self._boards:
+            self._discard(guild_id, user_id)
+
+    def _discard(self, guild_id, user_id):
+        key = self._keys[guild_id].pop(user_id, None)
+        if key is None:
+            return
+        board = self._boards[guild_id]
+        pos = bisect_left(board, key)
+        if pos < len(board) and board[pos] == key:
+            del board[pos]
+
+    # --- 参照 ---
+
+    def count(self, guild_id):
+        return len(self._boards.get(guild_id, ()))
+
+    def range(self, guild_id, start, stop):
+        """start番目（0始まり）から stop番目の手前までを [(順位, ユーザーID, ランク値), ...] で返す"""
+        board = self._boards.get(guild_id, [])
+        return [(start + i + 1, user_id, -neg_value) for i, (neg_value, user_id) in enumerate(board[start:stop])]
+
+    def top(self, guild_id, k):
+        return self.range(guild_id, 0, k)
+
+    def page(self, guild_id, page, per_page):
+        """1始まりのページ番号で取り出す"""
+        start = max(0, page - 1) * per_page
+        return self.range(guild_id, start, start + per_page)
+
+    def position(self, guild_id, user_id):
+        """ユーザーの順位（1始まり）。登録がなければ None"""
+        key = self._keys.get(guild_id, {}).get(user_id)
+        if key is None:
+            return None
+        return bisect_left(self._boards[guild_id], key) + 1
@@ -0,0 +1,126 @@
+import re
+import unicodedata
+
+# ティアごとの別名（英語・カタカナ・短縮形）。ひらがなはカタカナに変換してから照合する
+TIER_ALIASES = {
+    9: ("レディアント", "レディ", "radiant", "rad", "r"),
+    8: ("イモータル", "イモ", "immortal", "imm", "imo", "i"),
+    7: ("アセンダント", "アセ", "ascendant", "asc", "a"),
+    6: ("ダイヤモンド", "ダイヤ", "ダイア", "diamond", "dia", "d"),
+    5: ("プラチナ", "プラ", "platinum", "plat", "p"),
+    4: ("ゴールド", "ゴル", "gold", "g"),
+    3: ("シルバー", "シル", "silver", "sil", "s"),
+    2: ("ブロンズ", "ブロ", "bronze", "bro", "b"),
+    1: ("アイアン", "アイ", "iron", "ir"),
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(0x3041, 0x3097)}
+
+
+def normalize(text):
+    """全角英数→半角（NFKC）、ひらがな→カタカナ、小文字化、空白削除"""
+    text = unicodedata.normalize('NFKC', text).translate(_HIRAGANA_TO_KATAKANA).casefold()
+    return _WHITESPACE.sub("", text)
+
+
+class RankResolver:
+    """ランク入力（「ダイヤ2」「d2」「ir1」「ダイヤモンド ２」など）をランク名に変換する
+
+    別名の表とトライ木は作成時に一度だけ組み立てる。照合は入力長に比例する時間で、
+    最長一致の別名を使うため「ir1」（アイアン）と「i1」（イモータル）が混ざらない。
+    ランク値・ティアはランクID（弱い順の連番）で引ける配列として持つ。
+    """
+
+    def __init__(self, ranks):
+        # ランクID順（弱い順）の配列
+        ordered = sorted(ranks.items(), key=lambda item: item[1]['value'])
+        self.keys = [key for key, _ in ordered]
+        self.values = [info['value'] for _, info in ordered]
+        self.tiers = [info['tier'] for _, info in ordered]
+        self.ids = {key: rank_id for rank_id, key in enumerate(self.keys)}
+
+        # ティア -> そのティアのランクID（ディビジョン順）
+        self.tier_ids = {}
+        for rank_id, tier in enumerate(self.tiers):
+            self.tier_ids.setdefault(tier, []).append(rank_id)
+
+        # 完全一致表（ランク名そのもの・別名+ディビジョン）と前方一致用のトライ木
+        self._exact = {normalize(key): rank_id for rank_id, key in enumerate(self.keys)}
+        self._trie = {}
+        for tier, aliases in TIER_ALIASES.items():
+            tier_ids = self.tier_ids.get(tier)
+            if not tier_ids:
+                continue
+            for alias in aliases:
+                alias = normalize(alias)
+                self._insert(alias, tier)
+                self._exact.setdefault(alias, tier_ids[-1])
+                for division, rank_id in enumerate(tier_ids, 1):
+                    self._exact.setdefault(f"{alias}{division}", rank_id)
+
+    def _insert(self, alias, tier):
+        node = self._trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[None] = tier  # None キーに終端のティアを持たせる
+
+    def _longest_prefix(self, text):
+        node = self._trie
+        tier = None
+        end = 0
+        for pos, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                tier, end = node[None], pos + 1
+        return tier, end
+
+    def resolve(self, rank_input):
+        """ランク名を返す。分からなければ None（文字列・リスト・タプルを受け付ける）"""
+        if isinstance(rank_input, (list, tuple)):
+            rank_input = " ".join(str(x) for x in rank_input)
+        elif not isinstance(rank_input, str):
+            rank_input = str(rank_input)
+        text = normalize(rank_input)
+        if not text:
+            return None
+
+        rank_id = self._exact.get(text)
+        if rank_id is not None:
+            return self.keys[rank_id]
+
+        tier, end = self._longest_prefix(text)
+        if tier is None:
+            return None
+        tier_ids = self.tier_ids[tier]
+        # 別名の後ろの最初の数字をディビジョンとみなす（範囲外・数字なしはそのティアの最上位）
+        for char in text[end:]:
+            if char.isdigit():
+                division = int(char)
+                if 1 <= division <= len(tier_ids):
+                    return self.keys[tier_ids[division - 1]]
+                break
+        return self.keys[tier_ids[-1]]
+
+    # --- 配列による参照 ---
+
+    def rank_id(self, key):
+        return self.ids.get(key)
+
+    def value_of(self, key):
+        rank_id = self.ids.get(key)
+        return None if rank_id is None else self.values[rank_id]
+
+    def tier_of(self, key):
+        rank_id = self.ids.get(key)
+        return None if rank_id is None else self.tiers[rank_id]
+
+    def tier_range(self, key):
+        """同じティアの (最低ランク, 最高ランク)。不明なら (None, None)"""
+        rank_id = self.ids.get(key)
+        if rank_id is None:
+            return None, None
+        tier_ids = self.tier_ids[self.tiers[rank_id]]
+        return self.keys[tier_ids[0]], self.keys[tier_ids[-1]]
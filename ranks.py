@@ -0,0 +1,132 @@
+from guild_index import member_index
+from rank_leaderboard import RankLeaderboard
+from rank_resolver import RankResolver
+from storage import state_store
+
+# VALORANTランクシステム
+VALORANT_RANKS = {
+    "レディアント": {"tier": 9, "display": "レディアント", "value": 900, "color": 0xFFFFFF, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/radiant.png"},
+    "イモータル3": {"tier": 8, "display": "イモータル 3", "value": 803, "color": 0xBA55D3, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/immortal3.png"},
+    "イモータル2": {"tier": 8, "display": "イモータル 2", "value": 802, "color": 0xBA55D3, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/immortal2.png"},
+    "イモータル1": {"tier": 8, "display": "イモータル 1", "value": 801, "color": 0xBA55D3, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/immortal1.png"},
+    "アセンダント3": {"tier": 7, "display": "アセンダント 3", "value": 703, "color": 0x32CD32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/ascendant3.png"},
+    "アセンダント2": {"tier": 7, "display": "アセンダント 2", "value": 702, "color": 0x32CD32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/ascendant2.png"},
+    "アセンダント1": {"tier": 7, "display": "アセンダント 1", "value": 701, "color": 0x32CD32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/ascendant1.png"},
+    "ダイヤ3": {"tier": 6, "display": "ダイヤモンド 3", "value": 603, "color": 0x87CEEB, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/diamond3.png"},
+    "ダイヤ2": {"tier": 6, "display": "ダイヤモンド 2", "value": 602, "color": 0x87CEEB, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/diamond2.png"},
+    "ダイヤ1": {"tier": 6, "display": "ダイヤモンド 1", "value": 601, "color": 0x87CEEB, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/diamond1.png"},
+    "プラチナ3": {"tier": 5, "display": "プラチナ 3", "value": 503, "color": 0x40E0D0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/platinum3.png"},
+    "プラチナ2": {"tier": 5, "display": "プラチナ 2", "value": 502, "color": 0x40E0D0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/platinum2.png"},
+    "プラチナ1": {"tier": 5, "display": "プラチナ 1", "value": 501, "color": 0x40E0D0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/platinum1.png"},
+    "ゴールド3": {"tier": 4, "display": "ゴールド 3", "value": 403, "color": 0xFFD700, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/gold3.png"},
+    "ゴールド2": {"tier": 4, "display": "ゴールド 2", "value": 402, "color": 0xFFD700, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/gold2.png"},
+    "ゴールド1": {"tier": 4, "display": "ゴールド 1", "value": 401, "color": 0xFFD700, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/gold1.png"},
+    "シルバー3": {"tier": 3, "display": "シルバー 3", "value": 303, "color": 0xC0C0C0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/silver3.png"},
+    "シルバー2": {"tier": 3, "display": "シルバー 2", "value": 302, "color": 0xC0C0C0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/silver2.png"},
+    "シルバー1": {"tier": 3, "display": "シルバー 1", "value": 301, "color": 0xC0C0C0, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/silver1.png"},
+    "ブロンズ3": {"tier": 2, "display": "ブロンズ 3", "value": 203, "color": 0xCD7F32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/bronze3.png"},
+    "ブロンズ2": {"tier": 2, "display": "ブロンズ 2", "value": 202, "color": 0xCD7F32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/bronze2.png"},
+    "ブロンズ1": {"tier": 2, "display": "ブロンズ 1", "value": 201, "color": 0xCD7F32, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/bronze1.png"},
+    "アイアン3": {"tier": 1, "display": "アイアン 3", "value": 103, "color": 0x696969, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/iron3.png"},
+    "アイアン2": {"tier": 1, "display": "アイアン 2", "value": 102, "color": 0x696969, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/iron2.png"},
+    "アイアン1": {"tier": 1, "display": "アイアン 1", "value": 101, "color": 0x696969, "image_url": "https://raw.githubusercontent.com/Mishimaxx/discord-bot/main/images/ranks/iron1.png"}
+}
+
+
+# ランク入力の解決（別名表・トライ木は起動時に一度だけ作成）
+rank_resolver = RankResolver(VALORANT_RANKS)
+
+# ユーザーランク情報ストレージ
+user_ranks = {}  # {user_id: {"current": "rank", "peak": "rank", "updated": datetime}}
+state_store.register('user_ranks', user_ranks)
+rank_leaderboard = RankLeaderboard()  # サーバーごとのランキング（!rank list 用）
+
+
+def rank_sort_value(user_id):
+    """ランキング用のランク値（現在ランクを優先、なければ最高ランク）"""
+    rank_data = user_ranks.get(user_id)
+    if not rank_data:
+        return None
+    return rank_resolver.value_of(rank_data.get("current") or rank_data.get("peak"))
+
+
+def get_rank_leaderboard(guild):
+    """サーバーのランキングを返す（初回だけ登録者から作成）"""
+    if not rank_leaderboard.has(guild.id):
+        humans = member_index.get(guild).humans
+        rank_leaderboard.build(guild.id, ((uid, rank_sort_value(uid)) for uid in user_ranks if uid in humans))
+    return rank_leaderboard
+
+
+def update_rank_leaderboard(user_id, guilds):
+    """ランク変更をユーザーが所属する各サーバー（guilds のうち）のランキングに反映"""
+    value = rank_sort_value(user_id)
+    for guild in guilds:
+        if user_id in member_index.get(guild).humans:
+            rank_leaderboard.update(guild.id, user_id, value)
+
+
+def parse_rank_input(rank_input):
+    """ランク入力をパース（例: ダイヤ2, ダイヤモンド ２, d2, ir1, imm3）。不明なら None"""
+    return rank_resolver.resolve(rank_input)
+
+
+def parse_rank_requirement(rank_text):
+    """ランク要求をパース"""
+    if not rank_text:
+        return None
+
+    # 既存のparse_rank_input関数を使用
+    return parse_rank_input(rank_text)
+
+
+def get_rank_tier_range(base_rank):
+    """ランク帯の範囲を取得（例：ダイヤ1-3）"""
+    if not base_rank:
+        return None, None
+    return rank_resolver.tier_range(base_rank)
+
+
+def check_rank_eligibility(user_id, recruit):
+    """ランク条件をチェック"""
+    if recruit['rank_requirement'] in ["any", "ランク問わず"]:
+        return True
+
+    if user_id not in user_ranks:
+        return False
+
+    user_rank_data = user_ranks[user_id]
+    current_rank = user_rank_data.get('current')
+
+    if not current_rank:
+        return False
+
+    # ランクIDは弱い順の連番なので、そのまま大小比較できる
+    user_rank_id = rank_resolver.rank_id(current_rank)
+
+    # 最低ランクチェック
+    if recruit['min_rank']:
+        if user_rank_id < rank_resolver.rank_id(recruit['min_rank']):
+            return False
+
+    # 最高ランクチェック
+    if recruit['max_rank']:
+        if user_rank_id > rank_resolver.rank_id(recruit['max_rank']):
+            return False
+
+    return True
+
+
+def get_user_rank_display(user_id):
+    """ユーザーのランク表示を取得"""
+    if user_id not in user_ranks:
+        return "(ランク未設定)"
+
+    user_rank_data = user_ranks[user_id]
+    current_rank = user_rank_data.get('current')
+
+    if not current_rank:
+        return "(ランク未設定)"
+
+    return f"({VALORANT_RANKS[current_rank]['display']})"
+
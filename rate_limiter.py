@@ -0,0 +1,233 @@
+import time
+from datetime import date
+
+MINUTE = 60
+DAY = 86400
+
+# 機能ごとの制限: (スコープ, 単位, 上限, 期間秒, 連続で使える量)
+# どの「期間秒」の間をとっても上限を超えないよう、残り (上限 - 連続で使える量) を期間をかけて補充する
+# AIは Gemini 無料枠（gemini-1.5-flash: 15 RPM / 1,500 RPD / 1,000,000 TPM、show_limits.py 参照）に合わせる
+FEATURE_LIMITS = {
+    'ai': (
+        ('user', 'requests', 3, MINUTE, 1),                  # 1ユーザー: 30秒に1回（連投防止）
+        ('guild', 'requests', 10, MINUTE, 3),                # 1サーバーで1分の全体枠を使い切らない
+        ('guild', 'requests', 1000, DAY, 50),                # 1サーバーで1日の全体枠を使い切らない
+        ('global', 'requests', 15, MINUTE, 3),               # RPM
+        ('global', 'requests', 1500, DAY, 100),              # RPD
+        ('global', 'tokens', 1_000_000, MINUTE, 200_000),    # TPM
+    ),
+    'team': (
+        ('user', 'requests', 3, 30, 2),                      # チーム分けはAPIを使わないので連投防止のみ
+    ),
+}
+
+SCOPE_NAMES = {'user': 'あなた', 'guild': 'このサーバー', 'global': 'Bot全体'}
+UNIT_NAMES = {'requests': '回', 'tokens': 'トークン'}
+
+
+def estimate_tokens(text, max_output_tokens=0):
+    """事前に確保するトークン数（日本語は1文字≒1トークンとして多めに見積もり、出力は上限まで）"""
+    return len(text) + max_output_tokens
+
+
+def period_text(period):
+    if period >= DAY:
+        return "1日"
+    if period >= MINUTE:
+        return f"{period // MINUTE}分"
+    return f"{period}秒"
+
+
+class TokenBucket:
+    """どの period 秒間をとっても limit を超えないトークンバケット（連続で burst まで使える）"""
+
+    __slots__ = ('limit', 'capacity', 'rate', 'level', 'updated')
+
+    def __init__(self, limit, period, burst, now=None):
+        self.limit = limit
+        self.capacity = burst
+        self.rate = (limit - burst) / period
+        self.level = float(burst)
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.level
+
+    def wait_time(self, amount, now):
+        """amount 使えるようになるまでの秒数（容量を超える量は容量まで溜まれば通す）"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def refund(self, amount, now):
+        # 使わなかった分を戻す（容量は超えない）
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def consume(self, amount, now):
+        # 見積もりより多く使った分の精算で一時的にマイナスになることがある
+        self._refill(now)
+        self.level -= amount
+
+    def is_full(self, now):
+        return self.available(now) >= self.capacity
+
+
+class RateLimitExceeded(Exception):
+    """ユーザー枠の超過、または待ち時間が長すぎる"""
+
+    def __init__(self, wait, scope):
+        super().__init__(f"少し待ってください。{SCOPE_NAMES.get(scope, scope)}の利用上限に達しています（あと{wait:.1f}秒）")
+        self.wait = wait
+        self.scope = scope
+
+
+class RateLimiter:
+    """機能ごと・ユーザー/サーバー/全体の階層的なトークンバケット
+
+    ユーザー枠を超えた場合はすぐ断る（連投防止）。サーバー・全体の枠が
+    空くのを待つのは AIQueue の役目で、ここでは待たずに確保を試みるだけ。
+    トークン数は見積もりで確保し、応答後に実際の使用量で精算する。
+    """
+
+    def __init__(self, limits=FEATURE_LIMITS):
+        self.limits = limits
+        self._buckets = {}  # (機能, スコープ, ID, 制限の番号) -> TokenBucket
+        self.stats = {'granted': 0, 'rejected': 0}
+        self._today = None
+        self.daily = {}          # 機能 -> {'requests': n, 'tokens': n}（当日分）
+        self.daily_guilds = {}   # (機能, サーバーID) -> 当日のリクエスト数
+
+    def _scope_id(self, scope, user_id, guild_id):
+        if scope == 'user':
+            return user_id
+        if scope == 'guild':
+            return guild_id
+        return None
+
+    def _chain(self, feature, user_id, guild_id, now, scopes=None):
+        """[(スコープ, 単位, 期間秒, バケット), ...]（DMなどサーバーがない場合はサーバー枠を飛ばす）"""
+        chain = []
+        for number, (scope, unit, limit, period, burst) in enumerate(self.limits[feature]):
+            if scopes is not None and scope not in scopes:
+                continue
+            scope_id = self._scope_id(scope, user_id, guild_id)
+            if scope == 'guild' and guild_id is None:
+                continue
+            key = (feature, scope, scope_id, number)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit, period, burst, now)
+            chain.append((scope, unit, period, bucket))
+        return chain
+
+    @staticmethod
+    def _amount(unit, tokens):
+        return 1 if unit == 'requests' else tokens
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._today:
+            self._today = today
+            self.daily = {}
+            self.daily_guilds = {}
+
+    def _blocking(self, chain, tokens, now):
+        wait, blocking = 0.0, None
+        for scope, unit, _, bucket in chain:
+            needed = bucket.wait_time(self._amount(unit, tokens), now)
+            # ユーザー枠の超過を優先して返す（待たせずに断るため）
+            if needed > 0 and (blocking != 'user' and (scope == 'user' or needed > wait)):
+                wait, blocking = needed, scope
+        return wait, blocking
+
+    def wait_time(self, feature, user_id, guild_id=None, tokens=0, scopes=None):
+        """確保できるまでの秒数と詰まっているスコープ（確保はしない）"""
+        now = time.monotonic()
+        return self._blocking(self._chain(feature, user_id, guild_id, now, scopes), tokens, now)
+
+    def try_acquire(self, feature, user_id, guild_id=None, tokens=0, scopes=None):
+        """待たずに確保を試みる。(確保できたか, 待ち秒数, 詰まったスコープ)
+
+        scopes を指定するとそのスコープの枠だけを確保する（AIキューは受付時にユーザー枠、
+        実行時にサーバー・全体の枠を確保する）。使用量は全体の枠を確保した時に数える。
+        """
+        now = time.monotonic()
+        chain = self._chain(feature, user_id, guild_id, now, scopes)
+        wait, blocking = self._blocking(chain, tokens, now)
+        if blocking is not None:
+            if blocking == 'user':
+                self.stats['rejected'] += 1  # ユーザー枠の超過は待たずに断る
+            return False, wait, blocking
+        for _, unit, _, bucket in chain:
+            bucket.consume(self._amount(unit, tokens), now)
+        if scopes is not None and 'global' not in scopes:
+            return True, 0.0, None
+        self._roll_day()
+        totals = self.daily.setdefault(feature, {'requests': 0, 'tokens': 0})
+        totals['requests'] += 1
+        totals['tokens'] += tokens
+        if guild_id is not None:
+            self.daily_guilds[(feature, guild_id)] = self.daily_guilds.get((feature, guild_id), 0) + 1
+        self.stats['granted'] += 1
+        return True, 0.0, None
+
+    def refund(self, feature, user_id, guild_id=None, tokens=0, scopes=None):
+        """try_acquire で確保したまま使わなかった枠を戻す（順番待ちのまま取り消された依頼など）"""
+        now = time.monotonic()
+        for _, unit, _, bucket in self._chain(feature, user_id, guild_id, now, scopes):
+            bucket.refund(self._amount(unit, tokens), now)
+
+    def settle(self, feature, user_id, guild_id, estimated, actual):
+        """見積もりトークン数と実際の使用量の差を精算する"""
+        if actual is None:
+            return
+        difference = actual - estimated
+        if not difference:
+            return
+        now = time.monotonic()
+        for _, unit, _, bucket in self._chain(feature, user_id, guild_id, now):
+            if unit == 'tokens':
+                bucket.consume(difference, now)
+        self._roll_day()
+        totals = self.daily.setdefault(feature, {'requests': 0, 'tokens': 0})
+        totals['tokens'] = max(0, totals['tokens'] + difference)
+
+    def snapshot(self, feature, user_id, guild_id=None):
+        """!usage 用: [(スコープ, 単位, 今すぐ使える量, 上限, 期間秒, 次の1回までの秒数), ...]"""
+        now = time.monotonic()
+        return [
+            (scope, unit, max(0, int(bucket.available(now))), bucket.limit, period, bucket.wait_time(1, now))
+            for scope, unit, period, bucket in self._chain(feature, user_id, guild_id, now)
+        ]
+
+    def today(self, feature, guild_id=None):
+        """当日の使用量 {'requests', 'tokens', 'guild_requests'}"""
+        self._roll_day()
+        totals = dict(self.daily.get(feature, {'requests': 0, 'tokens': 0}))
+        totals['guild_requests'] = self.daily_guilds.get((feature, guild_id), 0) if guild_id is not None else None
+        return totals
+
+    def purge_idle(self):
+        """満タンに戻ったユーザー・サーバーのバケットを捨てる（作り直しても同じ状態）"""
+        now = time.monotonic()
+        idle = [key for key, bucket in self._buckets.items() if key[1] != 'global' and bucket.is_full(now)]
+        for key in idle:
+            del self._buckets[key]
+        return len(idle)
+
+    def stats_text(self):
+        ai = self.today('ai')
+        return (f"AI 本日 {ai['requests']}回・約{ai['tokens']:,}トークン / 拒否 {self.stats['rejected']} "
+                f"/ バケット {len(self._buckets)}")
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,1280 @@
+import random
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from command_guard import prevent_duplicate_execution
+from ranks import VALORANT_RANKS, check_rank_eligibility, get_user_rank_display, user_ranks
+from recruits import (active_rank_recruits, active_scrims, build_team_players, create_custom_embed,
+                      create_ranked_embed, create_ranked_recruit, create_scrim, reminder_scheduler, teammate_history)
+from render_coordinator import render_coordinator
+from storage import state_store
+from team_scoring import score_teams
+
+
+async def join_scrim(ctx):
+    """カスタムゲーム参加"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    if user_id in scrim['participants']:
+        await ctx.send("⚠️ 既に参加済みです。")
+        return
+
+    if len(scrim['participants']) >= scrim['max_players']:
+        await ctx.send("❌ 参加者が満員です。")
+        return
+
+    # 参加処理
+    scrim['participants'].append(user_id)
+    state_store.mark_dirty('active_scrims', scrim['channel_id'])
+
+    current_count = len(scrim['participants'])
+    max_players = scrim['max_players']
+
+    # ステータス更新
+    if current_count >= max_players:
+        scrim['status'] = 'ready'
+
+    # 参加者リスト作成
+    guild = ctx.guild
+    participants_list = []
+    for participant_id in scrim['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            participants_list.append(f"• {member.display_name}")
+
+    # 更新メッセージ
+    embed = discord.Embed(
+        title="✅ カスタムゲーム参加完了！" if current_count < max_players else "🎉 カスタムゲーム参加者満員！",
+        color=0x00ff88 if current_count < max_players else 0xffd700
+    )
+
+    embed.add_field(
+        name="📊 現在の状況",
+        value=f"**参加者:** {current_count}/{max_players}人\n"
+              f"**ゲームモード:** {scrim['game_mode']}\n"
+              f"**開始予定:** {scrim['scheduled_time']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list),
+        inline=True
+    )
+
+    if current_count >= max_players:
+        embed.add_field(
+            name="🎯 次のステップ",
+            value="`!custom team` - チーム分け\n`!custom remind` - 全員に通知",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+async def leave_scrim(ctx):
+    """カスタムゲーム離脱"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    if user_id not in scrim['participants']:
+        await ctx.send("⚠️ カスタムゲームに参加していません。")
+        return
+
+    # 作成者の場合は特別処理
+    if user_id == scrim['creator'].id:
+        if len(scrim['participants']) > 1:
+            await ctx.send("⚠️ 作成者は他の参加者がいる間は離脱できません。`!custom end` で募集を終了してください。")
+            return
+
+    # 離脱処理
+    scrim['participants'].remove(user_id)
+    state_store.mark_dirty('active_scrims', scrim['channel_id'])
+    scrim['status'] = 'recruiting'
+
+    await ctx.send(f"✅ {ctx.author.display_name} がカスタムゲームから離脱しました。")
+
+
+async def show_scrim_status(ctx):
+    """カスタムゲーム状況表示"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    # 参加者リスト作成
+    guild = ctx.guild
+    participants_list = []
+    for participant_id in scrim['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            participants_list.append(f"• {member.display_name}")
+
+    status_map = {
+        'recruiting': '📢 募集中',
+        'ready': '✅ 準備完了',
+        'in_progress': '🎮 進行中',
+        'ended': '🏁 終了'
+    }
+
+    embed = discord.Embed(
+        title="📊 カスタムゲーム状況",
+        color=0x00ff88
+    )
+
+    embed.add_field(
+        name="基本情報",
+        value=f"**ステータス:** {status_map.get(scrim['status'], scrim['status'])}\n"
+              f"**ゲームモード:** {scrim['game_mode']}\n"
+              f"**参加者:** {len(scrim['participants'])}/{scrim['max_players']}人\n"
+              f"**開始予定:** {scrim['scheduled_time']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list) if participants_list else "なし",
+        inline=True
+    )
+
+    if scrim.get('teams'):
+        embed.add_field(
+            name="🎯 チーム分け",
+            value="チーム分け済み (詳細は `!custom team` で確認)",
+            inline=False
+        )
+
+    embed.set_footer(text=f"作成者: {scrim['creator'].display_name} | 作成時刻: {scrim['created_at'].strftime('%H:%M')}")
+
+    await ctx.send(embed=embed)
+
+
+async def end_scrim(ctx):
+    """カスタムゲーム終了"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    # 作成者または管理者のみ終了可能
+    if user_id != scrim['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ カスタムゲームの作成者または管理者のみ終了できます。")
+        return
+
+    # リマインダーキャンセル
+    reminder_scheduler.cancel(f"scrim:{scrim['id']}")
+
+    # スクリム削除
+    del active_scrims[channel_id]
+    state_store.mark_dirty('active_scrims', channel_id)
+
+    embed = discord.Embed(
+        title="🏁 カスタムゲーム募集終了",
+        description=f"**{scrim['game_mode']}** の募集を終了しました。",
+        color=0xff6b6b
+    )
+
+    embed.add_field(
+        name="📊 最終統計",
+        value=f"**参加者数:** {len(scrim['participants'])}人\n"
+              f"**募集時間:** {(datetime.now() - scrim['created_at']).seconds // 60}分間",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def add_to_scrim(ctx, args):
+    """カスタムゲームにユーザーを追加"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != scrim['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ カスタムゲームの作成者または管理者のみメンバーを追加できます。")
+        return
+
+    if not args:
+        await ctx.send("❌ 追加するユーザーを指定してください。例: `!custom add @ユーザー`")
+        return
+
+    # メンションされたユーザーを取得
+    mentioned_users = []
+    for arg in args:
+        if arg.startswith('<@') and arg.endswith('>'):
+            try:
+                user_id = int(arg.strip('<@!>'))
+                member = ctx.guild.get_member(user_id)
+                if member:
+                    mentioned_users.append(member)
+            except ValueError:
+                pass
+
+    if not mentioned_users:
+        await ctx.send("❌ 有効なユーザーメンションが見つかりません。例: `!custom add @ユーザー`")
+        return
+
+    added_users = []
+    already_joined = []
+    max_capacity = []
+
+    for member in mentioned_users:
+        if member.id in scrim['participants']:
+            already_joined.append(member.display_name)
+        elif len(scrim['participants']) >= scrim['max_players']:
+            max_capacity.append(member.display_name)
+        else:
+            # 追加処理
+            scrim['participants'].append(member.id)
+            state_store.mark_dirty('active_scrims', scrim['channel_id'])
+            added_users.append(member.display_name)
+
+            # ステータス更新
+            if len(scrim['participants']) >= scrim['max_players']:
+                scrim['status'] = 'ready'
+
+    # 既存の募集メッセージを更新
+    try:
+        if 'message_id' in scrim:
+            channel = ctx.channel
+            message = await channel.fetch_message(scrim['message_id'])
+
+            # 最新の募集情報でembedを再作成
+            updated_embed = await create_custom_embed(scrim, ctx.guild)
+
+            # 操作方法を追加（元のメッセージと同じ形式）
+            updated_embed.add_field(
+                name="🔧 操作方法",
+                value="**ボタン操作:** 下のボタンをクリック\n"
+                      "**コマンド操作:** `!custom join/leave/status`",
+                inline=False
+            )
+
+            # メッセージを更新（ボタンは維持）
+            await message.edit(embed=updated_embed)
+            render_coordinator.invalidate(message.id)
+    except:
+        pass  # メッセージ更新に失敗した場合はスキップ
+
+    # 簡潔な確認メッセージ
+    result_messages = []
+
+    if added_users:
+        result_messages.append(f"✅ **追加完了:** {', '.join(added_users)}")
+
+    if already_joined:
+        result_messages.append(f"⚠️ **既に参加済み:** {', '.join(already_joined)}")
+
+    if max_capacity:
+        result_messages.append(f"❌ **満員のため追加不可:** {', '.join(max_capacity)}")
+
+    if result_messages:
+        current_count = len(scrim['participants'])
+        status_text = f"📊 現在 {current_count}/{scrim['max_players']}人"
+
+        final_message = "\n".join(result_messages) + f"\n{status_text}"
+        await ctx.send(final_message)
+    else:
+        await ctx.send("ℹ️ 処理するユーザーがありませんでした。")
+
+
+async def kick_from_scrim(ctx, args):
+    """カスタムゲームからユーザーをキック"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != scrim['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ カスタムゲームの作成者または管理者のみキックできます。")
+        return
+
+    if not args:
+        await ctx.send("❌ キックするユーザーを指定してください。例: `!custom kick @ユーザー`")
+        return
+
+    # メンションされたユーザーを取得
+    if ctx.message.mentions:
+        target_user = ctx.message.mentions[0]
+        if target_user.id in scrim['participants']:
+            scrim['participants'].remove(target_user.id)
+            state_store.mark_dirty('active_scrims', scrim['channel_id'])
+            scrim['status'] = 'recruiting'
+            await ctx.send(f"✅ {target_user.display_name} をカスタムゲームからキックしました。")
+        else:
+            await ctx.send("❌ そのユーザーはカスタムゲームに参加していません。")
+    else:
+        await ctx.send("❌ 有効なユーザーメンションが見つかりません。")
+
+
+async def send_scrim_reminder(ctx):
+    """カスタムゲームリマインダー送信"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != scrim['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ カスタムゲームの作成者または管理者のみリマインダーを送信できます。")
+        return
+
+    # 参加者にメンション
+    guild = ctx.guild
+    mentions = []
+    for participant_id in scrim['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            mentions.append(member.mention)
+
+    embed = discord.Embed(
+        title="🔔 カスタムゲームリマインダー",
+        description=f"**{scrim['game_mode']}** の時間です！",
+        color=0xffaa00
+    )
+
+    embed.add_field(
+        name="📊 情報",
+        value=f"**参加者:** {len(scrim['participants'])}/{scrim['max_players']}人\n"
+              f"**開始予定:** {scrim['scheduled_time']}",
+        inline=False
+    )
+
+    if len(scrim['participants']) >= scrim['max_players']:
+        embed.add_field(
+            name="🎯 準備完了",
+            value="参加者が揃いました！ゲームを開始してください。",
+            inline=False
+        )
+
+    mention_text = " ".join(mentions) if mentions else "参加者なし"
+    await ctx.send(f"{mention_text}\n", embed=embed)
+
+
+async def scrim_team_divide(ctx):
+    """カスタムゲームでチーム分け実行"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    if len(scrim['participants']) < 2:
+        await ctx.send("❌ チーム分けには最低2人必要です。")
+        return
+
+    guild = ctx.guild
+    members = []
+    for participant_id in scrim['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            members.append(member)
+
+    # チーム分けロジック
+    random.shuffle(members)
+
+    if scrim['game_mode'] in ['5v5', '5V5']:
+        team_size = 5
+    elif scrim['game_mode'] in ['3v3', '3V3']:
+        team_size = 3
+    elif scrim['game_mode'] in ['2v2', '2V2']:
+        team_size = 2
+    else:
+        team_size = len(members) // 2
+
+    team1 = members[:team_size]
+    team2 = members[team_size:team_size*2]
+    extras = members[team_size*2:] if len(members) > team_size*2 else []
+
+    # チーム情報を保存
+    state_store.mark_dirty('active_scrims', scrim['channel_id'])
+    scrim['teams'] = {
+        'team1': [m.id for m in team1],
+        'team2': [m.id for m in team2],
+        'extras': [m.id for m in extras]
+    }
+
+    embed = discord.Embed(
+        title="🎯 カスタムゲームチーム分け結果",
+        color=0x00ff88
+    )
+
+    embed.add_field(
+        name="🔴 チーム1",
+        value="\n".join([f"• {m.display_name}" for m in team1]),
+        inline=True
+    )
+
+    embed.add_field(
+        name="🔵 チーム2",
+        value="\n".join([f"• {m.display_name}" for m in team2]),
+        inline=True
+    )
+
+    if extras:
+        embed.add_field(
+            name="⚪ 待機",
+            value="\n".join([f"• {m.display_name}" for m in extras]),
+            inline=False
+        )
+
+    embed.set_footer(text=f"ゲームモード: {scrim['game_mode']} | 頑張って！")
+
+    await ctx.send(embed=embed)
+
+
+async def show_scrim_info(ctx):
+    """カスタムゲーム詳細情報表示"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_scrims:
+        await ctx.send("❌ このチャンネルにアクティブなカスタムゲームがありません。")
+        return
+
+    scrim = active_scrims[channel_id]
+
+    embed = discord.Embed(
+        title="📋 カスタムゲーム詳細情報",
+        color=0x00aaff
+    )
+
+    embed.add_field(
+        name="基本情報",
+        value=f"**ID:** {scrim['id'][:8]}\n"
+              f"**作成者:** {scrim['creator'].display_name}\n"
+              f"**作成時刻:** {scrim['created_at'].strftime('%m/%d %H:%M')}\n"
+              f"**ゲームモード:** {scrim['game_mode']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="募集状況",
+        value=f"**最大人数:** {scrim['max_players']}人\n"
+              f"**現在:** {len(scrim['participants'])}人\n"
+              f"**開始予定:** {scrim['scheduled_time']}\n"
+              f"**ステータス:** {scrim['status']}",
+        inline=True
+    )
+
+    if scrim.get('description'):
+        embed.add_field(
+            name="📝 説明",
+            value=scrim['description'],
+            inline=False
+        )
+
+    if scrim.get('teams'):
+        embed.add_field(
+            name="🎯 チーム状況",
+            value="チーム分け完了済み",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+async def join_ranked_recruit(ctx):
+    """ランクマッチ募集参加"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    if user_id in recruit['participants']:
+        await ctx.send("⚠️ 既に参加済みです。")
+        return
+
+    if len(recruit['participants']) >= recruit['max_players']:
+        await ctx.send("❌ 参加者が満員です。")
+        return
+
+    # ランク条件チェック
+    if not check_rank_eligibility(user_id, recruit):
+        rank_req = recruit['rank_requirement']
+        await ctx.send(f"❌ ランク条件（{rank_req}）を満たしていません。\n"
+                      f"💡 `!rank set current [ランク]` でランクを設定してください。")
+        return
+
+    # 参加処理
+    recruit['participants'].append(user_id)
+    state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+
+    current_count = len(recruit['participants'])
+    max_players = recruit['max_players']
+
+    # ステータス更新
+    if current_count >= max_players:
+        recruit['status'] = 'ready'
+
+    # 参加者リスト作成
+    guild = ctx.guild
+    participants_list = []
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            # ランク情報を追加
+            rank_info = get_user_rank_display(participant_id)
+            participants_list.append(f"• {member.display_name} {rank_info}")
+
+    # 更新メッセージ
+    embed = discord.Embed(
+        title="✅ ランクマッチ募集参加完了！" if current_count < max_players else "🎉 ランクマッチ募集参加者満員！",
+        color=0x4a90e2 if current_count < max_players else 0xffd700
+    )
+
+    embed.add_field(
+        name="📊 現在の状況",
+        value=f"**参加者:** {current_count}/{max_players}人\n"
+              f"**ランク条件:** {recruit['rank_requirement']}\n"
+              f"**開始予定:** {recruit['scheduled_time']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list),
+        inline=True
+    )
+
+    if current_count >= max_players:
+        embed.add_field(
+            name="🎯 次のステップ",
+            value="`!ranked team` - ランクバランスチーム分け\n`!ranked remind` - 全員に通知",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+async def leave_ranked_recruit(ctx):
+    """ランクマッチ募集離脱"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    if user_id not in recruit['participants']:
+        await ctx.send("⚠️ ランクマッチ募集に参加していません。")
+        return
+
+    # 作成者の場合は特別処理
+    if user_id == recruit['creator'].id:
+        if len(recruit['participants']) > 1:
+            await ctx.send("⚠️ 作成者は他の参加者がいる間は離脱できません。`!ranked end` で募集を終了してください。")
+            return
+
+    # 離脱処理
+    recruit['participants'].remove(user_id)
+    state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+    recruit['status'] = 'recruiting'
+
+    await ctx.send(f"✅ {ctx.author.display_name} がランクマッチ募集から離脱しました。")
+
+
+async def show_ranked_recruit_status(ctx):
+    """ランクマッチ募集状況表示"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    # 参加者リスト作成（ランク情報付き）
+    guild = ctx.guild
+    participants_list = []
+    rank_stats = {}
+
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            rank_info = get_user_rank_display(participant_id)
+            participants_list.append(f"• {member.display_name} {rank_info}")
+
+            # ランク統計
+            if participant_id in user_ranks and user_ranks[participant_id].get('current'):
+                rank = user_ranks[participant_id]['current']
+                tier = VALORANT_RANKS[rank]['tier']
+                rank_stats[tier] = rank_stats.get(tier, 0) + 1
+
+    status_map = {
+        'recruiting': '📢 募集中',
+        'ready': '✅ 準備完了',
+        'in_progress': '🎮 進行中',
+        'ended': '🏁 終了'
+    }
+
+    embed = discord.Embed(
+        title="📊 ランクマッチ募集状況",
+        color=0x4a90e2
+    )
+
+    embed.add_field(
+        name="基本情報",
+        value=f"**ステータス:** {status_map.get(recruit['status'], recruit['status'])}\n"
+              f"**ランク条件:** {recruit['rank_requirement']}\n"
+              f"**参加者:** {len(recruit['participants'])}/{recruit['max_players']}人\n"
+              f"**開始予定:** {recruit['scheduled_time']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list) if participants_list else "なし",
+        inline=True
+    )
+
+    # ランク分布
+    if rank_stats:
+        tier_names = {9: "レディアント", 8: "イモータル", 7: "アセンダント", 6: "ダイヤ", 5: "プラチナ", 4: "ゴールド", 3: "シルバー", 2: "ブロンズ", 1: "アイアン"}
+        rank_distribution = []
+        for tier in sorted(rank_stats.keys(), reverse=True):
+            tier_name = tier_names.get(tier, f"ティア{tier}")
+            rank_distribution.append(f"{tier_name}: {rank_stats[tier]}人")
+
+        embed.add_field(
+            name="🏆 ランク分布",
+            value="\n".join(rank_distribution),
+            inline=False
+        )
+
+    if recruit.get('teams'):
+        embed.add_field(
+            name="🎯 チーム分け",
+            value="チーム分け済み (詳細は `!ranked team` で確認)",
+            inline=False
+        )
+
+    embed.set_footer(text=f"作成者: {recruit['creator'].display_name} | 作成時刻: {recruit['created_at'].strftime('%H:%M')}")
+
+    await ctx.send(embed=embed)
+
+
+async def end_ranked_recruit(ctx):
+    """ランクマッチ募集終了"""
+    channel_id = ctx.channel.id
+    user_id = ctx.author.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    # 作成者または管理者のみ終了可能
+    if user_id != recruit['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ ランクマッチ募集の作成者または管理者のみ終了できます。")
+        return
+
+    # リマインダーキャンセル
+    reminder_scheduler.cancel(f"ranked:{recruit['id']}")
+
+    # 募集削除
+    del active_rank_recruits[channel_id]
+    state_store.mark_dirty('active_rank_recruits', channel_id)
+
+    embed = discord.Embed(
+        title="🏁 ランクマッチ募集終了",
+        description=f"**{recruit['rank_requirement']}** の募集を終了しました。",
+        color=0xff6b6b
+    )
+
+    embed.add_field(
+        name="📊 最終統計",
+        value=f"**参加者数:** {len(recruit['participants'])}人\n"
+              f"**募集時間:** {(datetime.now() - recruit['created_at']).seconds // 60}分間",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def add_to_ranked_recruit(ctx, args):
+    """ランクマッチ募集にユーザーを追加"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != recruit['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ ランクマッチ募集の作成者または管理者のみメンバーを追加できます。")
+        return
+
+    if not args:
+        await ctx.send("❌ 追加するユーザーを指定してください。例: `!ranked add @ユーザー`")
+        return
+
+    # メンションされたユーザーを取得
+    mentioned_users = []
+    for arg in args:
+        if arg.startswith('<@') and arg.endswith('>'):
+            try:
+                user_id = int(arg.strip('<@!>'))
+                member = ctx.guild.get_member(user_id)
+                if member:
+                    mentioned_users.append(member)
+            except ValueError:
+                pass
+
+    if not mentioned_users:
+        await ctx.send("❌ 有効なユーザーメンションが見つかりません。例: `!ranked add @ユーザー`")
+        return
+
+    added_users = []
+    already_joined = []
+    max_capacity = []
+    rank_ineligible = []
+
+    for member in mentioned_users:
+        if member.id in recruit['participants']:
+            already_joined.append(member.display_name)
+        elif len(recruit['participants']) >= recruit['max_players']:
+            max_capacity.append(member.display_name)
+        elif not check_rank_eligibility(member.id, recruit):
+            rank_ineligible.append(member.display_name)
+        else:
+            # 追加処理
+            recruit['participants'].append(member.id)
+            state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+            added_users.append(member.display_name)
+
+            # ステータス更新
+            if len(recruit['participants']) >= recruit['max_players']:
+                recruit['status'] = 'ready'
+
+    # 既存の募集メッセージを更新
+    try:
+        if 'message_id' in recruit:
+            channel = ctx.channel
+            message = await channel.fetch_message(recruit['message_id'])
+
+            # 最新の募集情報でembedを再作成
+            updated_embed = await create_ranked_embed(recruit, ctx.guild)
+
+            # 操作方法を追加（元のメッセージと同じ形式）
+            updated_embed.add_field(
+                name="🔧 操作方法",
+                value="**ボタン操作:** 下のボタンをクリック\n"
+                      "**コマンド操作:** `!ranked join/leave/status`",
+                inline=False
+            )
+
+            # ランク条件の詳細表示（元のメッセージと同じ形式）
+            if recruit.get('min_rank') or recruit.get('max_rank'):
+                rank_details = []
+                if recruit.get('min_rank'):
+                    rank_details.append(f"最低ランク: {VALORANT_RANKS[recruit['min_rank']]['display']}")
+                if recruit.get('max_rank'):
+                    rank_details.append(f"最高ランク: {VALORANT_RANKS[recruit['max_rank']]['display']}")
+
+                updated_embed.add_field(
+                    name="🎯 ランク詳細",
+                    value="\n".join(rank_details),
+                    inline=False
+                )
+
+            # メッセージを更新（ボタンは維持）
+            await message.edit(embed=updated_embed)
+            render_coordinator.invalidate(message.id)
+    except:
+        pass  # メッセージ更新に失敗した場合はスキップ
+
+    # 簡潔な確認メッセージ
+    result_messages = []
+
+    if added_users:
+        result_messages.append(f"✅ **追加完了:** {', '.join(added_users)}")
+
+    if already_joined:
+        result_messages.append(f"⚠️ **既に参加済み:** {', '.join(already_joined)}")
+
+    if max_capacity:
+        result_messages.append(f"❌ **満員のため追加不可:** {', '.join(max_capacity)}")
+
+    if rank_ineligible:
+        result_messages.append(f"❌ **ランク条件不適合:** {', '.join(rank_ineligible)}")
+
+    if result_messages:
+        current_count = len(recruit['participants'])
+        status_text = f"📊 現在 {current_count}/{recruit['max_players']}人"
+
+        final_message = "\n".join(result_messages) + f"\n{status_text}"
+        await ctx.send(final_message)
+    else:
+        await ctx.send("ℹ️ 処理するユーザーがありませんでした。")
+
+
+async def kick_from_ranked_recruit(ctx, args):
+    """ランクマッチ募集からユーザーをキック"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != recruit['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ ランクマッチ募集の作成者または管理者のみキックできます。")
+        return
+
+    if not args:
+        await ctx.send("❌ キックするユーザーを指定してください。例: `!ranked kick @ユーザー`")
+        return
+
+    # メンションされたユーザーを取得
+    if ctx.message.mentions:
+        target_user = ctx.message.mentions[0]
+        if target_user.id in recruit['participants']:
+            recruit['participants'].remove(target_user.id)
+            state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+            recruit['status'] = 'recruiting'
+            await ctx.send(f"✅ {target_user.display_name} をランクマッチ募集からキックしました。")
+        else:
+            await ctx.send("❌ そのユーザーはランクマッチ募集に参加していません。")
+    else:
+        await ctx.send("❌ 有効なユーザーメンションが見つかりません。")
+
+
+async def send_ranked_recruit_reminder(ctx):
+    """ランクマッチ募集リマインダー送信"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    # 権限チェック
+    if ctx.author.id != recruit['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ ランクマッチ募集の作成者または管理者のみリマインダーを送信できます。")
+        return
+
+    # 参加者にメンション
+    guild = ctx.guild
+    mentions = []
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            mentions.append(member.mention)
+
+    embed = discord.Embed(
+        title="🔔 ランクマッチ募集リマインダー",
+        description=f"**{recruit['rank_requirement']}** の時間です！",
+        color=0xffaa00
+    )
+
+    embed.add_field(
+        name="📊 情報",
+        value=f"**参加者:** {len(recruit['participants'])}/{recruit['max_players']}人\n"
+              f"**開始予定:** {recruit['scheduled_time']}\n"
+              f"**ランク条件:** {recruit['rank_requirement']}",
+        inline=False
+    )
+
+    if len(recruit['participants']) >= recruit['max_players']:
+        embed.add_field(
+            name="🎯 準備完了",
+            value="参加者が揃いました！ランクマッチを開始してください。",
+            inline=False
+        )
+
+    mention_text = " ".join(mentions) if mentions else "参加者なし"
+    await ctx.send(f"{mention_text}\n", embed=embed)
+
+
+async def ranked_recruit_team_divide(ctx):
+    """ランクマッチ募集でランクバランスチーム分け実行"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    if len(recruit['participants']) < 2:
+        await ctx.send("❌ チーム分けには最低2人必要です。")
+        return
+
+    guild = ctx.guild
+    members = []
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            members.append(member)
+
+    # 現在・最高ランクと直近成績でスキルを計算（ランク未設定者は平均値）してチーム分け
+    team1, team2, _ = score_teams(
+        build_team_players(members),
+        len(members) // 2,
+        history=teammate_history,
+        channel_id=recruit['channel_id']
+    )
+
+    # チーム情報を保存
+    state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+    recruit['teams'] = {
+        'team1': [m['member'].id for m in team1],
+        'team2': [m['member'].id for m in team2]
+    }
+
+    embed = discord.Embed(
+        title="🎯 ランクマッチ チーム分け結果",
+        description="ランクバランスを考慮したチーム分け",
+        color=0x4a90e2
+    )
+
+    # チーム1の情報
+    team1_display = []
+    team1_total = 0
+    for member_data in team1:
+        member = member_data['member']
+        rank = member_data['rank']
+        value = member_data['skill']
+        team1_total += value
+
+        if rank:
+            rank_info = VALORANT_RANKS[rank]
+            team1_display.append(f"• {member.display_name} ({rank_info['display']})")
+        else:
+            team1_display.append(f"• {member.display_name} (ランク未設定)")
+
+    embed.add_field(
+        name="🔴 チーム1",
+        value="\n".join(team1_display),
+        inline=True
+    )
+
+    # チーム2の情報
+    team2_display = []
+    team2_total = 0
+    for member_data in team2:
+        member = member_data['member']
+        rank = member_data['rank']
+        value = member_data['skill']
+        team2_total += value
+
+        if rank:
+            rank_info = VALORANT_RANKS[rank]
+            team2_display.append(f"• {member.display_name} ({rank_info['display']})")
+        else:
+            team2_display.append(f"• {member.display_name} (ランク未設定)")
+
+    embed.add_field(
+        name="🔵 チーム2",
+        value="\n".join(team2_display),
+        inline=True
+    )
+
+    # バランス情報
+    avg1 = team1_total / len(team1) if team1 else 0
+    avg2 = team2_total / len(team2) if team2 else 0
+    balance_diff = abs(avg1 - avg2)
+    balance_quality = "完璧" if balance_diff < 50 else "良好" if balance_diff < 100 else "やや偏り" if balance_diff < 150 else "偏りあり"
+
+    embed.add_field(
+        name="⚖️ バランス評価",
+        value=f"{balance_quality} (差: {balance_diff:.0f})",
+        inline=False
+    )
+
+    embed.add_field(
+        name="📊 平均スキル",
+        value=f"チーム1: {avg1:.0f} | チーム2: {avg2:.0f}\n※ 現在・最高ランクとTracker.gg成績（`!rank riot` で連携）から算出",
+        inline=False
+    )
+
+    embed.set_footer(text=f"ランク条件: {recruit['rank_requirement']} | 頑張って！")
+
+    await ctx.send(embed=embed)
+
+
+async def check_ranked_recruit_ranks(ctx):
+    """ランクマッチ募集参加者のランク確認"""
+    channel_id = ctx.channel.id
+
+    if channel_id not in active_rank_recruits:
+        await ctx.send("❌ このチャンネルにアクティブなランクマッチ募集がありません。")
+        return
+
+    recruit = active_rank_recruits[channel_id]
+
+    guild = ctx.guild
+    rank_check_results = []
+    eligible_count = 0
+    ineligible_count = 0
+
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            # ランク適格性チェック
+            is_eligible = check_rank_eligibility(participant_id, recruit)
+            rank_display = get_user_rank_display(participant_id)
+
+            if is_eligible:
+                status = "✅"
+                eligible_count += 1
+            else:
+                status = "❌"
+                ineligible_count += 1
+
+            rank_check_results.append(f"{status} {member.display_name} {rank_display}")
+
+    embed = discord.Embed(
+        title="🔍 参加者ランク確認",
+        color=0x00ff88 if ineligible_count == 0 else 0xff6b6b
+    )
+
+    embed.add_field(
+        name="📊 確認結果",
+        value=f"**適格者:** {eligible_count}人\n"
+              f"**不適格者:** {ineligible_count}人\n"
+              f"**ランク条件:** {recruit['rank_requirement']}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 詳細結果",
+        value="\n".join(rank_check_results) if rank_check_results else "参加者なし",
+        inline=False
+    )
+
+    if ineligible_count > 0:
+        embed.add_field(
+            name="⚠️ 注意",
+            value="ランク条件を満たしていない参加者がいます。\n"
+                  "適切にランクを設定するか、募集から除外してください。",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+class Recruits(commands.Cog):
+    """カスタムゲーム・ランクマッチ募集のコマンド（募集の状態とボタンは recruits にあり、再読み込みしても消えない）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='custom', help='カスタムゲーム募集（例: !custom create 10人 20:00, !custom join, !custom status）')
+    @prevent_duplicate_execution
+    async def scrim_manager(self, ctx, action=None, *args):
+        """スクリム/カスタムゲーム管理システム"""
+        try:
+            if not action:
+                # ヘルプ表示
+                embed = discord.Embed(
+                    title="🎯 カスタムゲーム機能",
+                    description="カスタムゲームの募集・管理システム",
+                    color=0x00ff88
+                )
+
+                embed.add_field(
+                    name="📝 基本コマンド",
+                    value="`!custom create [人数] [時間]` - 募集開始\n"
+                          "`!custom join` - 参加\n"
+                          "`!custom leave` - 離脱\n"
+                          "`!custom status` - 現在の状況\n"
+                          "`!custom end` - 募集終了",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="⚙️ 管理コマンド",
+                    value="`!custom add @ユーザー` - メンバー追加\n"
+                          "`!custom kick @ユーザー` - 除外\n"
+                          "`!custom remind` - リマインダー送信\n"
+                          "`!custom team` - チーム分け実行\n"
+                          "`!custom info` - 詳細情報",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="💡 使用例",
+                    value="`!custom create 10人 20:00` - 10人で20時スタート\n"
+                          "`!custom create 5v5 今から` - 5v5を今すぐ開始",
+                    inline=False
+                )
+
+                await ctx.send(embed=embed)
+                return
+
+            channel_id = ctx.channel.id
+            user = ctx.author
+
+            if action.lower() in ['create', 'start', '作成', '開始']:
+                await create_scrim(ctx, args)
+
+            elif action.lower() in ['join', 'j', '参加']:
+                await join_scrim(ctx)
+
+            elif action.lower() in ['leave', 'l', '離脱']:
+                await leave_scrim(ctx)
+
+            elif action.lower() in ['status', 's', '状況', '確認']:
+                await show_scrim_status(ctx)
+
+            elif action.lower() in ['end', 'close', '終了', '解散']:
+                await end_scrim(ctx)
+
+            elif action.lower() in ['add', 'invite', '追加', '招待']:
+                await add_to_scrim(ctx, args)
+
+            elif action.lower() in ['kick', 'remove', '除外']:
+                await kick_from_scrim(ctx, args)
+
+            elif action.lower() in ['remind', 'reminder', 'リマインド']:
+                await send_scrim_reminder(ctx)
+
+            elif action.lower() in ['team', 'teams', 'チーム分け']:
+                await scrim_team_divide(ctx)
+
+            elif action.lower() in ['info', 'detail', '詳細']:
+                await show_scrim_info(ctx)
+
+            else:
+                await ctx.send("❌ 不明なアクション。`!custom` でヘルプを確認してください。")
+
+        except Exception as e:
+            await ctx.send(f"❌ スクリム機能でエラーが発生しました: {str(e)}")
+            print(f"スクリム機能エラー: {e}")
+
+    @commands.command(name='ranked', aliases=['ランク募集', 'rank_recruit'], help='ランクマッチ募集（例: !ranked create ダイヤ帯 20:00, !ranked join, !ranked status）')
+    @prevent_duplicate_execution
+    async def ranked_recruit_manager(self, ctx, action=None, *args):
+        """ランクマッチ募集管理システム"""
+        try:
+            if not action:
+                # ヘルプ表示
+                embed = discord.Embed(
+                    title="🏆 ランクマッチ募集機能",
+                    description="ランク帯別のマッチング募集システム",
+                    color=0x4a90e2
+                )
+
+                embed.add_field(
+                    name="📝 基本コマンド",
+                    value="`!ranked create [ランク帯] [時間]` - 募集開始\n"
+                          "`!ranked join` - 参加\n"
+                          "`!ranked leave` - 離脱\n"
+                          "`!ranked status` - 現在の状況\n"
+                          "`!ranked end` - 募集終了",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="⚙️ 管理コマンド",
+                    value="`!ranked add @ユーザー` - メンバー追加\n"
+                          "`!ranked kick @ユーザー` - 除外\n"
+                          "`!ranked remind` - リマインダー送信\n"
+                          "`!ranked team` - ランクバランスチーム分け\n"
+                          "`!ranked check` - 参加者ランク確認",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="💡 使用例",
+                    value="`!ranked create ダイヤ帯 20:00` - ダイヤ帯で20時スタート\n"
+                          "`!ranked create プラチナ以上 今から` - プラチナ以上で今すぐ\n"
+                          "`!ranked create any 21:30` - ランク問わず21:30",
+                    inline=False
+                )
+
+                await ctx.send(embed=embed)
+                return
+
+            channel_id = ctx.channel.id
+            user = ctx.author
+
+            if action.lower() in ['create', 'start', '作成', '開始']:
+                await create_ranked_recruit(ctx, args)
+
+            elif action.lower() in ['join', 'j', '参加']:
+                await join_ranked_recruit(ctx)
+
+            elif action.lower() in ['leave', 'l', '離脱']:
+                await leave_ranked_recruit(ctx)
+
+            elif action.lower() in ['status', 's', '状況', '確認']:
+                await show_ranked_recruit_status(ctx)
+
+            elif action.lower() in ['end', 'close', '終了', '解散']:
+                await end_ranked_recruit(ctx)
+
+            elif action.lower() in ['add', 'invite', '追加', '招待']:
+                await add_to_ranked_recruit(ctx, args)
+
+            elif action.lower() in ['kick', 'remove', '除外']:
+                await kick_from_ranked_recruit(ctx, args)
+
+            elif action.lower() in ['remind', 'reminder', 'リマインド']:
+                await send_ranked_recruit_reminder(ctx)
+
+            elif action.lower() in ['team', 'teams', 'チーム分け']:
+                await ranked_recruit_team_divide(ctx)
+
+            elif action.lower() in ['check', 'verify', 'ランク確認']:
+                await check_ranked_recruit_ranks(ctx)
+
+            else:
+                await ctx.send("❌ 不明なアクション。`!ranked` でヘルプを確認してください。")
+
+        except Exception as e:
+            await ctx.send(f"❌ ランクマッチ募集機能でエラーが発生しました: {str(e)}")
+            print(f"ランクマッチ募集機能エラー: {e}")
+
+
+async def setup(bot):
+    await bot.add_cog(Recruits(bot))
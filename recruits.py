@@ -0,0 +1,1644 @@
+import random
+from datetime import datetime, timedelta
+
+import discord
+
+from ranks import (VALORANT_RANKS, check_rank_eligibility, get_rank_tier_range, get_user_rank_display,
+                   parse_rank_requirement, user_ranks)
+from reminder_scheduler import ReminderScheduler
+from render_coordinator import render_coordinator
+from storage import state_store
+from team_scoring import TeammateHistory, performance_from_profile, player_skill, score_teams
+from tracker_client import tracker_client
+from ui_base import InstrumentedModal, PersistentView, check_recruit_button, request_recruit_render
+
+# カスタムゲーム・ランクマッチ募集の状態とView（!custom・!ranked の拡張機能とパネルで共有）
+
+# スクリム/カスタムゲーム管理
+active_scrims = {}  # {channel_id: scrim_data}
+state_store.register('active_scrims', active_scrims)
+teammate_history = TeammateHistory()  # チャンネルごとの直近のチーム分け
+
+# ランクマッチ募集管理
+active_rank_recruits = {}  # {channel_id: rank_recruit_data}
+state_store.register('active_rank_recruits', active_rank_recruits)
+
+# 開始前リマインダー（カスタム・ランクマッチ・トーナメント共通、1つのタスクで処理）
+reminder_scheduler = ReminderScheduler(lambda key: state_store.mark_dirty('reminders', key))
+state_store.register('reminders', reminder_scheduler.reminders)
+REMINDER_LEAD_TIME = timedelta(minutes=5)  # 開始何分前に通知するか
+
+
+def parse_datetime_input(time_input):
+    """日付・時間入力をパースしてdatetimeオブジェクトを返す"""
+    if not time_input:
+        return None
+
+    from datetime import datetime, timedelta
+    import re
+
+    time_str = time_input.strip()
+    now = datetime.now()
+
+    # 「今から」「すぐ」
+    if time_str.lower() in ['今から', 'すぐ', 'now', 'いまから']:
+        return now
+
+    # 「X分後」「X時間後」
+    minute_match = re.search(r'(\d+)分後', time_str)
+    if minute_match:
+        minutes = int(minute_match.group(1))
+        return now + timedelta(minutes=minutes)
+
+    hour_match = re.search(r'(\d+)時間後', time_str)
+    if hour_match:
+        hours = int(hour_match.group(1))
+        return now + timedelta(hours=hours)
+
+    # 「明日」「今日」のパターン
+    today_match = re.search(r'今日\s*(\d{1,2}):(\d{2})', time_str)
+    if today_match:
+        hour = int(today_match.group(1))
+        minute = int(today_match.group(2))
+        target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target_time <= now:
+            target_time += timedelta(days=1)  # 過去の時間なら明日に
+        return target_time
+
+    tomorrow_match = re.search(r'明日\s*(\d{1,2}):(\d{2})', time_str)
+    if tomorrow_match:
+        hour = int(tomorrow_match.group(1))
+        minute = int(tomorrow_match.group(2))
+        target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=1)
+        return target_time
+
+    # 「HH:MM」形式（今日の時間）
+    time_only_match = re.search(r'^(\d{1,2}):(\d{2})$', time_str)
+    if time_only_match:
+        hour = int(time_only_match.group(1))
+        minute = int(time_only_match.group(2))
+        target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target_time <= now:
+            target_time += timedelta(days=1)  # 過去の時間なら明日に
+        return target_time
+
+    # 「YYYY/MM/DD HH:MM」形式
+    full_datetime_match = re.search(r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})\s+(\d{1,2}):(\d{2})', time_str)
+    if full_datetime_match:
+        year = int(full_datetime_match.group(1))
+        month = int(full_datetime_match.group(2))
+        day = int(full_datetime_match.group(3))
+        hour = int(full_datetime_match.group(4))
+        minute = int(full_datetime_match.group(5))
+        return datetime(year, month, day, hour, minute)
+
+    # 「MM/DD HH:MM」形式
+    date_time_match = re.search(r'(\d{1,2})[/\-](\d{1,2})\s+(\d{1,2}):(\d{2})', time_str)
+    if date_time_match:
+        month = int(date_time_match.group(1))
+        day = int(date_time_match.group(2))
+        hour = int(date_time_match.group(3))
+        minute = int(date_time_match.group(4))
+        year = now.year
+        target_time = datetime(year, month, day, hour, minute)
+        if target_time <= now:
+            target_time = target_time.replace(year=year + 1)  # 過去の日付なら来年に
+        return target_time
+
+    # 「MM/DD」形式（時間は20:00をデフォルト）
+    date_only_match = re.search(r'^(\d{1,2})[/\-](\d{1,2})$', time_str)
+    if date_only_match:
+        month = int(date_only_match.group(1))
+        day = int(date_only_match.group(2))
+        year = now.year
+        target_time = datetime(year, month, day, 20, 0)  # デフォルト20:00
+        if target_time <= now:
+            target_time = target_time.replace(year=year + 1)  # 過去の日付なら来年に
+        return target_time
+
+    # パースできない場合はNone
+    return None
+
+
+def format_datetime_display(dt):
+    """datetimeオブジェクトを分かりやすい文字列に変換"""
+    if not dt:
+        return "未設定"
+
+    now = datetime.now()
+
+    # 今日の場合
+    if dt.date() == now.date():
+        return f"今日 {dt.strftime('%H:%M')}"
+
+    # 明日の場合
+    if dt.date() == (now + timedelta(days=1)).date():
+        return f"明日 {dt.strftime('%H:%M')}"
+
+    # 1週間以内の場合は曜日表示
+    days_diff = (dt.date() - now.date()).days
+    if 0 < days_diff <= 7:
+        weekdays = ['月', '火', '水', '木', '金', '土', '日']
+        weekday = weekdays[dt.weekday()]
+        return f"{dt.month}/{dt.day}({weekday}) {dt.strftime('%H:%M')}"
+
+    # それ以外は日付形式
+    return dt.strftime('%Y/%m/%d %H:%M')
+
+
+def build_team_players(members):
+    """チーム分け用のプレイヤー情報（現在・最高ランクとキャッシュ済みのTracker.gg成績）"""
+    players = []
+    for member in members:
+        rank_data = user_ranks.get(member.id, {})
+        current = rank_data.get('current')
+        peak = rank_data.get('peak')
+        kd = win_rate = None
+        riot_id = rank_data.get('riot_id')
+        if riot_id and '#' in riot_id:
+            # ボタン操作では通信せず、!valorant などで取得済みのデータだけを使う
+            profile = tracker_client.peek_profile(*riot_id.split('#', 1))
+            if profile is not None:
+                kd, win_rate = performance_from_profile(profile)
+        players.append({
+            'id': member.id,
+            'member': member,
+            'rank': current if current in VALORANT_RANKS else None,
+            'skill': player_skill(
+                VALORANT_RANKS[current]['value'] if current in VALORANT_RANKS else None,
+                VALORANT_RANKS[peak]['value'] if peak in VALORANT_RANKS else None,
+                kd,
+                win_rate
+            )
+        })
+    return players
+
+
+class CustomGameView(PersistentView):
+    """カスタムゲーム募集のボタンUI"""
+
+    custom_id_prefix = 'custom'
+
+    def __init__(self, scrim_id=None):
+        super().__init__(scrim_id)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return await check_recruit_button(interaction, self.persistent_key, active_scrims.get(interaction.channel.id))
+
+    async def on_timeout(self):
+        """タイムアウト時の処理"""
+        try:
+            # ボタンを無効化
+            for item in self.children:
+                item.disabled = True
+
+            # メッセージを更新してタイムアウトを通知
+            if hasattr(self, 'message') and self.message:
+                try:
+                    embed = discord.Embed(
+                        title="⏰ カスタムゲーム募集タイムアウト",
+                        description="ボタンの有効期限が切れました。\nコマンドでの操作は引き続き可能です。",
+                        color=0xffa500
+                    )
+                    await self.message.edit(embed=embed, view=self)
+                except Exception as e:
+                    print(f"CustomGameView メッセージ更新エラー: {e}")
+
+            print(f"CustomGameView タイムアウト処理完了")
+        except Exception as e:
+            print(f"CustomGameView タイムアウト処理エラー: {e}")
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
+        """エラーハンドリング"""
+        print(f"CustomGameView エラー: {error}")
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+            else:
+                await interaction.followup.send("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+        except:
+            pass  # エラー通知に失敗しても継続
+
+    @discord.ui.button(label='参加', emoji='✅', style=discord.ButtonStyle.success)
+    async def join_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """参加ボタン"""
+        try:
+            await interaction.response.defer()
+
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            if channel_id not in active_scrims:
+                await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+                return
+
+            scrim = active_scrims[channel_id]
+
+            if user_id in scrim['participants']:
+                await interaction.followup.send("⚠️ 既に参加済みです。", ephemeral=True)
+                return
+
+            if len(scrim['participants']) >= scrim['max_players']:
+                await interaction.followup.send("❌ 参加者が満員です。", ephemeral=True)
+                return
+
+            # 参加処理
+            scrim['participants'].append(user_id)
+            state_store.mark_dirty('active_scrims', scrim['channel_id'])
+
+            if len(scrim['participants']) >= scrim['max_players']:
+                scrim['status'] = 'ready'
+
+            # 募集メッセージを更新
+            guild = interaction.guild
+            request_recruit_render(
+                interaction, self,
+                lambda: create_custom_embed(scrim, guild),
+                "参加しました！", interaction.user.display_name,
+                lambda: f"({len(scrim['participants'])}/{scrim['max_players']})"
+            )
+        except Exception as e:
+            print(f"join_button エラー: {e}")
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message("❌ 参加処理中にエラーが発生しました。", ephemeral=True)
+                else:
+                    await interaction.followup.send("❌ 参加処理中にエラーが発生しました。", ephemeral=True)
+            except:
+                pass
+
+    @discord.ui.button(label='離脱', emoji='❌', style=discord.ButtonStyle.danger)
+    async def leave_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """離脱ボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+        user_id = interaction.user.id
+
+        if channel_id not in active_scrims:
+            await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+            return
+
+        scrim = active_scrims[channel_id]
+
+        if user_id not in scrim['participants']:
+            await interaction.followup.send("⚠️ カスタムゲームに参加していません。", ephemeral=True)
+            return
+
+        # 作成者の場合は特別処理
+        if user_id == scrim['creator'].id:
+            if len(scrim['participants']) > 1:
+                await interaction.followup.send("⚠️ 作成者は他の参加者がいる間は離脱できません。終了ボタンで募集を終了してください。", ephemeral=True)
+                return
+
+        # 離脱処理
+        scrim['participants'].remove(user_id)
+        state_store.mark_dirty('active_scrims', scrim['channel_id'])
+        scrim['status'] = 'recruiting'
+
+        # 募集メッセージを更新
+        guild = interaction.guild
+        request_recruit_render(
+            interaction, self,
+            lambda: create_custom_embed(scrim, guild),
+            "離脱しました。", interaction.user.display_name,
+            lambda: f"({len(scrim['participants'])}/{scrim['max_players']})"
+        )
+
+    @discord.ui.button(label='チーム分け', emoji='🎯', style=discord.ButtonStyle.primary)
+    async def team_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """チーム分けボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+
+        if channel_id not in active_scrims:
+            await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+            return
+
+        scrim = active_scrims[channel_id]
+
+        if len(scrim['participants']) < 2:
+            await interaction.followup.send("❌ チーム分けには最低2人必要です。", ephemeral=True)
+            return
+
+        guild = interaction.guild
+        members = []
+        for participant_id in scrim['participants']:
+            member = guild.get_member(participant_id)
+            if member:
+                members.append(member)
+
+        # チーム分けロジック（待機者はランダム、参加者はスキルと直近の組み合わせで分ける）
+        random.shuffle(members)
+
+        if scrim['game_mode'] in ['5v5', '5V5']:
+            team_size = 5
+        elif scrim['game_mode'] in ['3v3', '3V3']:
+            team_size = 3
+        elif scrim['game_mode'] in ['2v2', '2V2']:
+            team_size = 2
+        else:
+            team_size = len(members) // 2
+
+        playing = members[:team_size*2]
+        extras = members[team_size*2:] if len(members) > team_size*2 else []
+        team1_players, team2_players, skill_diff = score_teams(
+            build_team_players(playing),
+            min(team_size, len(playing) // 2),
+            history=teammate_history,
+            channel_id=channel_id,
+            tolerance=15
+        )
+        team1 = [p['member'] for p in team1_players]
+        team2 = [p['member'] for p in team2_players]
+
+        # チーム情報を保存
+        state_store.mark_dirty('active_scrims', scrim['channel_id'])
+        scrim['teams'] = {
+            'team1': [m.id for m in team1],
+            'team2': [m.id for m in team2],
+            'extras': [m.id for m in extras]
+        }
+
+        embed = discord.Embed(
+            title="🎯 カスタムゲームチーム分け結果",
+            color=0x00ff88
+        )
+
+        embed.add_field(
+            name="🔴 チーム1",
+            value="\n".join([f"• {m.display_name}" for m in team1]) if team1 else "なし",
+            inline=True
+        )
+
+        embed.add_field(
+            name="🔵 チーム2",
+            value="\n".join([f"• {m.display_name}" for m in team2]) if team2 else "なし",
+            inline=True
+        )
+
+        if extras:
+            embed.add_field(
+                name="⚪ 待機",
+                value="\n".join([f"• {m.display_name}" for m in extras]),
+                inline=False
+            )
+
+        embed.set_footer(text=f"ゲームモード: {scrim['game_mode']} | スキル差: {skill_diff:.0f} | 頑張って！")
+
+        await interaction.followup.send(embed=embed)
+
+    @discord.ui.button(label='終了', emoji='🏁', style=discord.ButtonStyle.secondary)
+    async def end_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """終了ボタン（作成者のみ）"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+        user_id = interaction.user.id
+
+        if channel_id not in active_scrims:
+            await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+            return
+
+        scrim = active_scrims[channel_id]
+
+        # 作成者または管理者のみ終了可能
+        if user_id != scrim['creator'].id and not interaction.user.guild_permissions.manage_messages:
+            await interaction.followup.send("❌ カスタムゲームの作成者または管理者のみ終了できます。", ephemeral=True)
+            return
+
+        # リマインダーキャンセル
+        reminder_scheduler.cancel(f"scrim:{scrim['id']}")
+
+        # スクリム削除
+        del active_scrims[channel_id]
+        state_store.mark_dirty('active_scrims', channel_id)
+
+        embed = discord.Embed(
+            title="🏁 カスタムゲーム募集終了",
+            description=f"**{scrim['game_mode']}** の募集を終了しました。",
+            color=0xff6b6b
+        )
+
+        embed.add_field(
+            name="📊 最終統計",
+            value=f"**参加者数:** {len(scrim['participants'])}人\n"
+                  f"**募集時間:** {(datetime.now() - scrim['created_at']).seconds // 60}分間",
+            inline=False
+        )
+
+        # ボタンを無効化
+        for item in self.children:
+            item.disabled = True
+
+        await render_coordinator.settle(interaction.message.id)
+        await interaction.edit_original_response(embed=embed, view=self)
+        self.stop()  # 永続Viewの登録を解除
+        await interaction.followup.send("カスタムゲーム募集が終了されました。", ephemeral=False)
+
+    @discord.ui.button(label='手動追加', emoji='➕', style=discord.ButtonStyle.secondary)
+    async def manual_add_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """手動追加ボタン（作成者・管理者のみ）"""
+        try:
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            if channel_id not in active_scrims:
+                await interaction.response.send_message("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+                return
+
+            scrim = active_scrims[channel_id]
+
+            # 権限チェック
+            if user_id != scrim['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.response.send_message("❌ カスタムゲームの作成者または管理者のみメンバーを追加できます。", ephemeral=True)
+                return
+
+            # 手動追加モーダルを表示
+            modal = ManualAddModal(recruit_type="custom")
+            await interaction.response.send_modal(modal)
+
+        except Exception as e:
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(f"❌ 手動追加ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+                else:
+                    await interaction.followup.send(f"❌ 手動追加ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+            except:
+                pass
+            print(f"手動追加ボタンエラー: {e}")
+
+    @discord.ui.button(label='手動削除', emoji='➖', style=discord.ButtonStyle.danger)
+    async def manual_remove_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """手動削除ボタン（作成者・管理者のみ）"""
+        try:
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            if channel_id not in active_scrims:
+                await interaction.response.send_message("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+                return
+
+            scrim = active_scrims[channel_id]
+
+            # 権限チェック
+            if user_id != scrim['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.response.send_message("❌ カスタムゲームの作成者または管理者のみメンバーを削除できます。", ephemeral=True)
+                return
+
+            # 参加者がいるかチェック（作成者以外）
+            other_participants = [p for p in scrim['participants'] if p != scrim['creator'].id]
+            if not other_participants:
+                await interaction.response.send_message("❌ 削除可能な参加者がいません。", ephemeral=True)
+                return
+
+            # 手動削除モーダルを表示
+            modal = ManualRemoveModal(recruit_type="custom")
+            await interaction.response.send_modal(modal)
+
+        except Exception as e:
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(f"❌ 手動削除ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+                else:
+                    await interaction.followup.send(f"❌ 手動削除ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+            except:
+                pass
+            print(f"手動削除ボタンエラー: {e}")
+
+
+async def create_custom_embed(scrim, guild):
+    """カスタムゲーム募集のEmbed作成"""
+    # 参加者リスト作成
+    participants_list = []
+    for participant_id in scrim['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            participants_list.append(f"• {member.display_name}")
+
+    status_map = {
+        'recruiting': '📢 募集中',
+        'ready': '✅ 準備完了',
+        'in_progress': '🎮 進行中',
+        'ended': '🏁 終了'
+    }
+
+    current_count = len(scrim['participants'])
+    max_players = scrim['max_players']
+
+    title = "🎯 カスタムゲーム募集"
+    if current_count >= max_players:
+        title = "🎉 カスタムゲーム募集（満員）"
+
+    embed = discord.Embed(
+        title=title,
+        description=f"**{scrim['game_mode']}** のメンバーを募集中",
+        color=0x00ff88 if current_count < max_players else 0xffd700
+    )
+
+    embed.add_field(
+        name="📊 募集情報",
+        value=f"**ゲームモード:** {scrim['game_mode']}\n"
+              f"**最大人数:** {max_players}人\n"
+              f"**開始時間:** {scrim['scheduled_time']}\n"
+              f"**現在の参加者:** {current_count}/{max_players}人\n"
+              f"**ステータス:** {status_map.get(scrim['status'], scrim['status'])}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list) if participants_list else "なし",
+        inline=True
+    )
+
+    if scrim.get('description'):
+        embed.add_field(
+            name="📝 詳細",
+            value=scrim['description'],
+            inline=False
+        )
+
+    if scrim.get('teams'):
+        embed.add_field(
+            name="🎯 チーム分け",
+            value="チーム分け済み（チーム分けボタンで再確認）",
+            inline=False
+        )
+
+    embed.set_footer(text=f"作成者: {scrim['creator'].display_name} | ID: {scrim['id'][:8]}")
+
+    return embed
+
+
+async def create_scrim(ctx, args):
+    """スクリム作成"""
+    channel_id = ctx.channel.id
+
+    # 既存のスクリムチェック
+    if channel_id in active_scrims:
+        await ctx.send("❌ このチャンネルで既にカスタムゲームが進行中です。`!custom end` で終了してください。")
+        return
+
+    # 引数解析
+    max_players = 10  # デフォルト
+    scheduled_time = "未設定"
+    parsed_datetime = None
+    game_mode = "カスタム"
+    description = ""
+
+    for arg in args:
+        if '人' in arg or 'v' in arg.lower():
+            # 人数またはフォーマット指定
+            if 'v' in arg.lower():
+                game_mode = arg.upper()
+                if '5v5' in arg.lower():
+                    max_players = 10
+                elif '3v3' in arg.lower():
+                    max_players = 6
+                elif '2v2' in arg.lower():
+                    max_players = 4
+                elif '1v1' in arg.lower():
+                    max_players = 2
+            else:
+                try:
+                    max_players = int(arg.replace('人', ''))
+                except:
+                    pass
+        elif any(char in arg for char in [':', '時', '/', '-']) or arg in ['今から', 'now', 'すぐ', '明日', '今日']:
+            # 時間・日付指定
+            if arg in ['今から', 'now', 'すぐ']:
+                scheduled_time = "今すぐ"
+                parsed_datetime = datetime.now()
+            else:
+                parsed_dt = parse_datetime_input(arg)
+                if parsed_dt:
+                    scheduled_time = format_datetime_display(parsed_dt)
+                    parsed_datetime = parsed_dt
+                else:
+                    scheduled_time = arg
+        else:
+            # 説明文
+            if description:
+                description += f" {arg}"
+            else:
+                description = arg
+
+    # スクリムデータ作成
+    scrim_data = {
+        'id': f"{channel_id}_{int(datetime.now().timestamp())}",
+        'channel_id': channel_id,
+        'creator': ctx.author,
+        'created_at': datetime.now(),
+        'max_players': max_players,
+        'scheduled_time': scheduled_time,
+        'parsed_datetime': parsed_datetime,
+        'game_mode': game_mode,
+        'description': description,
+        'participants': [ctx.author.id],
+        'status': 'recruiting',  # recruiting, ready, in_progress, ended
+        'teams': None
+    }
+
+    active_scrims[channel_id] = scrim_data
+    state_store.mark_dirty('active_scrims', channel_id)
+
+    # ボタン付き募集メッセージ作成
+    embed = await create_custom_embed(scrim_data, ctx.guild)
+
+    # 操作方法を追加（ボタンとコマンド両方）
+    embed.add_field(
+        name="🔧 操作方法",
+        value="**ボタン操作:** 下のボタンをクリック\n"
+              "**コマンド操作:** `!custom join/leave/status`",
+        inline=False
+    )
+
+    view = CustomGameView(scrim_data['id'])
+    message = await ctx.send(content="@everyone", embed=embed, view=view)
+    scrim_data['message_id'] = message.id
+    state_store.mark_dirty('active_scrims', channel_id)
+    view.message = message  # ビューにメッセージオブジェクトを保存
+
+    # 自動リマインダー設定（開始時間が指定されている場合）
+    if scheduled_time != "未設定" and scheduled_time != "今すぐ":
+        schedule_scrim_reminder(ctx, scrim_data)
+
+
+class RankedRecruitView(PersistentView):
+    """ランクマッチ募集のボタンUI"""
+
+    custom_id_prefix = 'ranked'
+
+    def __init__(self, recruit_id=None):
+        super().__init__(recruit_id)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return await check_recruit_button(interaction, self.persistent_key, active_rank_recruits.get(interaction.channel.id))
+
+    async def on_timeout(self):
+        """タイムアウト時の処理"""
+        try:
+            # ボタンを無効化
+            for item in self.children:
+                item.disabled = True
+
+            # メッセージを更新してタイムアウトを通知
+            if hasattr(self, 'message') and self.message:
+                try:
+                    embed = discord.Embed(
+                        title="⏰ ランクマッチ募集タイムアウト",
+                        description="ボタンの有効期限が切れました。\nコマンドでの操作は引き続き可能です。",
+                        color=0xffa500
+                    )
+                    await self.message.edit(embed=embed, view=self)
+                except Exception as e:
+                    print(f"RankedRecruitView メッセージ更新エラー: {e}")
+
+            print(f"RankedRecruitView タイムアウト処理完了")
+        except Exception as e:
+            print(f"RankedRecruitView タイムアウト処理エラー: {e}")
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
+        """エラーハンドリング"""
+        print(f"RankedRecruitView エラー: {error}")
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+            else:
+                await interaction.followup.send("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+        except:
+            pass  # エラー通知に失敗しても継続
+
+    @discord.ui.button(label='参加', emoji='✅', style=discord.ButtonStyle.success)
+    async def join_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """参加ボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+        user_id = interaction.user.id
+
+        if channel_id not in active_rank_recruits:
+            await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+            return
+
+        recruit = active_rank_recruits[channel_id]
+
+        if user_id in recruit['participants']:
+            await interaction.followup.send("⚠️ 既に参加済みです。", ephemeral=True)
+            return
+
+        if len(recruit['participants']) >= recruit['max_players']:
+            await interaction.followup.send("❌ 参加者が満員です。", ephemeral=True)
+            return
+
+        # ランク条件チェック
+        if not check_rank_eligibility(user_id, recruit):
+            rank_req = recruit['rank_requirement']
+            await interaction.followup.send(f"❌ ランク条件（{rank_req}）を満たしていません。\n💡 `!rank set current [ランク]` でランクを設定してください。", ephemeral=True)
+            return
+
+        # 参加処理
+        recruit['participants'].append(user_id)
+        state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+
+        if len(recruit['participants']) >= recruit['max_players']:
+            recruit['status'] = 'ready'
+
+        # 募集メッセージを更新
+        guild = interaction.guild
+        user_rank = get_user_rank_display(user_id)
+        request_recruit_render(
+            interaction, self,
+            lambda: create_ranked_embed(recruit, guild),
+            "参加しました！", f"{interaction.user.display_name} {user_rank}",
+            lambda: f"({len(recruit['participants'])}/{recruit['max_players']})"
+        )
+
+    @discord.ui.button(label='離脱', emoji='❌', style=discord.ButtonStyle.danger)
+    async def leave_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """離脱ボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+        user_id = interaction.user.id
+
+        if channel_id not in active_rank_recruits:
+            await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+            return
+
+        recruit = active_rank_recruits[channel_id]
+
+        if user_id not in recruit['participants']:
+            await interaction.followup.send("⚠️ ランクマッチ募集に参加していません。", ephemeral=True)
+            return
+
+        # 作成者の場合は特別処理
+        if user_id == recruit['creator'].id:
+            if len(recruit['participants']) > 1:
+                await interaction.followup.send("⚠️ 作成者は他の参加者がいる間は離脱できません。終了ボタンで募集を終了してください。", ephemeral=True)
+                return
+
+        # 離脱処理
+        recruit['participants'].remove(user_id)
+        state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+        recruit['status'] = 'recruiting'
+
+        # 募集メッセージを更新
+        guild = interaction.guild
+        request_recruit_render(
+            interaction, self,
+            lambda: create_ranked_embed(recruit, guild),
+            "離脱しました。", interaction.user.display_name,
+            lambda: f"({len(recruit['participants'])}/{recruit['max_players']})"
+        )
+
+    @discord.ui.button(label='ランクチーム分け', emoji='🎯', style=discord.ButtonStyle.primary)
+    async def team_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """ランクバランスチーム分けボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+
+        if channel_id not in active_rank_recruits:
+            await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+            return
+
+        recruit = active_rank_recruits[channel_id]
+
+        if len(recruit['participants']) < 2:
+            await interaction.followup.send("❌ チーム分けには最低2人必要です。", ephemeral=True)
+            return
+
+        # ランクバランスチーム分けの実行（既存の関数を使用）
+        await execute_ranked_team_divide_logic(recruit, interaction)
+
+    @discord.ui.button(label='ランク確認', emoji='🔍', style=discord.ButtonStyle.secondary)
+    async def check_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """ランク確認ボタン"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+
+        if channel_id not in active_rank_recruits:
+            await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+            return
+
+        recruit = active_rank_recruits[channel_id]
+
+        guild = interaction.guild
+        rank_check_results = []
+        eligible_count = 0
+        ineligible_count = 0
+
+        for participant_id in recruit['participants']:
+            member = guild.get_member(participant_id)
+            if member:
+                is_eligible = check_rank_eligibility(participant_id, recruit)
+                rank_display = get_user_rank_display(participant_id)
+
+                if is_eligible:
+                    status = "✅"
+                    eligible_count += 1
+                else:
+                    status = "❌"
+                    ineligible_count += 1
+
+                rank_check_results.append(f"{status} {member.display_name} {rank_display}")
+
+        embed = discord.Embed(
+            title="🔍 参加者ランク確認",
+            color=0x00ff88 if ineligible_count == 0 else 0xff6b6b
+        )
+
+        embed.add_field(
+            name="📊 確認結果",
+            value=f"**適格者:** {eligible_count}人\n"
+                  f"**不適格者:** {ineligible_count}人\n"
+                  f"**ランク条件:** {recruit['rank_requirement']}",
+            inline=True
+        )
+
+        embed.add_field(
+            name="👥 詳細結果",
+            value="\n".join(rank_check_results) if rank_check_results else "参加者なし",
+            inline=False
+        )
+
+        if ineligible_count > 0:
+            embed.add_field(
+                name="⚠️ 注意",
+                value="ランク条件を満たしていない参加者がいます。",
+                inline=False
+            )
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @discord.ui.button(label='終了', emoji='🏁', style=discord.ButtonStyle.secondary)
+    async def end_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """終了ボタン（作成者のみ）"""
+        await interaction.response.defer()
+
+        channel_id = interaction.channel.id
+        user_id = interaction.user.id
+
+        if channel_id not in active_rank_recruits:
+            await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+            return
+
+        recruit = active_rank_recruits[channel_id]
+
+        # 作成者または管理者のみ終了可能
+        if user_id != recruit['creator'].id and not interaction.user.guild_permissions.manage_messages:
+            await interaction.followup.send("❌ ランクマッチ募集の作成者または管理者のみ終了できます。", ephemeral=True)
+            return
+
+        # リマインダーキャンセル
+        reminder_scheduler.cancel(f"ranked:{recruit['id']}")
+
+        # 募集削除
+        del active_rank_recruits[channel_id]
+        state_store.mark_dirty('active_rank_recruits', channel_id)
+
+        embed = discord.Embed(
+            title="🏁 ランクマッチ募集終了",
+            description=f"**{recruit['rank_requirement']}** の募集を終了しました。",
+            color=0xff6b6b
+        )
+
+        embed.add_field(
+            name="📊 最終統計",
+            value=f"**参加者数:** {len(recruit['participants'])}人\n"
+                  f"**募集時間:** {(datetime.now() - recruit['created_at']).seconds // 60}分間",
+            inline=False
+        )
+
+        # ボタンを無効化
+        for item in self.children:
+            item.disabled = True
+
+        await render_coordinator.settle(interaction.message.id)
+        await interaction.edit_original_response(embed=embed, view=self)
+        self.stop()  # 永続Viewの登録を解除
+        await interaction.followup.send("ランクマッチ募集が終了されました。", ephemeral=False)
+
+    @discord.ui.button(label='手動追加', emoji='➕', style=discord.ButtonStyle.secondary)
+    async def manual_add_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """手動追加ボタン（作成者・管理者のみ）"""
+        try:
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            if channel_id not in active_rank_recruits:
+                await interaction.response.send_message("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+                return
+
+            recruit = active_rank_recruits[channel_id]
+
+            # 権限チェック
+            if user_id != recruit['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.response.send_message("❌ ランクマッチ募集の作成者または管理者のみメンバーを追加できます。", ephemeral=True)
+                return
+
+            # 手動追加モーダルを表示
+            modal = ManualAddModal(recruit_type="ranked")
+            await interaction.response.send_modal(modal)
+
+        except Exception as e:
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(f"❌ 手動追加ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+                else:
+                    await interaction.followup.send(f"❌ 手動追加ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+            except:
+                pass
+            print(f"手動追加ボタンエラー: {e}")
+
+    @discord.ui.button(label='手動削除', emoji='➖', style=discord.ButtonStyle.danger)
+    async def manual_remove_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """手動削除ボタン（作成者・管理者のみ）"""
+        try:
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            if channel_id not in active_rank_recruits:
+                await interaction.response.send_message("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+                return
+
+            recruit = active_rank_recruits[channel_id]
+
+            # 権限チェック
+            if user_id != recruit['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.response.send_message("❌ ランクマッチ募集の作成者または管理者のみメンバーを削除できます。", ephemeral=True)
+                return
+
+            # 参加者がいるかチェック（作成者以外）
+            other_participants = [p for p in recruit['participants'] if p != recruit['creator'].id]
+            if not other_participants:
+                await interaction.response.send_message("❌ 削除可能な参加者がいません。", ephemeral=True)
+                return
+
+            # 手動削除モーダルを表示
+            modal = ManualRemoveModal(recruit_type="ranked")
+            await interaction.response.send_modal(modal)
+
+        except Exception as e:
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(f"❌ 手動削除ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+                else:
+                    await interaction.followup.send(f"❌ 手動削除ボタンでエラーが発生しました: {str(e)}", ephemeral=True)
+            except:
+                pass
+            print(f"手動削除ボタンエラー: {e}")
+
+
+async def create_ranked_embed(recruit, guild):
+    """ランクマッチ募集のEmbed作成"""
+    # 参加者リスト作成（ランク情報付き）
+    participants_list = []
+    rank_stats = {}
+
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            rank_info = get_user_rank_display(participant_id)
+            participants_list.append(f"• {member.display_name} {rank_info}")
+
+            # ランク統計
+            if participant_id in user_ranks and user_ranks[participant_id].get('current'):
+                rank = user_ranks[participant_id]['current']
+                tier = VALORANT_RANKS[rank]['tier']
+                rank_stats[tier] = rank_stats.get(tier, 0) + 1
+
+    status_map = {
+        'recruiting': '📢 募集中',
+        'ready': '✅ 準備完了',
+        'in_progress': '🎮 進行中',
+        'ended': '🏁 終了'
+    }
+
+    current_count = len(recruit['participants'])
+    max_players = recruit['max_players']
+
+    title = "🏆 ランクマッチ募集"
+    if current_count >= max_players:
+        title = "🎉 ランクマッチ募集（満員）"
+
+    embed = discord.Embed(
+        title=title,
+        description=f"**{recruit['rank_requirement']}** のメンバーを募集中",
+        color=0x4a90e2 if current_count < max_players else 0xffd700
+    )
+
+    embed.add_field(
+        name="📊 募集情報",
+        value=f"**ランク条件:** {recruit['rank_requirement']}\n"
+              f"**最大人数:** {max_players}人\n"
+              f"**開始時間:** {recruit['scheduled_time']}\n"
+              f"**現在の参加者:** {current_count}/{max_players}人\n"
+              f"**ステータス:** {status_map.get(recruit['status'], recruit['status'])}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list) if participants_list else "なし",
+        inline=True
+    )
+
+    # ランク分布（参加者がいる場合）
+    if rank_stats:
+        tier_names = {9: "レディアント", 8: "イモータル", 7: "アセンダント", 6: "ダイヤ", 5: "プラチナ", 4: "ゴールド", 3: "シルバー", 2: "ブロンズ", 1: "アイアン"}
+        rank_distribution = []
+        for tier in sorted(rank_stats.keys(), reverse=True):
+            tier_name = tier_names.get(tier, f"ティア{tier}")
+            rank_distribution.append(f"{tier_name}: {rank_stats[tier]}人")
+
+        embed.add_field(
+            name="🏆 ランク分布",
+            value="\n".join(rank_distribution),
+            inline=False
+        )
+
+    if recruit.get('description'):
+        embed.add_field(
+            name="📝 詳細",
+            value=recruit['description'],
+            inline=False
+        )
+
+    if recruit.get('teams'):
+        embed.add_field(
+            name="🎯 チーム分け",
+            value="チーム分け済み（チーム分けボタンで再確認）",
+            inline=False
+        )
+
+    embed.set_footer(text=f"作成者: {recruit['creator'].display_name} | ID: {recruit['id'][:8]}")
+
+    return embed
+
+
+async def execute_ranked_team_divide_logic(recruit, interaction):
+    """ランクバランスチーム分けのロジック実行"""
+    guild = interaction.guild
+    members = []
+    for participant_id in recruit['participants']:
+        member = guild.get_member(participant_id)
+        if member:
+            members.append(member)
+
+    # 現在・最高ランクと直近成績でスキルを計算（ランク未設定者は平均値）してチーム分け
+    team1, team2, _ = score_teams(
+        build_team_players(members),
+        len(members) // 2,
+        history=teammate_history,
+        channel_id=recruit['channel_id']
+    )
+
+    # チーム情報を保存
+    state_store.mark_dirty('active_rank_recruits', recruit['channel_id'])
+    recruit['teams'] = {
+        'team1': [m['member'].id for m in team1],
+        'team2': [m['member'].id for m in team2]
+    }
+
+    embed = discord.Embed(
+        title="🎯 ランクマッチ チーム分け結果",
+        description="ランクバランスを考慮したチーム分け",
+        color=0x4a90e2
+    )
+
+    # チーム1の情報
+    team1_display = []
+    team1_total = 0
+    for member_data in team1:
+        member = member_data['member']
+        rank = member_data['rank']
+        value = member_data['skill']
+        team1_total += value
+
+        if rank:
+            rank_info = VALORANT_RANKS[rank]
+            team1_display.append(f"• {member.display_name} ({rank_info['display']})")
+        else:
+            team1_display.append(f"• {member.display_name} (ランク未設定)")
+
+    embed.add_field(
+        name="🔴 チーム1",
+        value="\n".join(team1_display),
+        inline=True
+    )
+
+    # チーム2の情報
+    team2_display = []
+    team2_total = 0
+    for member_data in team2:
+        member = member_data['member']
+        rank = member_data['rank']
+        value = member_data['skill']
+        team2_total += value
+
+        if rank:
+            rank_info = VALORANT_RANKS[rank]
+            team2_display.append(f"• {member.display_name} ({rank_info['display']})")
+        else:
+            team2_display.append(f"• {member.display_name} (ランク未設定)")
+
+    embed.add_field(
+        name="🔵 チーム2",
+        value="\n".join(team2_display),
+        inline=True
+    )
+
+    # バランス情報
+    avg1 = team1_total / len(team1) if team1 else 0
+    avg2 = team2_total / len(team2) if team2 else 0
+    balance_diff = abs(avg1 - avg2)
+    balance_quality = "完璧" if balance_diff < 50 else "良好" if balance_diff < 100 else "やや偏り" if balance_diff < 150 else "偏りあり"
+
+    embed.add_field(
+        name="⚖️ バランス評価",
+        value=f"{balance_quality} (差: {balance_diff:.0f})",
+        inline=False
+    )
+
+    embed.add_field(
+        name="📊 平均スキル",
+        value=f"チーム1: {avg1:.0f} | チーム2: {avg2:.0f}\n※ 現在・最高ランクとTracker.gg成績（`!rank riot` で連携）から算出",
+        inline=False
+    )
+
+    embed.set_footer(text=f"ランク条件: {recruit['rank_requirement']} | 頑張って！")
+
+    await interaction.followup.send(embed=embed)
+
+
+async def create_ranked_recruit(ctx, args):
+    """ランクマッチ募集作成"""
+    channel_id = ctx.channel.id
+
+    # 既存の募集チェック
+    if channel_id in active_rank_recruits:
+        await ctx.send("❌ このチャンネルで既にランクマッチ募集が進行中です。`!ranked end` で終了してください。")
+        return
+
+    # 引数解析
+    rank_requirement = "any"  # デフォルト
+    scheduled_time = "未設定"
+    parsed_datetime = None
+    max_players = 5  # デフォルト5人（ランクマッチは5人）
+    description = ""
+    min_rank = None
+    max_rank = None
+
+    for arg in args:
+        # ランク指定の解析
+        if any(rank_word in arg for rank_word in ['ダイヤ', 'プラチナ', 'ゴールド', 'シルバー', 'ブロンズ', 'アイアン', 'イモータル', 'アセンダント', 'レディアント']):
+            if '以上' in arg:
+                rank_requirement = arg.replace('以上', '').strip() + "以上"
+                min_rank = parse_rank_requirement(arg.replace('以上', '').strip())
+            elif '以下' in arg:
+                rank_requirement = arg.replace('以下', '').strip() + "以下"
+                max_rank = parse_rank_requirement(arg.replace('以下', '').strip())
+            elif '帯' in arg:
+                rank_requirement = arg
+                base_rank = parse_rank_requirement(arg.replace('帯', '').strip())
+                if base_rank:
+                    min_rank, max_rank = get_rank_tier_range(base_rank)
+            else:
+                rank_requirement = arg
+                min_rank = parse_rank_requirement(arg)
+        elif any(char in arg for char in [':', '時', '/', '-']) or arg in ['今から', 'now', 'すぐ', '明日', '今日']:
+            # 時間・日付指定
+            if arg in ['今から', 'now', 'すぐ']:
+                scheduled_time = "今すぐ"
+                parsed_datetime = datetime.now()
+            else:
+                parsed_dt = parse_datetime_input(arg)
+                if parsed_dt:
+                    scheduled_time = format_datetime_display(parsed_dt)
+                    parsed_datetime = parsed_dt
+                else:
+                    scheduled_time = arg
+        elif arg.lower() == 'any':
+            rank_requirement = "ランク問わず"
+        elif arg.isdigit():
+            # 人数指定
+            max_players = min(int(arg), 10)  # 最大10人
+        else:
+            # 説明文
+            if description:
+                description += f" {arg}"
+            else:
+                description = arg
+
+    # ランクマッチ募集データ作成
+    recruit_data = {
+        'id': f"{channel_id}_{int(datetime.now().timestamp())}",
+        'channel_id': channel_id,
+        'creator': ctx.author,
+        'created_at': datetime.now(),
+        'max_players': max_players,
+        'scheduled_time': scheduled_time,
+        'parsed_datetime': parsed_datetime,
+        'rank_requirement': rank_requirement,
+        'min_rank': min_rank,
+        'max_rank': max_rank,
+        'description': description,
+        'participants': [ctx.author.id],
+        'status': 'recruiting',  # recruiting, ready, in_progress, ended
+        'teams': None,
+        'type': 'ranked_match'
+    }
+
+    active_rank_recruits[channel_id] = recruit_data
+    state_store.mark_dirty('active_rank_recruits', channel_id)
+
+    # ボタン付き募集メッセージ作成
+    embed = await create_ranked_embed(recruit_data, ctx.guild)
+
+    # 操作方法を追加（ボタンとコマンド両方）
+    embed.add_field(
+        name="🔧 操作方法",
+        value="**ボタン操作:** 下のボタンをクリック\n"
+              "**コマンド操作:** `!ranked join/leave/status`",
+        inline=False
+    )
+
+    # ランク条件の詳細表示
+    if min_rank or max_rank:
+        rank_details = []
+        if min_rank:
+            rank_details.append(f"最低ランク: {VALORANT_RANKS[min_rank]['display']}")
+        if max_rank:
+            rank_details.append(f"最高ランク: {VALORANT_RANKS[max_rank]['display']}")
+
+        embed.add_field(
+            name="🎯 ランク詳細",
+            value="\n".join(rank_details),
+            inline=False
+        )
+
+    view = RankedRecruitView(recruit_data['id'])
+    message = await ctx.send(content="@everyone", embed=embed, view=view)
+    recruit_data['message_id'] = message.id
+    state_store.mark_dirty('active_rank_recruits', channel_id)
+    view.message = message  # ビューにメッセージオブジェクトを保存
+
+    # 自動リマインダー設定
+    if scheduled_time != "未設定" and scheduled_time != "今すぐ":
+        schedule_ranked_recruit_reminder(ctx, recruit_data)
+
+
+class ManualAddModal(InstrumentedModal, title='👥 手動でメンバー追加'):
+    """手動追加用のモーダル"""
+
+    def __init__(self, recruit_type="custom"):
+        super().__init__()
+        self.recruit_type = recruit_type  # "custom" or "ranked"
+
+    member_names = discord.ui.TextInput(
+        label='追加するメンバー',
+        placeholder='例: @ユーザー名1 @ユーザー名2 または ユーザー名1 ユーザー名2',
+        style=discord.TextStyle.paragraph,
+        min_length=1,
+        max_length=500
+    )
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            await interaction.response.defer()
+
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            # 募集タイプに応じて適切なデータを取得
+            if self.recruit_type == "custom":
+                if channel_id not in active_scrims:
+                    await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+                    return
+                recruit_data = active_scrims[channel_id]
+            else:  # ranked
+                if channel_id not in active_rank_recruits:
+                    await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+                    return
+                recruit_data = active_rank_recruits[channel_id]
+
+            # 権限チェック
+            if user_id != recruit_data['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.followup.send("❌ 募集の作成者または管理者のみメンバーを追加できます。", ephemeral=True)
+                return
+
+            # 入力されたテキストからユーザーを抽出
+            input_text = self.member_names.value.strip()
+            mentioned_users = []
+
+            # @メンション形式の処理
+            import re
+            mention_pattern = r'<@!?(\d+)>'
+            mention_matches = re.findall(mention_pattern, input_text)
+            for user_id_str in mention_matches:
+                try:
+                    member = interaction.guild.get_member(int(user_id_str))
+                    if member:
+                        mentioned_users.append(member)
+                except ValueError:
+                    pass
+
+            # 通常のユーザー名での検索も実装
+            if not mentioned_users:
+                # スペースまたは改行で分割
+                user_names = re.split(r'[\s\n]+', input_text)
+                for name in user_names:
+                    name = name.strip().replace('@', '')  # @を削除
+                    if name:
+                        # 部分一致でユーザーを検索
+                        for member in interaction.guild.members:
+                            if name.lower() in member.display_name.lower() or name.lower() in member.name.lower():
+                                if member not in mentioned_users:
+                                    mentioned_users.append(member)
+                                    break
+
+            if not mentioned_users:
+                await interaction.followup.send("❌ 有効なユーザーが見つかりませんでした。\n"
+                                                "💡 `@ユーザー名` または `ユーザー名` の形式で入力してください。", ephemeral=True)
+                return
+
+            # 追加処理
+            added_users = []
+            already_joined = []
+            max_capacity = []
+            rank_ineligible = []
+
+            for member in mentioned_users:
+                if member.id in recruit_data['participants']:
+                    already_joined.append(member.display_name)
+                elif len(recruit_data['participants']) >= recruit_data['max_players']:
+                    max_capacity.append(member.display_name)
+                elif self.recruit_type == "ranked" and not check_rank_eligibility(member.id, recruit_data):
+                    rank_ineligible.append(member.display_name)
+                else:
+                    # 追加処理
+                    recruit_data['participants'].append(member.id)
+                    state_store.mark_dirty('active_scrims' if self.recruit_type == "custom" else 'active_rank_recruits', channel_id)
+                    added_users.append(member.display_name)
+
+                    # ステータス更新
+                    if len(recruit_data['participants']) >= recruit_data['max_players']:
+                        recruit_data['status'] = 'ready'
+
+            # 募集メッセージを更新
+            try:
+                if 'message_id' in recruit_data:
+                    channel = interaction.channel
+                    message = await channel.fetch_message(recruit_data['message_id'])
+
+                    # 最新の募集情報でembedを再作成
+                    if self.recruit_type == "custom":
+                        updated_embed = await create_custom_embed(recruit_data, interaction.guild)
+                    else:
+                        updated_embed = await create_ranked_embed(recruit_data, interaction.guild)
+
+                    # 操作方法を追加（元のメッセージと同じ形式）
+                    updated_embed.add_field(
+                        name="🔧 操作方法",
+                        value="**ボタン操作:** 下のボタンをクリック\n"
+                              f"**コマンド操作:** `!{'custom' if self.recruit_type == 'custom' else 'ranked'} join/leave/status`",
+                        inline=False
+                    )
+
+                    # ランクマッチの場合はランク詳細も追加
+                    if self.recruit_type == "ranked" and (recruit_data.get('min_rank') or recruit_data.get('max_rank')):
+                        rank_details = []
+                        if recruit_data.get('min_rank'):
+                            rank_details.append(f"最低ランク: {VALORANT_RANKS[recruit_data['min_rank']]['display']}")
+                        if recruit_data.get('max_rank'):
+                            rank_details.append(f"最高ランク: {VALORANT_RANKS[recruit_data['max_rank']]['display']}")
+
+                        updated_embed.add_field(
+                            name="🎯 ランク詳細",
+                            value="\n".join(rank_details),
+                            inline=False
+                        )
+
+                    # メッセージを更新（ボタンは維持）
+                    await message.edit(embed=updated_embed)
+                    render_coordinator.invalidate(message.id)
+            except:
+                pass  # メッセージ更新に失敗した場合はスキップ
+
+            # 結果メッセージの作成
+            result_messages = []
+
+            if added_users:
+                result_messages.append(f"✅ **追加完了:** {', '.join(added_users)}")
+
+            if already_joined:
+                result_messages.append(f"⚠️ **既に参加済み:** {', '.join(already_joined)}")
+
+            if max_capacity:
+                result_messages.append(f"❌ **満員のため追加不可:** {', '.join(max_capacity)}")
+
+            if rank_ineligible:
+                result_messages.append(f"❌ **ランク条件不適合:** {', '.join(rank_ineligible)}")
+
+            if result_messages:
+                current_count = len(recruit_data['participants'])
+                status_text = f"📊 現在 {current_count}/{recruit_data['max_players']}人"
+
+                final_message = "\n".join(result_messages) + f"\n{status_text}"
+                await interaction.followup.send(final_message, ephemeral=False)
+            else:
+                await interaction.followup.send("ℹ️ 処理するユーザーがありませんでした。", ephemeral=True)
+
+        except Exception as e:
+            await interaction.followup.send(f"❌ 手動追加中にエラーが発生しました: {str(e)}", ephemeral=True)
+            print(f"手動追加エラー: {e}")
+
+
+class ManualRemoveModal(InstrumentedModal, title='👥 手動でメンバー削除'):
+    """手動削除用のモーダル"""
+
+    def __init__(self, recruit_type="custom"):
+        super().__init__()
+        self.recruit_type = recruit_type  # "custom" or "ranked"
+
+    member_names = discord.ui.TextInput(
+        label='削除するメンバー',
+        placeholder='例: @ユーザー名1 @ユーザー名2 または ユーザー名1 ユーザー名2',
+        style=discord.TextStyle.paragraph,
+        min_length=1,
+        max_length=500
+    )
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            await interaction.response.defer()
+
+            channel_id = interaction.channel.id
+            user_id = interaction.user.id
+
+            # 募集タイプに応じて適切なデータを取得
+            if self.recruit_type == "custom":
+                if channel_id not in active_scrims:
+                    await interaction.followup.send("❌ アクティブなカスタムゲームがありません。", ephemeral=True)
+                    return
+                recruit_data = active_scrims[channel_id]
+            else:  # ranked
+                if channel_id not in active_rank_recruits:
+                    await interaction.followup.send("❌ アクティブなランクマッチ募集がありません。", ephemeral=True)
+                    return
+                recruit_data = active_rank_recruits[channel_id]
+
+            # 権限チェック
+            if user_id != recruit_data['creator'].id and not interaction.user.guild_permissions.manage_messages:
+                await interaction.followup.send("❌ 募集の作成者または管理者のみメンバーを削除できます。", ephemeral=True)
+                return
+
+            # 入力されたテキストからユーザーを抽出
+            input_text = self.member_names.value.strip()
+            mentioned_users = []
+
+            # @メンション形式の処理
+            import re
+            mention_pattern = r'<@!?(\d+)>'
+            mention_matches = re.findall(mention_pattern, input_text)
+            for user_id_str in mention_matches:
+                try:
+                    member = interaction.guild.get_member(int(user_id_str))
+                    if member:
+                        mentioned_users.append(member)
+                except ValueError:
+                    pass
+
+            # 通常のユーザー名での検索も実装
+            if not mentioned_users:
+                # スペースまたは改行で分割
+                user_names = re.split(r'[\s\n]+', input_text)
+                for name in user_names:
+                    name = name.strip().replace('@', '')  # @を削除
+                    if name:
+                        # 部分一致でユーザーを検索（参加者の中から）
+                        for participant_id in recruit_data['participants']:
+                            member = interaction.guild.get_member(participant_id)
+                            if member and (name.lower() in member.display_name.lower() or name.lower() in member.name.lower()):
+                                if member not in mentioned_users:
+                                    mentioned_users.append(member)
+                                    break
+
+            if not mentioned_users:
+                await interaction.followup.send("❌ 有効なユーザーが見つかりませんでした。\n"
+                                                "💡 `@ユーザー名` または `ユーザー名` の形式で入力してください。", ephemeral=True)
+                return
+
+            # 削除処理
+            removed_users = []
+            not_participating = []
+            creator_protection = []
+
+            for member in mentioned_users:
+                if member.id not in recruit_data['participants']:
+                    not_participating.append(member.display_name)
+                elif member.id == recruit_data['creator'].id and len(recruit_data['participants']) > 1:
+                    # 作成者は他の参加者がいる間は削除不可
+                    creator_protection.append(member.display_name)
+                else:
+                    # 削除処理
+                    recruit_data['participants'].remove(member.id)
+                    state_store.mark_dirty('active_scrims' if self.recruit_type == "custom" else 'active_rank_recruits', channel_id)
+                    removed_users.append(member.display_name)
+
+                    # ステータス更新
+                    recruit_data['status'] = 'recruiting'
+
+            # 募集メッセージを更新
+            try:
+                if 'message_id' in recruit_data:
+                    channel = interaction.channel
+                    message = await channel.fetch_message(recruit_data['message_id'])
+
+                    # 最新の募集情報でembedを再作成
+                    if self.recruit_type == "custom":
+                        updated_embed = await create_custom_embed(recruit_data, interaction.guild)
+                    else:
+                        updated_embed = await create_ranked_embed(recruit_data, interaction.guild)
+
+                    # 操作方法を追加（元のメッセージと同じ形式）
+                    updated_embed.add_field(
+                        name="🔧 操作方法",
+                        value="**ボタン操作:** 下のボタンをクリック\n"
+                              f"**コマンド操作:** `!{'custom' if self.recruit_type == 'custom' else 'ranked'} join/leave/status`",
+                        inline=False
+                    )
+
+                    # ランクマッチの場合はランク詳細も追加
+                    if self.recruit_type == "ranked" and (recruit_data.get('min_rank') or recruit_data.get('max_rank')):
+                        rank_details = []
+                        if recruit_data.get('min_rank'):
+                            rank_details.append(f"最低ランク: {VALORANT_RANKS[recruit_data['min_rank']]['display']}")
+                        if recruit_data.get('max_rank'):
+                            rank_details.append(f"最高ランク: {VALORANT_RANKS[recruit_data['max_rank']]['display']}")
+
+                        updated_embed.add_field(
+                            name="🎯 ランク詳細",
+                            value="\n".join(rank_details),
+                            inline=False
+                        )
+
+                    # メッセージを更新（ボタンは維持）
+                    await message.edit(embed=updated_embed)
+                    render_coordinator.invalidate(message.id)
+            except:
+                pass  # メッセージ更新に失敗した場合はスキップ
+
+            # 結果メッセージの作成
+            result_messages = []
+
+            if removed_users:
+                result_messages.append(f"✅ **削除完了:** {', '.join(removed_users)}")
+
+            if not_participating:
+                result_messages.append(f"⚠️ **参加していません:** {', '.join(not_participating)}")
+
+            if creator_protection:
+                result_messages.append(f"🛡️ **作成者保護:** {', '.join(creator_protection)} (他の参加者がいる間は削除不可)")
+
+            if result_messages:
+                current_count = len(recruit_data['participants'])
+                status_text = f"📊 現在 {current_count}/{recruit_data['max_players']}人"
+
+                final_message = "\n".join(result_messages) + f"\n{status_text}"
+                await interaction.followup.send(final_message, ephemeral=False)
+            else:
+                await interaction.followup.send("ℹ️ 処理するユーザーがありませんでした。", ephemeral=True)
+
+        except Exception as e:
+            await interaction.followup.send(f"❌ 手動削除中にエラーが発生しました: {str(e)}", ephemeral=True)
+            print(f"手動削除エラー: {e}")
+
+
+def schedule_start_reminder(reminder_id, kind, start_time, **payload):
+    """開始時刻の5分前にリマインダーを登録（開始時刻を過ぎたら送らない）"""
+    if start_time is None:
+        return False
+    if start_time - REMINDER_LEAD_TIME <= datetime.now():
+        return False
+    reminder_scheduler.schedule(reminder_id, kind, start_time - REMINDER_LEAD_TIME,
+                                expires=start_time, start_time=start_time, **payload)
+    return True
+
+
+def schedule_scrim_reminder(ctx, scrim_data):
+    """スクリムリマインダーを登録（開始5分前）"""
+    schedule_start_reminder(f"scrim:{scrim_data['id']}", 'scrim', scrim_data.get('parsed_datetime'),
+                            channel_id=ctx.channel.id, scrim_id=scrim_data['id'])
+
+
+def schedule_ranked_recruit_reminder(ctx, recruit_data):
+    """ランクマッチ募集リマインダーを登録（開始5分前）"""
+    schedule_start_reminder(f"ranked:{recruit_data['id']}", 'ranked', recruit_data.get('parsed_datetime'),
+                            channel_id=ctx.channel.id, recruit_id=recruit_data['id'])
+
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+from datetime import datetime
+
+# 予定時刻を確認し直す最大間隔（秒）。時計の補正やスリープ復帰に追従するため
+MAX_SLEEP_SECONDS = 60
+
+
+class ReminderScheduler:
+    """全リマインダーを1つのタスクで処理するスケジューラ
+
+    予定は締切の早い順のヒープで管理し、取り消しはヒープから探さずに
+    reminders 辞書から消すだけにする（古いヒープ要素は取り出した時に捨てる）。
+    reminders は StateStore に登録して再起動後も復元し、止まっている間に
+    過ぎた予定は起動時にまとめて実行する（expires を過ぎたものは捨てる）。
+    """
+
+    def __init__(self, mark_dirty=None):
+        self.reminders = {}   # id -> {'kind', 'due', 'expires', 'payload'}
+        self._heap = []       # (予定時刻のtimestamp, 連番, id)
+        self._entry_seq = {}  # id -> ヒープ上の有効な連番
+        self._counter = itertools.count()
+        self._handlers = {}   # 種類 -> async def handler(reminder, late_seconds)
+        self._mark_dirty = mark_dirty
+        self._wakeup = None
+        self._task = None
+        self.stats = {
+            'scheduled': 0,
+            'cancelled': 0,
+            'fired': 0,
+            'caught_up': 0,
+            'expired': 0,
+            'errors': 0,
+        }
+
+    def __len__(self):
+        return len(self.reminders)
+
+    def handler(self, kind):
+        """種類ごとの処理を登録するデコレーター"""
+        def register(func):
+            self._handlers[kind] = func
+            return func
+        return register
+
+    def _changed(self, reminder_id):
+        if self._mark_dirty is not None:
+            self._mark_dirty(reminder_id)
+
+    def _push(self, reminder_id, due):
+        seq = next(self._counter)
+        self._entry_seq[reminder_id] = seq
+        heapq.heappush(self._heap, (due.timestamp(), seq, reminder_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def schedule(self, reminder_id, kind, due, expires=None, **payload):
+        """リマインダーを登録（同じIDがあれば置き換え）"""
+        self.reminders[reminder_id] = {'kind': kind, 'due': due, 'expires': expires, 'payload': payload}
+        self._push(reminder_id, due)
+        self._changed(reminder_id)
+        self.stats['scheduled'] += 1
+
+    def cancel(self, reminder_id):
+        """取り消し。登録されていれば True"""
+        if self.reminders.pop(reminder_id, None) is None:
+            return False
+        self._entry_seq.pop(reminder_id, None)
+        self._changed(reminder_id)
+        self.stats['cancelled'] += 1
+        return True
+
+    def restore(self):
+        """StateStore から読み込んだ reminders でヒープを作り直す"""
+        self._heap = []
+        self._entry_seq = {}
+        for reminder_id, reminder in self.reminders.items():
+            seq = next(self._counter)
+            self._entry_seq[reminder_id] = seq
+            self._heap.append((reminder['due'].timestamp(), seq, reminder_id))
+        heapq.heapify(self._heap)
+        return len(self._heap)
+
+    def next_due(self):
+        """次に実行される予定（なければ None）"""
+        while self._heap:
+            _, seq, reminder_id = self._heap[0]
+            if self._entry_seq.get(reminder_id) == seq:
+                return self.reminders[reminder_id]['due']
+            heapq.heappop(self._heap)  # 取り消し・置き換え済み
+        return None
+
+    def _pop_due(self, now_ts):
+        """予定時刻を過ぎたものを取り出す"""
+        due = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, seq, reminder_id = heapq.heappop(self._heap)
+            if self._entry_seq.get(reminder_id) != seq:
+                continue
+            del self._entry_seq[reminder_id]
+            reminder = self.reminders.pop(reminder_id)
+            self._changed(reminder_id)
+            due.append((reminder_id, reminder))
+        return due
+
+    async def _fire(self, reminder_id, reminder, now):
+        expires = reminder.get('expires')
+        if expires is not None and now > expires:
+            self.stats['expired'] += 1
+            print(f"⌛ 期限切れのリマインダーを破棄: {reminder_id}")
+            return
+        handler = self._handlers.get(reminder['kind'])
+        if handler is None:
+            print(f"リマインダーの処理が未登録です: {reminder['kind']}")
+            return
+        late = (now - reminder['due']).total_seconds()
+        if late > MAX_SLEEP_SECONDS:
+            self.stats['caught_up'] += 1
+        try:
+            await handler(reminder, late)
+            self.stats['fired'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"リマインダー送信エラー ({reminder_id}): {e}")
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = datetime.now()
+            for reminder_id, reminder in self._pop_due(now.timestamp()):
+                await self._fire(reminder_id, reminder, now)
+
+            next_due = self.next_due()
+            delay = MAX_SLEEP_SECONDS
+            if next_due is not None:
+                delay = min(delay, max(0.0, (next_due - datetime.now()).total_seconds()))
+            try:
+                # 新しい予定が入ったら待機を打ち切って計算し直す
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """処理タスクを開始（on_readyが複数回呼ばれても1つだけ）"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats_text(self):
+        next_due = self.next_due()
+        next_text = next_due.strftime('%m/%d %H:%M') if next_due else "なし"
+        return (f"待機中 {len(self.reminders)}件 (次: {next_text}) / 送信 {self.stats['fired']} "
+                f"/ 取り消し {self.stats['cancelled']} / 期限切れ {self.stats['expired']}")
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+
+# 同じメッセージへの更新をまとめる待ち時間（秒）
+DEFAULT_DELAY = 0.5
+# 前回の内容ハッシュを覚えておくメッセージ数
+MAX_TRACKED = 1000
+
+
+def content_hash(embed):
+    """埋め込みの内容ハッシュ（Embed は to_dict() で比較）"""
+    data = embed.to_dict() if hasattr(embed, 'to_dict') else embed
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class _Batch:
+    __slots__ = ('render', 'edit', 'notify', 'status', 'notices')
+
+    def __init__(self):
+        self.render = None
+        self.edit = None
+        self.notify = None
+        self.status = None
+        self.notices = []  # [(動作, 名前), ...]
+
+
+class RenderCoordinator:
+    """募集メッセージの埋め込み更新をメッセージごとにまとめる
+
+    状態の変更は呼び出し側ですぐに反映し、ここでは描画だけを遅らせる。
+    delay 秒の間に来た依頼は1回の描画・編集にまとめ、参加/離脱の通知も
+    1行の要約にする。描画結果が前回の編集と同じなら編集しない。
+    """
+
+    def __init__(self, delay=DEFAULT_DELAY):
+        self.delay = delay
+        self._batches = {}               # message_id -> _Batch（未処理の依頼）
+        self._tasks = {}                 # message_id -> 処理タスク
+        self._last_hash = OrderedDict()  # message_id -> 前回編集した内容のハッシュ
+        self.stats = {
+            'requests': 0,
+            'renders': 0,
+            'edits': 0,
+            'unchanged': 0,
+            'notices': 0,
+            'notice_messages': 0,
+            'errors': 0,
+        }
+
+    def request(self, key, render, edit, notify=None, notice=None, status=None):
+        """更新を依頼する
+
+        render: 最新の状態から埋め込みを作る async 関数（処理時に呼ぶ）
+        edit: 埋め込みを受け取ってメッセージを編集する async 関数
+        notify: 要約を送る async 関数、notice: (動作, 名前)、status: 要約の末尾に付ける文字列を返す関数
+        render・edit・notify は最後の依頼のものを使う
+        """
+        self.stats['requests'] += 1
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+        batch.render = render
+        batch.edit = edit
+        if notice is not None:
+            batch.notices.append(notice)
+            batch.notify = notify
+            batch.status = status
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.get_running_loop().create_task(self._drain(key))
+
+    async def settle(self, key):
+        """開始・終了など最終的な編集の前に呼ぶ（未処理の描画は捨て、通知だけ送る）"""
+        batch = self._batches.pop(key, None)
+        task = self._tasks.get(key)
+        if task is not None and task is not asyncio.current_task():
+            await task  # 編集中のものが最終的な編集を上書きしないように待つ
+        if batch is not None:
+            await self._notify(key, batch)
+        self.invalidate(key)
+
+    def invalidate(self, key):
+        """他の経路でメッセージが編集された時に呼ぶ（次の描画は必ず編集する）"""
+        self._last_hash.pop(key, None)
+
+    async def _drain(self, key):
+        # 1メッセージにつき処理タスクは1つ。処理中に来た依頼は次の周回でまとめる
+        try:
+            while key in self._batches:
+                await asyncio.sleep(self.delay)
+                batch = self._batches.pop(key, None)
+                if batch is None:
+                    break  # settle() で引き取られた
+                await self._flush(key, batch)
+                await self._notify(key, batch)
+        finally:
+            self._tasks.pop(key, None)
+
+    async def _flush(self, key, batch):
+        try:
+            embed = await batch.render()
+            self.stats['renders'] += 1
+            digest = content_hash(embed)
+            if self._last_hash.get(key) == digest:
+                self.stats['unchanged'] += 1
+            else:
+                await batch.edit(embed)
+                self.stats['edits'] += 1
+                self._last_hash[key] = digest
+                self._last_hash.move_to_end(key)
+                while len(self._last_hash) > MAX_TRACKED:
+                    self._last_hash.popitem(last=False)
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.invalidate(key)
+            print(f"募集メッセージ更新エラー ({key}): {e}")
+
+    async def _notify(self, key, batch):
+        if batch.notices and batch.notify is not None:
+            try:
+                await batch.notify(self.summarize(batch.notices, batch.status() if batch.status else ""))
+                self.stats['notices'] += len(batch.notices)
+                self.stats['notice_messages'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"通知送信エラー ({key}): {e}")
+
+    @staticmethod
+    def summarize(notices, status=""):
+        """[(動作, 名前), ...] を「✅ A・B が参加しました！ / ✅ C が離脱しました。 (3/10)」にまとめる"""
+        groups = {}
+        for action, name in notices:
+            names = groups.setdefault(action, [])
+            if name not in names:
+                names.append(name)
+        line = " / ".join(f"✅ {'・'.join(names)} が{action}" for action, names in groups.items())
+        return f"{line} {status}" if status else line
+
+    def stats_text(self):
+        requests = self.stats['requests']
+        saved = requests - self.stats['edits']
+        rate = saved / requests * 100 if requests else 0
+        return (f"依頼 {requests} / 編集 {self.stats['edits']} (削減 {rate:.0f}%・変化なし {self.stats['unchanged']}) "
+                f"/ 通知 {self.stats['notices']}件→{self.stats['notice_messages']}通")
+
+
+# 募集メッセージの更新（短時間の連続クリックを1回の編集・1行の通知にまとめる）
+render_coordinator = RenderCoordinator()
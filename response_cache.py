@@ -0,0 +1,132 @@
+import hashlib
+import os
+import time
+import unicodedata
+from collections import OrderedDict
+
+from gemini_gateway import AI_PROFILES, GEMINI_MODEL_NAME
+
+DAY = 86400
+# キャッシュする用途（AIプロファイル名）と保存期間（秒）
+RESPONSE_CACHE_TTL = {
+    'translate': 7 * DAY,   # 定型文の翻訳は変わらない
+    'summarize': DAY,       # 同じパッチノートなどが同じ日に何度も貼られる
+}
+RESPONSE_CACHE_MAXSIZE = int(os.getenv('AI_CACHE_MAXSIZE', '500'))
+# 0 にすると再起動で消える（メモリのみ）
+RESPONSE_CACHE_PERSIST = os.getenv('AI_CACHE_PERSIST', '1') != '0'
+
+TASK_NAMES = {'translate': '翻訳', 'summarize': '要約'}
+
+
+def normalize_text(text):
+    """全角/半角（NFKC）と空白・改行の違いを無視したプロンプト"""
+    return " ".join(unicodedata.normalize('NFKC', text).split())
+
+
+class CachedResponse:
+    """キャッシュから返す応答（Gemini の応答と同じく .text で読む）"""
+
+    usage_metadata = None
+
+    def __init__(self, text):
+        self.text = text
+
+
+class ResponseCache:
+    """翻訳・要約の応答キャッシュ（有効期限付きのLRU）
+
+    キーは用途・モデルと生成設定・正規化したプロンプト（指示文を含む）のハッシュ。
+    AI_PROFILES や指示文を変えると別のキーになるので、古い設定の応答は使われずに
+    期限切れで消える。
+    entries は StateStore に登録すると再起動後も残る（有効期限は実時刻）。
+    """
+
+    def __init__(self, mark_dirty=None, ttls=RESPONSE_CACHE_TTL, maxsize=RESPONSE_CACHE_MAXSIZE):
+        self.ttls = ttls
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # キー -> {'task', 'text', 'expires'}
+        self._mark_dirty = mark_dirty
+        self.stats = {task: {'hits': 0, 'misses': 0} for task in ttls}
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def handles(self, task):
+        return task in self.ttls
+
+    @staticmethod
+    def key(task, prompt):
+        params = AI_PROFILES[task]
+        model = params.get('model', GEMINI_MODEL_NAME)
+        source = f"{task}\0{model}\0{sorted(params.items())!r}\0{normalize_text(prompt)}"
+        return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+    def _changed(self, key):
+        if self._mark_dirty is not None:
+            self._mark_dirty(key)
+
+    def get(self, task, prompt):
+        """期限内の応答を CachedResponse で返す（なければ None）"""
+        key = self.key(task, prompt)
+        entry = self.entries.get(key)
+        if entry is not None and entry['expires'] <= time.time():
+            del self.entries[key]
+            self._changed(key)
+            entry = None
+        if entry is None:
+            self.stats[task]['misses'] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats[task]['hits'] += 1
+        return CachedResponse(entry['text'])
+
+    def set(self, task, prompt, response_text):
+        key = self.key(task, prompt)
+        self.entries[key] = {'task': task, 'text': response_text, 'expires': time.time() + self.ttls[task]}
+        self.entries.move_to_end(key)
+        self._changed(key)
+        while len(self.entries) > self.maxsize:
+            old_key, _ = self.entries.popitem(last=False)
+            self._changed(old_key)
+            self.evictions += 1
+
+    def purge_expired(self):
+        """期限切れの応答を削除し、削除件数を返す"""
+        now = time.time()
+        expired = [key for key, entry in self.entries.items() if entry['expires'] <= now]
+        for key in expired:
+            del self.entries[key]
+            self._changed(key)
+        return len(expired)
+
+    def restore(self):
+        """StateStore から読み込んだ応答を整える。削除した件数を返す
+
+        期限切れと対象外になった用途の応答を捨て、有効期限の順に並べ直してから
+        maxsize まで古いものを削る（AI_CACHE_MAXSIZE を小さくした場合もここで守る）。
+        """
+        now = time.time()
+        stale = [key for key, entry in self.entries.items()
+                 if entry.get('task') not in self.ttls or entry['expires'] <= now]
+        for key in stale:
+            del self.entries[key]
+            self._changed(key)
+        for key, _ in sorted(self.entries.items(), key=lambda item: item[1]['expires']):
+            self.entries.move_to_end(key)
+        evicted = 0
+        while len(self.entries) > self.maxsize:
+            old_key, _ = self.entries.popitem(last=False)
+            self._changed(old_key)
+            evicted += 1
+        self.evictions += evicted
+        return len(stale) + evicted
+
+    def stats_text(self):
+        parts = []
+        for task, counts in self.stats.items():
+            total = counts['hits'] + counts['misses']
+            rate = counts['hits'] / total * 100 if total else 0
+            parts.append(f"{TASK_NAMES.get(task, task)}: ヒット率 {rate:.0f}% ({counts['hits']}/{total})")
+        return " / ".join(parts) + f" / 保存 {len(self.entries)}件"
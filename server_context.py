@@ -0,0 +1,76 @@
+import time
+
+# !ai のプロンプトに入れるサーバー情報の文字数の上限（日本語は1文字≒1トークンで、TPMに直接効く）
+SERVER_CONTEXT_MAX_CHARS = 450
+# イベントを取りこぼした場合に備えて作り直す間隔（秒）
+SERVER_CONTEXT_TTL = 3600
+MAX_CONTEXT_MEMBERS = 15
+MAX_CONTEXT_CHANNELS = 8
+
+
+def member_label(member):
+    display_name, name = member.display_name, member.name
+    return display_name if display_name == name else f"{display_name}({name})"
+
+
+def build_server_context(guild, index, max_chars=SERVER_CONTEXT_MAX_CHARS):
+    """プロンプト用のサーバー情報（メンバーは上限の文字数に収まる分だけ入れる）"""
+    header = (f"【サーバー情報】{guild.name}（ID {guild.id}）/ メンバー{guild.member_count}人"
+              f" / 作成 {guild.created_at.strftime('%Y年%m月%d日')}")
+    channels = "チャンネル: " + "、".join(f"#{channel.name}" for channel in guild.text_channels[:MAX_CONTEXT_CHANNELS])
+    members = index.human_members(limit=MAX_CONTEXT_MEMBERS)
+    if not members:
+        return "\n".join([header, "メンバー: ※メンバー情報の取得にはServer Members Intentが必要です", channels])
+
+    budget = max_chars - len(header) - len(channels) - len("\nメンバー: \n")
+    labels = []
+    for member in members:
+        label = member_label(member)
+        if labels and len("、".join(labels + [label])) > budget:
+            break
+        labels.append(label)
+    rest = len(index.humans) - len(labels)
+    member_line = "メンバー: " + "、".join(labels) + (f" ほか{rest}人" if rest > 0 else "")
+    return "\n".join([header, member_line, channels])
+
+
+class ServerContextCache:
+    """サーバーごとのプロンプト用サーバー情報
+
+    作った文章をサーバーごとに覚えておき、メンバー・チャンネル・サーバーの
+    変更イベントで invalidate() されるまで使い回す。
+    """
+
+    def __init__(self, ttl=SERVER_CONTEXT_TTL):
+        self.ttl = ttl
+        self._entries = {}  # guild_id -> (作成時刻, 文章)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, guild, index):
+        entry = self._entries.get(guild.id)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        text = build_server_context(guild, index)
+        self._entries[guild.id] = (now, text)
+        return text
+
+    def invalidate(self, guild_id):
+        if self._entries.pop(guild_id, None) is not None:
+            self.invalidations += 1
+
+    def stats_text(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"ヒット率 {rate:.0f}% ({self.hits}/{total}) / 破棄 {self.invalidations} / {len(self._entries)}サーバー"
+
+
+# !ai のプロンプト用サーバー情報（メンバー・チャンネル・サーバーの変更イベントで破棄）
+server_context_cache = ServerContextCache()
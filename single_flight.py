@@ -0,0 +1,37 @@
+import asyncio
+
+
+class SingleFlight:
+    """同じキーの処理が実行中なら、新しく実行せずその結果を共有する"""
+
+    def __init__(self, name):
+        self.name = name
+        self._in_flight = {}  # key -> asyncio.Task
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._in_flight)
+
+    async def do(self, key, coro_factory):
+        """key が実行中なら結果を待ち、なければ coro_factory() を実行する"""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(coro_factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        # 呼び出し元がキャンセルされても、他の待機者のために処理自体は続ける
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # 待機者が全員キャンセルされた場合でも例外を回収済みにしておく
+        if not task.cancelled():
+            task.exception()
+
+    def stats_text(self):
+        return f"{self.name}: {self.coalesced}/{self.calls}件を統合"
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+# 保存先とフラッシュ間隔（秒）
+STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'bot_state.db')
+STATE_FLUSH_INTERVAL = float(os.getenv('STATE_FLUSH_INTERVAL', '2'))
+
+
+class StoredMember:
+    """保存データから復元したが、サーバーで見つからなかったメンバーの代わり"""
+
+    def __init__(self, user_id, name=None, guild_id=None):
+        self.id = user_id
+        self.name = name or f"ID:{user_id}"
+        self.display_name = self.name
+        self.guild_id = guild_id
+        self.bot = False
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+    def __str__(self):
+        return self.display_name
+
+
+def _encode_default(obj):
+    """JSONにできないオブジェクトの変換（datetime・Discordメンバー）"""
+    if isinstance(obj, datetime):
+        return {'__datetime__': obj.isoformat()}
+    if hasattr(obj, 'id') and hasattr(obj, 'display_name'):
+        guild = getattr(obj, 'guild', None)
+        return {
+            '__member__': obj.id,
+            'guild_id': guild.id if guild is not None else getattr(obj, 'guild_id', None),
+            'name': obj.display_name
+        }
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def encode_value(value):
+    return json.dumps(value, default=_encode_default, ensure_ascii=False)
+
+
+def decode_value(text, resolve_member=None):
+    def hook(obj):
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__member__' in obj:
+            if resolve_member is not None:
+                return resolve_member(obj['__member__'], obj.get('guild_id'), obj.get('name'))
+            return StoredMember(obj['__member__'], obj.get('name'), obj.get('guild_id'))
+        return obj
+    return json.loads(text, object_hook=hook)
+
+
+class StateStore:
+    """モジュールレベルの辞書をSQLite（WAL）に保存するストア
+
+    変更は mark_dirty() でキーを記録するだけにして、バックグラウンドで
+    まとめて1トランザクションで書き込む（コマンド側はディスクを待たない）。
+    """
+
+    def __init__(self, path=STATE_DB_PATH, flush_interval=STATE_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._namespaces = {}  # 名前 -> 辞書
+        self._dirty = set()    # (名前, キー)
+        self._conn = None
+        self._flush_lock = None
+        self._task = None
+        self.loaded = False
+        self.stats = {
+            'flushes': 0,
+            'rows_written': 0,
+            'rows_deleted': 0,
+            'errors': 0,
+            'last_flush_ms': 0.0,
+        }
+
+    def register(self, namespace, mapping):
+        """保存対象の辞書を登録"""
+        self._namespaces[namespace] = mapping
+
+    def mark_dirty(self, namespace, key):
+        """変更（削除を含む）があったキーを記録"""
+        if namespace in self._namespaces:
+            self._dirty.add((namespace, key))
+
+    @property
+    def pending(self):
+        return len(self._dirty)
+
+    # --- SQLite（ワーカースレッドで実行） ---
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _read_all(self):
+        conn = self._connect()
+        return conn.execute("SELECT namespace, key, value FROM state").fetchall()
+
+    def _write_batch(self, upserts, deletes):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            if upserts:
+                conn.executemany(
+                    "INSERT INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(namespace, key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at",
+                    [(ns, key, value, now) for ns, key, value in upserts]
+                )
+            if deletes:
+                conn.executemany("DELETE FROM state WHERE namespace=? AND key=?", deletes)
+
+    def _close_conn(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- 読み込み・書き込み ---
+
+    async def load(self, resolve_member=None):
+        """保存済みの状態を登録済みの辞書に読み込む（既にメモリにあるキーは上書きしない）"""
+        if self.loaded:
+            return 0
+        rows = await asyncio.to_thread(self._read_all)
+        count = 0
+        for namespace, key, value in rows:
+            mapping = self._namespaces.get(namespace)
+            if mapping is None:
+                continue
+            try:
+                mapping.setdefault(json.loads(key), decode_value(value, resolve_member))
+                count += 1
+            except Exception as e:
+                print(f"状態の復元エラー ({namespace}/{key}): {e}")
+        self.loaded = True
+        print(f"💾 保存済みの状態を読み込みました: {count}件")
+        return count
+
+    async def flush(self):
+        """溜まった変更を1トランザクションで書き込む"""
+        if not self._dirty:
+            return 0
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            dirty, self._dirty = self._dirty, set()
+            upserts, deletes = [], []
+            for namespace, key in dirty:
+                mapping = self._namespaces[namespace]
+                encoded_key = json.dumps(key)
+                if key in mapping:
+                    try:
+                        upserts.append((namespace, encoded_key, encode_value(mapping[key])))
+                    except Exception as e:
+                        print(f"状態の保存エラー ({namespace}/{key}): {e}")
+                else:
+                    deletes.append((namespace, encoded_key))
+
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write_batch, upserts, deletes)
+            except Exception as e:
+                # 失敗したキーは次回に再試行
+                self._dirty |= dirty
+                self.stats['errors'] += 1
+                print(f"状態の書き込みエラー: {e}")
+                return 0
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(upserts)
+            self.stats['rows_deleted'] += len(deletes)
+            self.stats['last_flush_ms'] = (time.perf_counter() - started) * 1000
+            return len(upserts) + len(deletes)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"状態フラッシュエラー: {e}")
+
+    def start(self):
+        """定期フラッシュを開始（on_readyが複数回呼ばれても1つだけ）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def close(self):
+        """残りの変更を書き込んでから閉じる"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        finally:
+            await asyncio.to_thread(self._close_conn)
+
+
+# Bot全体で共有するストア（拡張機能からも同じものを使う）
+state_store = StateStore()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+# 生成途中の表示を編集する間隔（秒）。同じチャンネルへの編集はおよそ5秒に5回までなので余裕を持たせる
+STREAM_EDIT_INTERVAL = 1.5
+# 1ページ（1つの埋め込み）の文字数。説明欄の上限は4096文字だが、読みやすさのため従来どおり1900文字で区切る
+PAGE_SIZE = 1900
+# ページの区切りを改行に合わせる範囲（区切り位置からこの文字数以内の改行で区切る）
+BREAK_SEARCH = 300
+# 生成中の末尾に付ける印
+CURSOR = " ▌"
+
+
+def split_point(text, size=PAGE_SIZE):
+    """size 文字以内で区切る位置（近くに改行があればそこで区切る）"""
+    cut = text.rfind('\n', size - BREAK_SEARCH, size)
+    return cut if cut > 0 else size
+
+
+class StreamingReply:
+    """生成途中の文章を埋め込みに順に反映する
+
+    最初のページは考え中メッセージを編集して使い、PAGE_SIZE を超えたら次の
+    メッセージに続ける。編集は1つのタスクが STREAM_EDIT_INTERVAL ごとに
+    まとめて行い、内容が変わっていないページは編集しない。
+    """
+
+    def __init__(self, message, send, render, interval=STREAM_EDIT_INTERVAL, page_size=PAGE_SIZE):
+        """message: 最初のページに使うメッセージ
+        send: 埋め込みを受け取って新しいメッセージを送り、そのメッセージを返す async 関数
+        render: (本文, ページ番号, ページ数, 生成中か) -> 埋め込み
+        """
+        self.render = render
+        self.send = send
+        self.interval = interval
+        self.page_size = page_size
+        self._messages = [message]
+        self._pages = []         # 確定したページの本文
+        self._current = ""       # 生成中のページの本文
+        self._published = {}     # ページ番号 -> 最後に表示した (本文, ページ数, 生成中か)
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._writer = None
+        self.stats = {'chunks': 0, 'edits': 0, 'messages': 1, 'errors': 0}
+        self._started = time.perf_counter()
+        self.first_text_seconds = None  # 作成から最初の断片が届くまで（体感の待ち時間）
+
+    @property
+    def has_text(self):
+        return bool(self._pages or self._current)
+
+    def feed(self, text):
+        """生成された断片を追加する（イベントループ上で呼ぶ）"""
+        if self._finished.is_set() or not text:
+            return
+        self.stats['chunks'] += 1
+        if self.first_text_seconds is None:
+            self.first_text_seconds = time.perf_counter() - self._started
+        self._current += text
+        while len(self._current) > self.page_size:
+            cut = split_point(self._current, self.page_size)
+            self._pages.append(self._current[:cut])
+            self._current = self._current[cut:].lstrip('\n')
+        self._changed.set()
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    async def finish(self, note=None):
+        """生成の完了（または中断）後に呼ぶ。note は末尾に付け足す文"""
+        if note:
+            self._current = f"{self._current}\n\n{note}" if self.has_text else note
+        self._finished.set()
+        if self._writer is not None:
+            await self._writer
+        await self._sync(final=True)
+
+    async def _write_loop(self):
+        while not self._finished.is_set():
+            await self._changed.wait()
+            self._changed.clear()
+            if self._finished.is_set():
+                break  # 最後の表示は finish() で行う
+            await self._sync(final=False)
+            try:
+                await asyncio.wait_for(self._finished.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _sync(self, final):
+        pages = self._pages + ([self._current] if self._current or not self._pages else [])
+        count = len(pages)
+        for index, text in enumerate(pages):
+            streaming = not final and index == count - 1
+            state = (text, count, streaming)
+            published = self._published.get(index)
+            if published == state:
+                continue
+            # 生成中は確定済みのページのページ数の表示だけのために編集し直さない（最後にまとめて直す）
+            if not final and published is not None and not published[2] and published[0] == text:
+                continue
+            embed = self.render(text + (CURSOR if streaming else ""), index, count, streaming)
+            try:
+                if index < len(self._messages):
+                    await self._messages[index].edit(content="", embed=embed)
+                    self.stats['edits'] += 1
+                else:
+                    self._messages.append(await self.send(embed))
+                    self.stats['messages'] += 1
+                self._published[index] = state
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"ストリーミング表示の更新エラー: {e}")
+                if index >= len(self._messages):
+                    return  # 次のページを送れなかった場合は以降のページも送らない
@@ -0,0 +1,187 @@
+import heapq
+from bisect import bisect_left
+
+# この人数までは全探索（半分全列挙）で最適解を求める。超える場合は局所探索
+EXACT_MAX_PLAYERS = 20
+LOCAL_SEARCH_MAX_ROUNDS = 200
+
+
+def _target_and_sizes(values, team_size):
+    n = len(values)
+    n1 = n // 2 if team_size is None else max(0, min(team_size, n))
+    n2 = n - n1
+    total = sum(values)
+    # 平均値の差 |S1/n1 - S2/n2| が最小になるのは S1 = total * n1 / n のとき
+    target = total * n1 / n if n else 0
+    return n1, n2, total, target
+
+
+def _avg_diff(sum1, n1, total, n2):
+    avg1 = sum1 / n1 if n1 else 0
+    avg2 = (total - sum1) / n2 if n2 else 0
+    return abs(avg1 - avg2)
+
+
+def _subset_sums(values, indices):
+    """indices の全部分集合を人数別に (合計, ビットマスク) で列挙"""
+    by_count = [[] for _ in range(len(indices) + 1)]
+    sums = [0]
+    masks = [0]
+    counts = [0]
+    for index in indices:
+        value = values[index]
+        bit = 1 << index
+        for j in range(len(sums)):
+            sums.append(sums[j] + value)
+            masks.append(masks[j] | bit)
+            counts.append(counts[j] + 1)
+    for s, m, c in zip(sums, masks, counts):
+        by_count[c].append((s, m))
+    return by_count
+
+
+def _exact_splits(values, n1, target, k):
+    """半分全列挙で S1 が target に最も近い k 通りの分け方を求める"""
+    n = len(values)
+    half = n // 2
+    left = _subset_sums(values, range(half))
+    right = _subset_sums(values, range(half, n))
+    for bucket in right:
+        bucket.sort()
+    right_sums = [[s for s, _ in bucket] for bucket in right]
+
+    full = (1 << n) - 1
+    symmetric = n1 * 2 == n
+    heap = []  # (-誤差, 正規化マスク)
+    seen = set()
+
+    for count_left in range(min(n1, half) + 1):
+        count_right = n1 - count_left
+        if count_right > n - half:
+            continue
+        bucket = right[count_right]
+        sums = right_sums[count_right]
+        if not bucket:
+            continue
+        for sum_left, mask_left in left[count_left]:
+            want = target - sum_left
+            pos = bisect_left(sums, want)
+            # この左側に対する上位 k 件は、挿入位置の前後 k 件以内にある
+            for j in range(max(0, pos - k), min(len(bucket), pos + k)):
+                sum_right, mask_right = bucket[j]
+                error = abs(sum_left + sum_right - target)
+                if len(heap) >= k and error >= -heap[0][0]:
+                    continue
+                mask = mask_left | mask_right
+                if symmetric:
+                    mask = min(mask, full ^ mask)  # 同じ分け方の表裏を同一視
+                if mask in seen:
+                    continue
+                seen.add(mask)
+                if len(heap) < k:
+                    heapq.heappush(heap, (-error, mask))
+                else:
+                    _, dropped = heapq.heapreplace(heap, (-error, mask))
+                    seen.discard(dropped)
+
+    results = sorted(((-neg_error, mask) for neg_error, mask in heap), key=lambda x: (x[0], x[1]))
+    return [mask for _, mask in results]
+
+
+def _local_search_splits(values, n1, target, k):
+    """大人数向け: 貪欲法の初期解から1対1の入れ替えで誤差を減らす"""
+    n = len(values)
+    order = sorted(range(n), key=lambda i: values[i], reverse=True)
+
+    # 初期解: 強い順に、人数あたりの合計が少ない側へ入れる
+    team1, team2 = [], []
+    sum1 = sum2 = 0
+    n2 = n - n1
+    for index in order:
+        if len(team2) >= n2 or (len(team1) < n1 and sum1 * n2 <= sum2 * n1):
+            team1.append(index)
+            sum1 += values[index]
+        else:
+            team2.append(index)
+            sum2 += values[index]
+
+    found = {}
+
+    def record(members1, total1):
+        mask = 0
+        for index in members1:
+            mask |= 1 << index
+        found.setdefault(mask, abs(total1 - target))
+
+    record(team1, sum1)
+    for _ in range(LOCAL_SEARCH_MAX_ROUNDS):
+        error = sum1 - target
+        if error == 0:
+            break
+        best = None
+        best_error = abs(error)
+        # team1 の a と team2 の b を交換すると S1 は (b - a) だけ変わる
+        sorted2 = sorted(team2, key=lambda i: values[i])
+        values2 = [values[i] for i in sorted2]
+        for pos_a, a in enumerate(team1):
+            want = values[a] - error  # b がこの値に近いほど良い
+            pos = bisect_left(values2, want)
+            for j in (pos - 1, pos):
+                if 0 <= j < len(sorted2):
+                    new_error = abs(error - values[a] + values2[j])
+                    if new_error < best_error:
+                        best_error = new_error
+                        best = (pos_a, sorted2[j])
+        if best is None:
+            break
+        pos_a, b = best
+        a = team1[pos_a]
+        team1[pos_a] = b
+        team2[team2.index(b)] = a
+        sum1 += values[b] - values[a]
+        record(team1, sum1)
+
+    ranked = sorted(found.items(), key=lambda item: (item[1], item[0]))
+    return [mask for mask, _ in ranked[:k]]
+
+
+def find_best_splits(values, team_size=None, k=1):
+    """ランク値のリストを2チームに分ける上位 k 通りを返す
+
+    team_size はチーム1の人数（省略時は半分）。戻り値は
+    (平均値の差, チーム1のインデックス, チーム2のインデックス) のリストで、差の小さい順。
+    """
+    n = len(values)
+    if n == 0:
+        return [(0, (), ())]
+    n1, n2, total, target = _target_and_sizes(values, team_size)
+    k = max(1, k)
+
+    if n <= EXACT_MAX_PLAYERS:
+        masks = _exact_splits(values, n1, target, k)
+    else:
+        masks = _local_search_splits(values, n1, target, k)
+
+    results = []
+    for mask in masks:
+        team1 = [i for i in range(n) if mask >> i & 1]
+        team2 = [i for i in range(n) if not mask >> i & 1]
+        if len(team1) != n1:
+            # 表裏を同一視したマスクは人数が入れ替わっていることがある
+            team1, team2 = team2, team1
+        team1.sort(key=lambda i: values[i], reverse=True)
+        team2.sort(key=lambda i: values[i], reverse=True)
+        sum1 = sum(values[i] for i in team1)
+        results.append((_avg_diff(sum1, n1, total, n2), tuple(team1), tuple(team2)))
+    return results
+
+
+def balance_teams(members, team_size=None, key='value', k=1):
+    """メンバー辞書のリストをランク値が均等になるよう2チームに分ける
+
+    k > 1 の場合は上位 k 通りの [(team1, team2), ...] を返す。
+    """
+    values = [m[key] for m in members]
+    splits = find_best_splits(values, team_size, k)
+    teams = [([members[i] for i in t1], [members[i] for i in t2]) for _, t1, t2 in splits]
+    return teams[0] if k == 1 else teams
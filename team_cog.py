@@ -0,0 +1,906 @@
+import random
+
+import discord
+from discord.ext import commands
+
+from command_guard import command_executing, prevent_duplicate_execution
+from guild_index import member_index, voice_index
+from rate_limiter import rate_limiter
+
+
+class Teams(commands.Cog):
+    """ランダムなチーム分けのコマンド（サーバーのメンバー・VC参加者から）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='team', help='メンバーをランダムでチーム分けします（例: !team 2v1, !team 3v3, !team）')
+    @prevent_duplicate_execution
+    async def team_divide(self, ctx, format_type=None):
+        """チーム分け機能"""
+        try:
+            # レート制限チェック（チーム分けはAI枠とは別のバケット）
+            user_id = ctx.author.id
+            allowed, wait_time, _ = rate_limiter.try_acquire('team', user_id)
+            if not allowed:
+                await ctx.send(f"⏰ 少し待ってください。あと{wait_time:.1f}秒後に再度お試しください。")
+                return
+
+            # サーバーの人間メンバーを取得（Bot除く）
+            guild = ctx.guild
+            if not guild:
+                await ctx.send("❌ このコマンドはサーバー内でのみ使用できます。")
+                return
+
+            # オンラインの人間メンバーと全メンバー（オフライン含む）を索引から取得
+            index = member_index.get(guild)
+            online_members = index.online_humans()
+            all_human_members = index.human_members()
+
+            if len(online_members) < 2:
+                if len(all_human_members) >= 2:
+                    await ctx.send(f"⚠️ オンラインメンバーが少ないため、全メンバー({len(all_human_members)}人)でチーム分けします。\n"
+                                  f"オンライン: {len(online_members)}人 / 全体: {len(all_human_members)}人")
+                    members_to_use = all_human_members
+                else:
+                    await ctx.send("❌ チーム分けには最低2人のメンバーが必要です。")
+                    return
+            else:
+                members_to_use = online_members
+
+
+            # メンバーをランダムシャッフル
+            shuffled_members = members_to_use.copy()
+            random.shuffle(shuffled_members)
+
+            embed = discord.Embed(title="🎯 チーム分け結果", color=0x00ff00)
+
+            if format_type:
+                format_type = format_type.lower()
+
+                # 2v1形式
+                if format_type in ['2v1', '2対1']:
+                    if len(shuffled_members) < 3:
+                        await ctx.send(f"❌ 2v1には最低3人必要ですが、現在{len(shuffled_members)}人しかいません。\n💡 `!team 1v1`や`!team`（自動選択）をお試しください。")
+                        return
+
+                    team1 = shuffled_members[:2]
+                    team2 = [shuffled_members[2]]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (1人)",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 3:
+                        extras = shuffled_members[3:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+
+                # 3v3形式
+                elif format_type in ['3v3', '3対3']:
+                    if len(shuffled_members) < 6:
+                        await ctx.send(f"⚠️ 3v3には6人必要ですが、{len(shuffled_members)}人しかいません。")
+                        # 可能な範囲でチーム分け
+                        if len(shuffled_members) >= 4:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name="🔴 チーム1",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name="🔵 チーム2", 
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                        else:
+                            await ctx.send("❌ チーム分けには最低4人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:3]
+                        team2 = shuffled_members[3:6]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (3人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (3人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 6:
+                            extras = shuffled_members[6:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+
+                # 2v2形式
+                elif format_type in ['2v2', '2対2']:
+                    if len(shuffled_members) < 4:
+                        await ctx.send("❌ 2v2には最低4人必要です。")
+                        return
+
+                    team1 = shuffled_members[:2]
+                    team2 = shuffled_members[2:4]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 4:
+                        extras = shuffled_members[4:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+
+                # 1v1形式
+                elif format_type in ['1v1', '1対1']:
+                    if len(shuffled_members) < 2:
+                        await ctx.send("❌ 1v1には最低2人必要です。")
+                        return
+
+                    team1 = [shuffled_members[0]]
+                    team2 = [shuffled_members[1]]
+
+                    embed.add_field(
+                        name="🔴 プレイヤー1",
+                        value=f"• {team1[0].display_name}",
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 プレイヤー2",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 2:
+                        extras = shuffled_members[2:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+
+                # 5v5形式
+                elif format_type in ['5v5', '5対5']:
+                    if len(shuffled_members) < 10:
+                        await ctx.send(f"⚠️ 5v5には10人必要ですが、{len(shuffled_members)}人しかいません。")
+                        # 可能な範囲でチーム分け
+                        if len(shuffled_members) >= 6:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name=f"🔴 チーム1 ({len(team1)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name=f"🔵 チーム2 ({len(team2)}人)", 
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                            embed.set_footer(text="自動調整: 均等分け")
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:5]
+                        team2 = shuffled_members[5:10]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (5人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (5人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 10:
+                            extras = shuffled_members[10:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+
+                # 4v4形式
+                elif format_type in ['4v4', '4対4']:
+                    if len(shuffled_members) < 8:
+                        await ctx.send(f"⚠️ 4v4には8人必要ですが、{len(shuffled_members)}人しかいません。")
+                        # 可能な範囲でチーム分け
+                        if len(shuffled_members) >= 6:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name=f"🔴 チーム1 ({len(team1)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name=f"🔵 チーム2 ({len(team2)}人)", 
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                            embed.set_footer(text="自動調整: 均等分け")
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:4]
+                        team2 = shuffled_members[4:8]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (4人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (4人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 8:
+                            extras = shuffled_members[8:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+
+                else:
+                    await ctx.send("❌ 対応していない形式です。使用可能: `2v1`, `3v3`, `2v2`, `1v1`, `4v4`, `5v5`")
+                    return
+
+            else:
+                # 形式指定なし - 自動で最適な分け方を選択
+                member_count = len(shuffled_members)
+
+                if member_count == 2:
+                    # 1v1
+                    embed.add_field(
+                        name="🔴 プレイヤー1",
+                        value=f"• {shuffled_members[0].display_name}",
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 プレイヤー2",
+                        value=f"• {shuffled_members[1].display_name}",
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 1v1形式")
+
+                elif member_count == 3:
+                    # 2v1
+                    team1 = shuffled_members[:2]
+                    team2 = [shuffled_members[2]]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (1人)",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 2v1形式")
+
+                elif member_count == 4:
+                    # 2v2
+                    team1 = shuffled_members[:2]
+                    team2 = shuffled_members[2:4]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 2v2形式")
+
+                elif member_count >= 10:
+                    # 5v5（余りは待機）
+                    team1 = shuffled_members[:5]
+                    team2 = shuffled_members[5:10]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (5人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (5人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 10:
+                        extras = shuffled_members[10:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 5v5形式")
+
+                elif member_count >= 8:
+                    # 4v4（余りは待機）
+                    team1 = shuffled_members[:4]
+                    team2 = shuffled_members[4:8]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (4人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (4人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 8:
+                        extras = shuffled_members[8:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 4v4形式")
+
+                elif member_count >= 6:
+                    # 3v3（余りは待機）
+                    team1 = shuffled_members[:3]
+                    team2 = shuffled_members[3:6]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 6:
+                        extras = shuffled_members[6:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 3v3形式")
+
+                else:
+                    # 5人の場合は不均等に分ける
+                    team1 = shuffled_members[:3]
+                    team2 = shuffled_members[3:5]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 3v2形式")
+
+            # オンライン状況を表示
+            status_info = f"対象: {len(members_to_use)}人 (オンライン: {len(online_members)}人)"
+            embed.add_field(name="📊 情報", value=status_info, inline=False)
+
+            await ctx.send(embed=embed)
+
+            # ランダム性を示すために小さなメッセージ
+            await ctx.send("🎲 ランダムでチーム分けしました！ 再実行すると違う組み合わせになります。")
+
+        except Exception as e:
+            await ctx.send(f"❌ チーム分けでエラーが発生しました: {str(e)}")
+            print(f"チーム分けエラー: {e}")
+
+    @commands.command(name='quick_team', aliases=['qt'], help='簡単チーム分け（例: !qt, !quick_team 2v1）')
+    @prevent_duplicate_execution
+    async def quick_team(self, ctx, format_type=None):
+        """簡単チーム分け（エイリアス）"""
+        await self.team_divide(ctx, format_type)
+
+    @commands.command(name='vc_team', aliases=['vct'], help='VC内メンバーでチーム分けします（例: !vc_team, !vc_team 2v2）')
+    @prevent_duplicate_execution
+    async def vc_team_divide(self, ctx, format_type=None):
+        """VC内メンバー専用チーム分け機能"""
+        try:
+
+            guild = ctx.guild
+            if not guild:
+                await ctx.send("❌ このコマンドはサーバー内でのみ使用できます。")
+                return
+
+            # 全てのボイスチャンネルのメンバーをVC参加者索引から取得（1人は1つのVCにしかいない）
+            vc_members, active_channels = voice_index.lobby(guild)
+            voice_channels_with_members = [f"🔊 {name} ({count}人)" for name, count in active_channels]
+
+            if len(vc_members) < 2:
+                embed = discord.Embed(
+                    title="❌ VC内メンバー不足", 
+                    color=discord.Color.red()
+                )
+                embed.add_field(
+                    name="現在の状況",
+                    value=f"VC内人間メンバー: {len(vc_members)}人\nチーム分けには最低2人必要です。",
+                    inline=False
+                )
+
+                if voice_channels_with_members:
+                    embed.add_field(
+                        name="アクティブなVC",
+                        value="\n".join(voice_channels_with_members),
+                        inline=False
+                    )
+                else:
+                    embed.add_field(
+                        name="💡 ヒント",
+                        value="まずボイスチャンネルに参加してから再度実行してください。",
+                        inline=False
+                    )
+
+                await ctx.send(embed=embed)
+                return
+
+            # メンバーをランダムシャッフル
+            shuffled_members = vc_members.copy()
+            random.shuffle(shuffled_members)
+
+            embed = discord.Embed(title="🎤 VC チーム分け結果", color=0xff6b47)  # オレンジ色でVC専用を表現
+
+            if format_type:
+                format_type = format_type.lower()
+
+                # 各形式の処理（既存のコードと同じロジック）
+                if format_type in ['2v1', '2対1']:
+                    if len(shuffled_members) < 3:
+                        await ctx.send(f"❌ 2v1には最低3人必要ですが、VC内に{len(shuffled_members)}人しかいません。\n💡 `!vc_team 1v1`や`!vc_team`（自動選択）をお試しください。")
+                        return
+
+                    team1 = shuffled_members[:2]
+                    team2 = [shuffled_members[2]]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (1人)",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 3:
+                        extras = shuffled_members[3:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="指定形式: 2v1 (VC内メンバー)")
+
+                elif format_type in ['3v3', '3対3']:
+                    if len(shuffled_members) < 6:
+                        await ctx.send(f"⚠️ 3v3には6人必要ですが、VC内に{len(shuffled_members)}人しかいません。")
+                        if len(shuffled_members) >= 4:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name="🔴 チーム1",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name="🔵 チーム2",
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                            embed.set_footer(text="自動調整: 均等分け (VC内メンバー)")
+                        else:
+                            await ctx.send("❌ チーム分けには最低4人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:3]
+                        team2 = shuffled_members[3:6]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (3人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (3人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 6:
+                            extras = shuffled_members[6:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+                        embed.set_footer(text="指定形式: 3v3 (VC内メンバー)")
+
+                elif format_type in ['2v2', '2対2']:
+                    if len(shuffled_members) < 4:
+                        await ctx.send("❌ 2v2には最低4人必要です。")
+                        return
+
+                    team1 = shuffled_members[:2]
+                    team2 = shuffled_members[2:4]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 4:
+                        extras = shuffled_members[4:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="指定形式: 2v2 (VC内メンバー)")
+
+                elif format_type in ['1v1', '1対1']:
+                    if len(shuffled_members) < 2:
+                        await ctx.send("❌ 1v1には最低2人必要です。")
+                        return
+
+                    team1 = [shuffled_members[0]]
+                    team2 = [shuffled_members[1]]
+
+                    embed.add_field(
+                        name="🔴 プレイヤー1",
+                        value=f"• {team1[0].display_name}",
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 プレイヤー2",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 2:
+                        extras = shuffled_members[2:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="指定形式: 1v1 (VC内メンバー)")
+
+                # 5v5形式（VC版）
+                elif format_type in ['5v5', '5対5']:
+                    if len(shuffled_members) < 10:
+                        await ctx.send(f"⚠️ 5v5には10人必要ですが、VC内に{len(shuffled_members)}人しかいません。")
+                        # 可能な範囲でチーム分け
+                        if len(shuffled_members) >= 6:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name=f"🔴 チーム1 ({len(team1)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name=f"🔵 チーム2 ({len(team2)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                            embed.set_footer(text="自動調整: 均等分け (VC内メンバー)")
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:5]
+                        team2 = shuffled_members[5:10]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (5人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (5人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 10:
+                            extras = shuffled_members[10:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+                        embed.set_footer(text="指定形式: 5v5 (VC内メンバー)")
+
+                # 4v4形式（VC版）
+                elif format_type in ['4v4', '4対4']:
+                    if len(shuffled_members) < 8:
+                        await ctx.send(f"⚠️ 4v4には8人必要ですが、VC内に{len(shuffled_members)}人しかいません。")
+                        # 可能な範囲でチーム分け
+                        if len(shuffled_members) >= 6:
+                            mid = len(shuffled_members) // 2
+                            team1 = shuffled_members[:mid]
+                            team2 = shuffled_members[mid:]
+
+                            embed.add_field(
+                                name=f"🔴 チーム1 ({len(team1)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team1]),
+                                inline=True
+                            )
+                            embed.add_field(
+                                name=f"🔵 チーム2 ({len(team2)}人)",
+                                value="\n".join([f"• {m.display_name}" for m in team2]),
+                                inline=True
+                            )
+                            embed.set_footer(text="自動調整: 均等分け (VC内メンバー)")
+                        else:
+                            await ctx.send("❌ チーム分けには最低6人必要です。")
+                            return
+                    else:
+                        team1 = shuffled_members[:4]
+                        team2 = shuffled_members[4:8]
+
+                        embed.add_field(
+                            name="🔴 チーム1 (4人)",
+                            value="\n".join([f"• {m.display_name}" for m in team1]),
+                            inline=True
+                        )
+                        embed.add_field(
+                            name="🔵 チーム2 (4人)",
+                            value="\n".join([f"• {m.display_name}" for m in team2]),
+                            inline=True
+                        )
+
+                        if len(shuffled_members) > 8:
+                            extras = shuffled_members[8:]
+                            embed.add_field(
+                                name="⚪ 待機",
+                                value="\n".join([f"• {m.display_name}" for m in extras]),
+                                inline=False
+                            )
+                        embed.set_footer(text="指定形式: 4v4 (VC内メンバー)")
+
+                else:
+                    await ctx.send("❌ 対応していない形式です。使用可能: `2v1`, `3v3`, `2v2`, `1v1`, `4v4`, `5v5`")
+                    return
+
+            else:
+                # 形式指定なし - 自動で最適な分け方を選択
+                member_count = len(shuffled_members)
+
+                if member_count == 2:
+                    # 1v1
+                    embed.add_field(
+                        name="🔴 プレイヤー1",
+                        value=f"• {shuffled_members[0].display_name}",
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 プレイヤー2",
+                        value=f"• {shuffled_members[1].display_name}",
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 1v1形式 (VC内メンバー)")
+
+                elif member_count == 3:
+                    # 2v1
+                    team1 = shuffled_members[:2]
+                    team2 = [shuffled_members[2]]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (1人)",
+                        value=f"• {team2[0].display_name}",
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 2v1形式 (VC内メンバー)")
+
+                elif member_count == 4:
+                    # 2v2
+                    team1 = shuffled_members[:2]
+                    team2 = shuffled_members[2:4]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 2v2形式 (VC内メンバー)")
+
+                elif member_count >= 10:
+                    # 5v5（余りは待機）
+                    team1 = shuffled_members[:5]
+                    team2 = shuffled_members[5:10]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (5人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (5人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 10:
+                        extras = shuffled_members[10:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 5v5形式 (VC内メンバー)")
+
+                elif member_count >= 8:
+                    # 4v4（余りは待機）
+                    team1 = shuffled_members[:4]
+                    team2 = shuffled_members[4:8]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (4人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (4人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 8:
+                        extras = shuffled_members[8:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 4v4形式 (VC内メンバー)")
+
+                elif member_count >= 6:
+                    # 3v3（余りは待機）
+                    team1 = shuffled_members[:3]
+                    team2 = shuffled_members[3:6]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+
+                    if len(shuffled_members) > 6:
+                        extras = shuffled_members[6:]
+                        embed.add_field(
+                            name="⚪ 待機",
+                            value="\n".join([f"• {m.display_name}" for m in extras]),
+                            inline=False
+                        )
+                    embed.set_footer(text="自動選択: 3v3形式 (VC内メンバー)")
+
+                else:
+                    # 5人の場合は不均等に分ける
+                    team1 = shuffled_members[:3]
+                    team2 = shuffled_members[3:5]
+
+                    embed.add_field(
+                        name="🔴 チーム1 (3人)",
+                        value="\n".join([f"• {m.display_name}" for m in team1]),
+                        inline=True
+                    )
+                    embed.add_field(
+                        name="🔵 チーム2 (2人)",
+                        value="\n".join([f"• {m.display_name}" for m in team2]),
+                        inline=True
+                    )
+                    embed.set_footer(text="自動選択: 3v2形式 (VC内メンバー)")
+
+            # VC情報を表示
+            if voice_channels_with_members:
+                embed.add_field(
+                    name="🎤 対象VC", 
+                    value="\n".join(voice_channels_with_members), 
+                    inline=False
+                )
+
+            embed.add_field(
+                name="📊 情報", 
+                value=f"VC内メンバー: {len(vc_members)}人", 
+                inline=False
+            )
+
+            await ctx.send(embed=embed)
+
+            # 追加メッセージ
+            await ctx.send("🎲 VC内メンバーでランダムチーム分けしました！ 再実行すると違う組み合わせになります。")
+
+        except Exception as e:
+            await ctx.send(f"❌ VC チーム分けでエラーが発生しました: {str(e)}")
+            print(f"VC チーム分けエラー: {e}")
+        finally:
+            # 実行中フラグをクリア
+            command_executing.pop(ctx.author.id, None)
+
+
+async def setup(bot):
+    await bot.add_cog(Teams(bot))
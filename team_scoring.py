@@ -0,0 +1,252 @@
+import itertools
+import math
+import random
+from collections import defaultdict, deque
+
+from team_balancer import find_best_splits
+
+_numpy = False  # 未読み込み。numpy がなければ None
+
+# スキル値の合成（ランク値と同じスケール）
+CURRENT_RANK_WEIGHT = 0.7
+PEAK_RANK_WEIGHT = 0.3
+PEAK_ONLY_DISCOUNT = 50      # 最高ランクしか分からない場合の割引
+DEFAULT_SKILL = 400          # 誰もランク未設定のときの値（ゴールド1レベル）
+PERFORMANCE_WEIGHT = 50      # Tracker.gg の KD・勝率による補正の最大幅
+
+# 同じチームメイトの組み合わせを避ける
+HISTORY_SIZE = 5             # チャンネルごとに覚えておく直近の分け方
+REPEAT_PENALTY = 8           # 直近と同じチームメイト1組あたりのペナルティ（古いほど減衰）
+HISTORY_DECAY = 0.6
+
+# 候補の数（これ以下なら全列挙、超える場合はサンプリング）
+MAX_CANDIDATES = 4000
+SEED_CANDIDATES = 64
+
+
+def rank_skill(value):
+    """VALORANT_RANKS の value（tier * 100 + division）を等間隔のスキル値にする
+
+    value のままだと同じtier内の差が1しかないため、1ディビジョンを約33として扱う。
+    """
+    tier, division = divmod(value, 100)
+    if division == 0:  # レディアント
+        return float(value)
+    return tier * 100 + (division - 2) * 100 / 3
+
+
+def performance_from_profile(data):
+    """Tracker.gg のプロフィールから (KD, 勝率%) を取り出す。なければ (None, None)"""
+    try:
+        segments = data['data']['segments']
+    except (KeyError, TypeError):
+        return None, None
+    for segment in segments:
+        if segment.get('type') != 'overview':
+            continue
+        stats = segment.get('stats', {})
+        kd = (stats.get('kDRatio') or {}).get('value')
+        wins = (stats.get('wins') or {}).get('value')
+        matches = (stats.get('matchesPlayed') or {}).get('value')
+        win_rate = wins / matches * 100 if wins is not None and matches else None
+        return kd, win_rate
+    return None, None
+
+
+def player_skill(current=None, peak=None, kd=None, win_rate=None):
+    """現在ランク・最高ランク（value）と直近成績からスキル値を求める。ランク不明なら None"""
+    if current is not None:
+        base = rank_skill(current)
+        if peak is not None:
+            # 最高ランクが現在より低い（更新忘れ）場合は現在ランクを使う
+            base = CURRENT_RANK_WEIGHT * base + PEAK_RANK_WEIGHT * max(base, rank_skill(peak))
+    elif peak is not None:
+        base = rank_skill(peak) - PEAK_ONLY_DISCOUNT
+    else:
+        return None
+
+    form = 0.0
+    if kd is not None:
+        form += 0.6 * max(-1.0, min(1.0, (kd - 1.0) / 0.5))
+    if win_rate is not None:
+        form += 0.4 * max(-1.0, min(1.0, (win_rate - 50) / 15))
+    return base + PERFORMANCE_WEIGHT * form
+
+
+class TeammateHistory:
+    """チャンネルごとの直近のチーム分け（同じ組み合わせの繰り返しを避けるため）"""
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self._splits = defaultdict(lambda: deque(maxlen=self.size))
+
+    def record(self, channel_id, teams):
+        """teams: ユーザーIDのリストのリスト（待機者は含めない）"""
+        self._splits[channel_id].append([frozenset(team) for team in teams if team])
+
+    def clear(self, channel_id):
+        self._splits.pop(channel_id, None)
+
+    def pair_weights(self, channel_id, player_ids):
+        """player_ids の各ペアが直近に同じチームだった重み（新しいほど大きい）の行列"""
+        n = len(player_ids)
+        weights = [[0.0] * n for _ in range(n)]
+        splits = self._splits.get(channel_id)
+        if not splits:
+            return weights
+        position = {pid: i for i, pid in enumerate(player_ids)}
+        for age, split in enumerate(reversed(splits)):
+            decay = HISTORY_DECAY ** age
+            for team in split:
+                members = [position[pid] for pid in team if pid in position]
+                for a, b in itertools.combinations(members, 2):
+                    weights[a][b] += decay
+                    weights[b][a] += decay
+        return weights
+
+    def __len__(self):
+        return len(self._splits)
+
+
+def _candidates(skills, n1, rng):
+    """候補となるチーム1のインデックス集合を列挙（多すぎる場合はサンプリング）"""
+    n = len(skills)
+    symmetric = n1 * 2 == n
+    total = math.comb(n, n1) // (2 if symmetric else 1)
+    if total <= MAX_CANDIDATES:
+        if symmetric:
+            # 表裏を同一視するため、0番は常にチーム1に入れる
+            return [(0,) + rest for rest in itertools.combinations(range(1, n), n1 - 1)]
+        return list(itertools.combinations(range(n), n1))
+
+    # 人数が多い場合: ランク差が小さい上位解を種にして、残りはランダムに選ぶ
+    seen = set()
+    result = []
+    for _, team1, _ in find_best_splits(skills, n1, k=SEED_CANDIDATES):
+        key = tuple(sorted(team1))
+        if key not in seen:
+            seen.add(key)
+            result.append(key)
+    indices = list(range(n))
+    attempts = 0
+    while len(result) < MAX_CANDIDATES and attempts < MAX_CANDIDATES * 3:
+        attempts += 1
+        key = tuple(sorted(rng.sample(indices, n1)))
+        if key not in seen:
+            seen.add(key)
+            result.append(key)
+    return result
+
+
+def _load_numpy():
+    """numpy は import に100ms近くかかり、使うのはチーム分けだけなので初回のチーム分けで読み込む"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:  # requirements.txt に含まれるが、入っていない環境でも純Pythonで同じ計算をする
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def _costs_numpy(np, candidates, skills, pairs, n1, n2):
+    n = len(skills)
+    c = np.zeros((len(candidates), n))
+    rows = np.repeat(np.arange(len(candidates)), n1)
+    c[rows, np.fromiter(itertools.chain.from_iterable(candidates), dtype=np.intp)] = 1.0
+    s = np.asarray(skills, dtype=float)
+    sum1 = c @ s
+    diff = np.abs(sum1 / n1 - (s.sum() - sum1) / n2) if n2 else np.abs(sum1 / n1)
+    p = np.asarray(pairs, dtype=float)
+    if not p.any():
+        return diff, np.zeros(len(candidates))
+    d = 1.0 - c
+    # チーム内のペア重みの合計 = c^T P c / 2（対角は0）
+    repeat = (((c @ p) * c).sum(axis=1) + ((d @ p) * d).sum(axis=1)) / 2
+    return diff, repeat
+
+
+def _costs_python(candidates, skills, pairs, n1, n2):
+    n = len(skills)
+    total = sum(skills)
+    has_pairs = any(any(row) for row in pairs)
+    diffs, repeats = [], []
+    for team1 in candidates:
+        sum1 = sum(skills[i] for i in team1)
+        diffs.append(abs(sum1 / n1 - (total - sum1) / n2) if n2 else abs(sum1 / n1))
+        if not has_pairs:
+            repeats.append(0.0)
+            continue
+        in1 = set(team1)
+        team2 = [i for i in range(n) if i not in in1]
+        repeat = 0.0
+        for team in (team1, team2):
+            for a, b in itertools.combinations(team, 2):
+                repeat += pairs[a][b]
+        repeats.append(repeat)
+    return diffs, repeats
+
+
+def score_splits(skills, team_size=None, pairs=None, tolerance=0.0, rng=None):
+    """スキル値を2チームに分ける
+
+    コスト = 平均スキル差 + 直近と同じチームメイトのペナルティ。最小コストから
+    tolerance 以内の候補からランダムに1つ選ぶ（カスタムゲームで毎回同じ分け方にならないように）。
+    戻り値は (チーム1のインデックス, チーム2のインデックス, 平均差, 重複ペア重み)。
+    """
+    rng = rng or random
+    n = len(skills)
+    if n < 2:
+        return tuple(range(n)), (), 0.0, 0.0
+    n1 = n // 2 if team_size is None else max(1, min(team_size, n - 1))
+    n2 = n - n1
+    if pairs is None:
+        pairs = [[0.0] * n for _ in range(n)]
+
+    candidates = _candidates(skills, n1, rng)
+    np = _load_numpy()
+    if np is not None:
+        diffs, repeats = _costs_numpy(np, candidates, skills, pairs, n1, n2)
+        costs = diffs + REPEAT_PENALTY * repeats
+        best = costs.min()
+        near = np.flatnonzero(costs <= best + tolerance).tolist()
+    else:
+        diffs, repeats = _costs_python(candidates, skills, pairs, n1, n2)
+        costs = [d + REPEAT_PENALTY * r for d, r in zip(diffs, repeats)]
+        best = min(costs)
+        near = [i for i, cost in enumerate(costs) if cost <= best + tolerance]
+
+    chosen = rng.choice(near)
+    team1 = candidates[chosen]
+    in1 = set(team1)
+    team2 = tuple(i for i in range(n) if i not in in1)
+    # 表示用にスキルの高い順
+    team1 = tuple(sorted(team1, key=lambda i: skills[i], reverse=True))
+    team2 = tuple(sorted(team2, key=lambda i: skills[i], reverse=True))
+    return team1, team2, float(diffs[chosen]), float(repeats[chosen])
+
+
+def score_teams(players, team_size=None, history=None, channel_id=None, tolerance=0.0, rng=None):
+    """プレイヤー辞書（'id' と 'skill'、skill は None 可）を2チームに分ける
+
+    スキル不明のプレイヤーにはロビーの平均値を入れる。history を渡すと
+    結果を記録し、次回は同じチームメイトの組み合わせを避ける。
+    戻り値は (チーム1, チーム2, 平均スキル差)。
+    """
+    known = [p['skill'] for p in players if p.get('skill') is not None]
+    fallback = sum(known) / len(known) if known else DEFAULT_SKILL
+    for p in players:
+        if p.get('skill') is None:
+            p['skill'] = fallback
+
+    skills = [p['skill'] for p in players]
+    ids = [p['id'] for p in players]
+    pairs = history.pair_weights(channel_id, ids) if history is not None else None
+    idx1, idx2, diff, _ = score_splits(skills, team_size, pairs, tolerance, rng)
+
+    team1 = [players[i] for i in idx1]
+    team2 = [players[i] for i in idx2]
+    if history is not None:
+        history.record(channel_id, [[p['id'] for p in team1], [p['id'] for p in team2]])
+    return team1, team2, diff
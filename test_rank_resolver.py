@@ -0,0 +1,62 @@
+"""RankResolver の入力表の確認（python -m pytest test_rank_resolver.py）"""
+import pytest
+
+from rank_resolver import RankResolver
+
+# VALORANT_RANKS と同じキー・tier・value（bot.py を読み込まずに済むように）
+TIER_NAMES = {1: "アイアン", 2: "ブロンズ", 3: "シルバー", 4: "ゴールド", 5: "プラチナ",
+              6: "ダイヤ", 7: "アセンダント", 8: "イモータル"}
+RANKS = {"レディアント": {"tier": 9, "value": 900}}
+for _tier, _name in TIER_NAMES.items():
+    for _division in (3, 2, 1):
+        RANKS[f"{_name}{_division}"] = {"tier": _tier, "value": _tier * 100 + _division}
+
+CASES = [
+    ("ダイヤ2", "ダイヤ2"),
+    ("ダイヤモンド ２", "ダイヤ2"),
+    ("だいや1", "ダイヤ1"),
+    ("ﾀﾞｲﾔ3", "ダイヤ3"),
+    ("d2", "ダイヤ2"),
+    ("D 1", "ダイヤ1"),
+    ("diamond", "ダイヤ3"),
+    ("dia2", "ダイヤ2"),
+    ("ir1", "アイアン1"),
+    ("iron2", "アイアン2"),
+    ("アイアン", "アイアン3"),
+    ("i1", "イモータル1"),
+    ("imm3", "イモータル3"),
+    ("イモ2", "イモータル2"),
+    ("a2", "アセンダント2"),
+    ("asc", "アセンダント3"),
+    ("p3", "プラチナ3"),
+    ("plat1", "プラチナ1"),
+    ("ｐｌａｔ１", "プラチナ1"),
+    ("g1", "ゴールド1"),
+    ("gold", "ゴールド3"),
+    ("s2", "シルバー2"),
+    ("b3", "ブロンズ3"),
+    ("bro1", "ブロンズ1"),
+    ("r", "レディアント"),
+    ("Radiant", "レディアント"),
+    ("レディアント", "レディアント"),
+    ("", None),
+    ("xyz", None),
+    (("ダイヤ", "2"), "ダイヤ2"),
+]
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return RankResolver(RANKS)
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_resolve(resolver, text, expected):
+    assert resolver.resolve(text) == expected
+
+
+def test_lookups(resolver):
+    assert resolver.value_of("ダイヤ2") == 602
+    assert resolver.tier_of("イモータル1") == 8
+    assert resolver.value_of("xyz") is None
+    assert resolver.rank_id("アイアン1") < resolver.rank_id("レディアント")
@@ -0,0 +1,777 @@
+import random
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from command_guard import prevent_duplicate_execution
+from recruits import reminder_scheduler
+from render_coordinator import render_coordinator
+from storage import state_store
+from tournaments import TournamentView, active_tournaments, create_tournament, create_tournament_embed
+
+
+async def join_tournament(ctx):
+    """トーナメント参加"""
+    guild_id = ctx.guild.id
+    user_id = ctx.author.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] != 'registration':
+        await ctx.send("❌ 現在参加登録を受け付けていません。")
+        return
+
+    if user_id in [p['user_id'] for p in tournament['participants']]:
+        await ctx.send("⚠️ 既に参加登録済みです。")
+        return
+
+    if len(tournament['participants']) >= tournament['max_participants']:
+        await ctx.send("❌ 参加者が満員です。")
+        return
+
+    # 参加登録
+    participant = {
+        'user_id': user_id,
+        'user': ctx.author,
+        'joined_at': datetime.now(),
+        'wins': 0,
+        'losses': 0
+    }
+
+    tournament['participants'].append(participant)
+    state_store.mark_dirty('active_tournaments', guild_id)
+
+    embed = discord.Embed(
+        title="✅ トーナメント参加登録完了",
+        color=0x00ff88
+    )
+
+    current_count = len(tournament['participants'])
+
+    embed.add_field(
+        name="📊 現在の状況",
+        value=f"**参加者:** {current_count}/{tournament['max_participants']}人\n"
+              f"**形式:** {tournament['tournament_type']}\n"
+              f"**必要最小人数:** 4人",
+        inline=True
+    )
+
+    # 参加者リスト（最新5人のみ表示）
+    recent_participants = tournament['participants'][-5:]
+    participant_list = [f"• {p['user'].display_name}" for p in recent_participants]
+
+    embed.add_field(
+        name="👥 最新参加者",
+        value="\n".join(participant_list),
+        inline=True
+    )
+
+    if current_count >= 4:
+        embed.add_field(
+            name="🎯 開始可能",
+            value=f"最小人数に達しました！\n`!tournament start` で開始できます。",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+async def leave_tournament(ctx):
+    """トーナメント離脱"""
+    guild_id = ctx.guild.id
+    user_id = ctx.author.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] != 'registration':
+        await ctx.send("❌ 既に開始されているため離脱できません。")
+        return
+
+    # 参加者から削除
+    for i, participant in enumerate(tournament['participants']):
+        if participant['user_id'] == user_id:
+            del tournament['participants'][i]
+            state_store.mark_dirty('active_tournaments', guild_id)
+            await ctx.send(f"✅ {ctx.author.display_name} がトーナメントから離脱しました。")
+            return
+
+    await ctx.send("❌ トーナメントに参加していません。")
+
+
+async def start_tournament(ctx):
+    """トーナメント開始"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    # 権限チェック
+    if ctx.author.id != tournament['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ トーナメント作成者または管理者のみ開始できます。")
+        return
+
+    if tournament['status'] != 'registration':
+        await ctx.send("❌ 既に開始されているか、終了しています。")
+        return
+
+    participants = tournament['participants']
+
+    if len(participants) < 4:
+        await ctx.send("❌ トーナメント開始には最低4人必要です。")
+        return
+
+    # ブラケット生成
+    import math
+
+    # 2の累乗に調整
+    bracket_size = 2 ** math.ceil(math.log2(len(participants)))
+
+    # 参加者をシャッフル
+    shuffled_participants = participants.copy()
+    random.shuffle(shuffled_participants)
+
+    # 不戦勝者（BYE）を追加
+    while len(shuffled_participants) < bracket_size:
+        shuffled_participants.append(None)  # BYE
+
+    # 第1ラウンドの試合を作成
+    matches = []
+    match_id = 1
+
+    for i in range(0, len(shuffled_participants), 2):
+        player1 = shuffled_participants[i]
+        player2 = shuffled_participants[i + 1] if i + 1 < len(shuffled_participants) else None
+
+        match_data = {
+            'id': match_id,
+            'round': 1,
+            'player1': player1,
+            'player2': player2,
+            'winner': None,
+            'status': 'pending'  # pending, completed
+        }
+
+        # BYE の処理
+        if player1 and not player2:
+            match_data['winner'] = player1
+            match_data['status'] = 'completed'
+        elif player2 and not player1:
+            match_data['winner'] = player2
+            match_data['status'] = 'completed'
+
+        matches.append(match_data)
+        match_id += 1
+
+    tournament['bracket'] = matches
+    tournament['status'] = 'ongoing'
+    tournament['current_round'] = 1
+    state_store.mark_dirty('active_tournaments', tournament['guild_id'])
+
+    embed = discord.Embed(
+        title="🏁 トーナメント開始！",
+        description=f"**{tournament['tournament_type']}** トーナメントが開始されました",
+        color=0xffd700
+    )
+
+    embed.add_field(
+        name="📊 情報",
+        value=f"**参加者数:** {len([p for p in participants if p])}人\n"
+              f"**第1ラウンド試合数:** {len([m for m in matches if m['status'] == 'pending'])}試合\n"
+              f"**形式:** シングルエリミネーション",
+        inline=False
+    )
+
+    embed.add_field(
+        name="🎯 次のステップ",
+        value="`!tournament bracket` - ブラケット確認\n"
+              "`!tournament next` - 次の試合確認\n"
+              "`!tournament result @勝者` - 結果入力",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def show_tournament_bracket(ctx):
+    """ブラケット表示"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] == 'registration':
+        await ctx.send("❌ まだトーナメントが開始されていません。")
+        return
+
+    embed = discord.Embed(
+        title="🏆 トーナメントブラケット",
+        color=0xffd700
+    )
+
+    # ラウンド別に試合を整理
+    rounds = {}
+    for match in tournament['bracket']:
+        round_num = match['round']
+        if round_num not in rounds:
+            rounds[round_num] = []
+        rounds[round_num].append(match)
+
+    for round_num in sorted(rounds.keys()):
+        round_matches = rounds[round_num]
+
+        match_list = []
+        for match in round_matches:
+            p1_name = match['player1']['user'].display_name if match['player1'] else "BYE"
+            p2_name = match['player2']['user'].display_name if match['player2'] else "BYE"
+
+            if match['status'] == 'completed':
+                winner_name = match['winner']['user'].display_name if match['winner'] else "TBD"
+                match_text = f"**{p1_name}** vs **{p2_name}** → 🏆 {winner_name}"
+            else:
+                match_text = f"{p1_name} vs {p2_name}"
+
+            match_list.append(match_text)
+
+        embed.add_field(
+            name=f"🔥 第{round_num}ラウンド",
+            value="\n".join(match_list) if match_list else "試合なし",
+            inline=False
+        )
+
+    # 進行状況
+    total_matches = len(tournament['bracket'])
+    completed_matches = len([m for m in tournament['bracket'] if m['status'] == 'completed'])
+
+    embed.add_field(
+        name="📊 進行状況",
+        value=f"完了試合: {completed_matches}/{total_matches}\n"
+              f"現在ラウンド: {tournament['current_round']}",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def show_tournament_status(ctx):
+    """トーナメント状況表示"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    status_map = {
+        'registration': '📝 参加者募集中',
+        'ongoing': '⚔️ 進行中',
+        'ended': '🏁 終了'
+    }
+
+    embed = discord.Embed(
+        title="📊 トーナメント状況",
+        color=0x00aaff
+    )
+
+    embed.add_field(
+        name="基本情報",
+        value=f"**ステータス:** {status_map.get(tournament['status'], tournament['status'])}\n"
+              f"**形式:** {tournament['tournament_type']}\n"
+              f"**参加者:** {len(tournament['participants'])}人\n"
+              f"**作成者:** {tournament['creator'].display_name}",
+        inline=True
+    )
+
+    if tournament['status'] == 'ongoing':
+        current_round_matches = [m for m in tournament['bracket'] if m['round'] == tournament['current_round']]
+        pending_matches = [m for m in current_round_matches if m['status'] == 'pending']
+
+        embed.add_field(
+            name="進行状況",
+            value=f"**現在ラウンド:** {tournament['current_round']}\n"
+                  f"**待機中試合:** {len(pending_matches)}試合\n"
+                  f"**完了試合:** {len([m for m in tournament['bracket'] if m['status'] == 'completed'])}試合",
+            inline=True
+        )
+
+    embed.set_footer(text=f"ID: {tournament['id'][:8]} | 作成: {tournament['created_at'].strftime('%m/%d %H:%M')}")
+
+    await ctx.send(embed=embed)
+
+
+async def input_match_result(ctx, args):
+    """試合結果入力"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] != 'ongoing':
+        await ctx.send("❌ 現在進行中のトーナメントがありません。")
+        return
+
+    # 勝者の特定
+    winner = None
+    if ctx.message.mentions:
+        winner_user = ctx.message.mentions[0]
+        # 参加者から検索
+        for participant in tournament['participants']:
+            if participant['user_id'] == winner_user.id:
+                winner = participant
+                break
+
+    if not winner:
+        await ctx.send("❌ 有効な勝者を指定してください。例: `!tournament result @勝者`")
+        return
+
+    # 該当する試合を検索
+    current_round = tournament['current_round']
+    pending_matches = [m for m in tournament['bracket'] 
+                      if m['round'] == current_round and m['status'] == 'pending']
+
+    target_match = None
+    for match in pending_matches:
+        if (match['player1'] and match['player1']['user_id'] == winner['user_id']) or \
+           (match['player2'] and match['player2']['user_id'] == winner['user_id']):
+            target_match = match
+            break
+
+    if not target_match:
+        await ctx.send("❌ 該当する試合が見つかりません。")
+        return
+
+    # 結果を記録
+    target_match['winner'] = winner
+    target_match['status'] = 'completed'
+
+    # 勝者の統計更新
+    winner['wins'] += 1
+
+    # 敗者の統計更新
+    loser = None
+    if target_match['player1'] and target_match['player1']['user_id'] != winner['user_id']:
+        loser = target_match['player1']
+    elif target_match['player2'] and target_match['player2']['user_id'] != winner['user_id']:
+        loser = target_match['player2']
+
+    if loser:
+        loser['losses'] += 1
+    state_store.mark_dirty('active_tournaments', guild_id)
+
+    embed = discord.Embed(
+        title="✅ 試合結果入力完了",
+        color=0x00ff88
+    )
+
+    p1_name = target_match['player1']['user'].display_name if target_match['player1'] else "BYE"
+    p2_name = target_match['player2']['user'].display_name if target_match['player2'] else "BYE"
+    winner_name = winner['user'].display_name
+
+    embed.add_field(
+        name="試合結果",
+        value=f"**{p1_name}** vs **{p2_name}**\n🏆 勝者: **{winner_name}**",
+        inline=False
+    )
+
+    # 次ラウンドの生成をチェック
+    current_round_matches = [m for m in tournament['bracket'] if m['round'] == current_round]
+    pending_current = [m for m in current_round_matches if m['status'] == 'pending']
+
+    if not pending_current:
+        # 現在ラウンド完了、次ラウンド生成
+        await generate_next_round(ctx, tournament)
+
+    await ctx.send(embed=embed)
+
+
+async def generate_next_round(ctx, tournament):
+    """次ラウンド生成"""
+    current_round = tournament['current_round']
+    current_round_matches = [m for m in tournament['bracket'] if m['round'] == current_round]
+    winners = [m['winner'] for m in current_round_matches if m['winner']]
+
+    if len(winners) <= 1:
+        # トーナメント終了
+        if winners:
+            champion = winners[0]
+            embed = discord.Embed(
+                title="🏆 トーナメント終了！",
+                description=f"**優勝者: {champion['user'].display_name}**",
+                color=0xffd700
+            )
+
+            embed.add_field(
+                name="🎊 結果",
+                value=f"🥇 優勝: {champion['user'].display_name}\n"
+                      f"勝利数: {champion['wins']}勝",
+                inline=False
+            )
+
+            tournament['status'] = 'ended'
+            state_store.mark_dirty('active_tournaments', tournament['guild_id'])
+            reminder_scheduler.cancel(f"tournament:{tournament['id']}")
+            await ctx.send(embed=embed)
+        else:
+            await ctx.send("❌ トーナメント処理中にエラーが発生しました。")
+        return
+
+    # 次ラウンドの試合を生成
+    next_round = current_round + 1
+    match_id = max([m['id'] for m in tournament['bracket']]) + 1
+
+    next_matches = []
+    for i in range(0, len(winners), 2):
+        player1 = winners[i]
+        player2 = winners[i + 1] if i + 1 < len(winners) else None
+
+        match_data = {
+            'id': match_id,
+            'round': next_round,
+            'player1': player1,
+            'player2': player2,
+            'winner': None,
+            'status': 'pending'
+        }
+
+        # BYE処理
+        if player1 and not player2:
+            match_data['winner'] = player1
+            match_data['status'] = 'completed'
+
+        next_matches.append(match_data)
+        match_id += 1
+
+    tournament['bracket'].extend(next_matches)
+    tournament['current_round'] = next_round
+    state_store.mark_dirty('active_tournaments', tournament['guild_id'])
+
+    embed = discord.Embed(
+        title="🔥 次ラウンド開始！",
+        description=f"第{next_round}ラウンドが開始されました",
+        color=0xff6b6b
+    )
+
+    match_list = []
+    for match in next_matches:
+        if match['status'] == 'pending':
+            p1_name = match['player1']['user'].display_name if match['player1'] else "BYE"
+            p2_name = match['player2']['user'].display_name if match['player2'] else "BYE"
+            match_list.append(f"{p1_name} vs {p2_name}")
+
+    embed.add_field(
+        name=f"第{next_round}ラウンド 対戦カード",
+        value="\n".join(match_list) if match_list else "全てBYE",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def show_next_matches(ctx):
+    """次の試合表示"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] != 'ongoing':
+        await ctx.send("❌ 現在進行中のトーナメントがありません。")
+        return
+
+    current_round = tournament['current_round']
+    pending_matches = [m for m in tournament['bracket'] 
+                      if m['round'] == current_round and m['status'] == 'pending']
+
+    if not pending_matches:
+        await ctx.send("❌ 待機中の試合がありません。")
+        return
+
+    embed = discord.Embed(
+        title="🎯 次の試合",
+        description=f"第{current_round}ラウンド 待機中の試合",
+        color=0xff6b6b
+    )
+
+    for match in pending_matches:
+        p1_name = match['player1']['user'].display_name if match['player1'] else "BYE"
+        p2_name = match['player2']['user'].display_name if match['player2'] else "BYE"
+
+        embed.add_field(
+            name=f"試合 #{match['id']}",
+            value=f"{p1_name} vs {p2_name}",
+            inline=True
+        )
+
+    embed.add_field(
+        name="📝 結果入力",
+        value="`!tournament result @勝者` で結果を入力してください",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+
+async def end_tournament(ctx):
+    """トーナメント終了"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    # 権限チェック
+    if ctx.author.id != tournament['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ トーナメント作成者または管理者のみ終了できます。")
+        return
+
+    tournament['status'] = 'ended'
+    state_store.mark_dirty('active_tournaments', tournament['guild_id'])
+    reminder_scheduler.cancel(f"tournament:{tournament['id']}")
+
+    embed = discord.Embed(
+        title="🏁 トーナメント終了",
+        description=f"**{tournament['tournament_type']}** トーナメントを終了しました",
+        color=0xff6b6b
+    )
+
+    # 最終結果
+    if tournament['status'] == 'ongoing':
+        completed_matches = [m for m in tournament['bracket'] if m['status'] == 'completed']
+        embed.add_field(
+            name="📊 最終統計",
+            value=f"完了試合数: {len(completed_matches)}\n"
+                  f"参加者数: {len(tournament['participants'])}人",
+            inline=False
+        )
+
+    await ctx.send(embed=embed)
+
+
+async def add_to_tournament(ctx, args):
+    """トーナメントにメンバーを手動追加"""
+    guild_id = ctx.guild.id
+
+    if guild_id not in active_tournaments:
+        await ctx.send("❌ アクティブなトーナメントがありません。")
+        return
+
+    tournament = active_tournaments[guild_id]
+
+    if tournament['status'] != 'registration':
+        await ctx.send("❌ 現在参加登録を受け付けていません。")
+        return
+
+    # 権限チェック（作成者または管理者のみ）
+    if ctx.author.id != tournament['creator'].id and not ctx.author.guild_permissions.manage_messages:
+        await ctx.send("❌ トーナメント作成者または管理者のみメンバーを追加できます。")
+        return
+
+    # メンションされたユーザーを取得
+    mentioned_users = ctx.message.mentions
+    if not mentioned_users:
+        await ctx.send("❌ 追加するユーザーをメンションしてください。例: `!tournament add @ユーザー1 @ユーザー2`")
+        return
+
+    added_users = []
+    already_joined = []
+    tournament_full = []
+
+    for user in mentioned_users:
+        user_id = user.id
+
+        # 既に参加しているかチェック
+        if user_id in [p['user_id'] for p in tournament['participants']]:
+            already_joined.append(user.display_name)
+            continue
+
+        # 満員チェック
+        if len(tournament['participants']) >= tournament['max_participants']:
+            tournament_full.append(user.display_name)
+            continue
+
+        # 参加者として追加
+        participant = {
+            'user_id': user_id,
+            'user': user,
+            'joined_at': datetime.now(),
+            'wins': 0,
+            'losses': 0
+        }
+
+        tournament['participants'].append(participant)
+        state_store.mark_dirty('active_tournaments', guild_id)
+        added_users.append(user.display_name)
+
+    # 結果の報告
+    embed = discord.Embed(
+        title="👥 トーナメントメンバー追加結果",
+        color=0x00ff88
+    )
+
+    if added_users:
+        embed.add_field(
+            name="✅ 追加成功",
+            value="\n".join([f"• {name}" for name in added_users]),
+            inline=False
+        )
+
+    if already_joined:
+        embed.add_field(
+            name="⚠️ 既に参加済み",
+            value="\n".join([f"• {name}" for name in already_joined]),
+            inline=False
+        )
+
+    if tournament_full:
+        embed.add_field(
+            name="❌ 満員のため追加不可",
+            value="\n".join([f"• {name}" for name in tournament_full]),
+            inline=False
+        )
+
+    current_count = len(tournament['participants'])
+    max_participants = tournament['max_participants']
+
+    embed.add_field(
+        name="📊 現在の状況",
+        value=f"**参加者数:** {current_count}/{max_participants}人\n"
+              f"**開始可能:** {'はい' if current_count >= 4 else 'いいえ（最低4人必要）'}",
+        inline=False
+    )
+
+    await ctx.send(embed=embed)
+
+    # トーナメントメッセージを更新（ボタン付きメッセージがある場合）
+    if 'message_id' in tournament:
+        try:
+            channel = ctx.channel
+            message = await channel.fetch_message(tournament['message_id'])
+            updated_embed = await create_tournament_embed(tournament, ctx.guild)
+            view = TournamentView(tournament['id'])
+            await message.edit(embed=updated_embed, view=view)
+            render_coordinator.invalidate(message.id)
+            view.message = message
+        except Exception as e:
+            print(f"トーナメントメッセージ更新エラー: {e}")
+
+
+class Tournaments(commands.Cog):
+    """ミニトーナメントのコマンド（トーナメントの状態とボタンは tournaments にあり、再読み込みしても消えない）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='tournament', aliases=['tourney'], help='ミニトーナメント開催（例: !tournament create シングル戦, !tournament join, !tournament bracket）')
+    @prevent_duplicate_execution
+    async def tournament_manager(self, ctx, action=None, *args):
+        """ミニトーナメント管理システム"""
+        try:
+            if not action:
+                # ヘルプ表示
+                embed = discord.Embed(
+                    title="🏆 トーナメント機能",
+                    description="ミニトーナメント開催・管理システム",
+                    color=0xffd700
+                )
+
+                embed.add_field(
+                    name="📝 基本コマンド",
+                    value="`!tournament create [形式]` - トーナメント作成\n"
+                          "`!tournament join` - 参加登録\n"
+                          "`!tournament leave` - 参加取消\n"
+                          "`!tournament start` - 開始\n"
+                          "`!tournament bracket` - ブラケット表示",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="⚔️ 試合管理",
+                    value="`!tournament result [勝者]` - 結果入力\n"
+                          "`!tournament next` - 次の試合\n"
+                          "`!tournament status` - 進行状況\n"
+                          "`!tournament end` - 終了",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="⚙️ 管理コマンド",
+                    value="`!tournament add @ユーザー` - メンバー手動追加",
+                    inline=False
+                )
+
+                embed.add_field(
+                    name="🎯 形式例",
+                    value="`!tournament create シングル戦` - シングル戦\n"
+                          "`!tournament create ダブル戦` - ダブル戦\n"
+                          "`!tournament create チーム戦` - チーム戦",
+                    inline=False
+                )
+
+                await ctx.send(embed=embed)
+                return
+
+            guild_id = ctx.guild.id
+
+            if action.lower() in ['create', 'new', '作成']:
+                await create_tournament(ctx, args)
+
+            elif action.lower() in ['join', 'j', '参加']:
+                await join_tournament(ctx)
+
+            elif action.lower() in ['leave', 'l', '離脱']:
+                await leave_tournament(ctx)
+
+            elif action.lower() in ['start', 'begin', '開始']:
+                await start_tournament(ctx)
+
+            elif action.lower() in ['bracket', 'br', 'ブラケット']:
+                await show_tournament_bracket(ctx)
+
+            elif action.lower() in ['status', 's', '状況']:
+                await show_tournament_status(ctx)
+
+            elif action.lower() in ['result', 'res', '結果']:
+                await input_match_result(ctx, args)
+
+            elif action.lower() in ['next', 'n', '次']:
+                await show_next_matches(ctx)
+
+            elif action.lower() in ['end', 'finish', '終了']:
+                await end_tournament(ctx)
+
+            elif action.lower() in ['add', 'invite', '追加', '招待']:
+                await add_to_tournament(ctx, args)
+
+            else:
+                await ctx.send("❌ 不明なアクション。`!tournament` でヘルプを確認してください。")
+
+        except Exception as e:
+            await ctx.send(f"❌ トーナメント機能でエラーが発生しました: {str(e)}")
+            print(f"トーナメント機能エラー: {e}")
+
+
+async def setup(bot):
+    await bot.add_cog(Tournaments(bot))
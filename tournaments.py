@@ -0,0 +1,505 @@
+import random
+from datetime import datetime
+
+import discord
+
+from recruits import format_datetime_display, parse_datetime_input, schedule_start_reminder
+from render_coordinator import render_coordinator
+from storage import state_store
+from ui_base import PersistentView, check_recruit_button, request_recruit_render
+
+# トーナメントの状態とView（!tournament の拡張機能とパネルで共有）
+active_tournaments = {}  # {guild_id: tournament_data}
+state_store.register('active_tournaments', active_tournaments)
+tournament_matches = {}  # {tournament_id: [match_data]}
+
+
+class TournamentView(PersistentView):
+    """トーナメント用UIボタン"""
+
+    custom_id_prefix = 'tournament'
+
+    def __init__(self, tournament_id=None):
+        super().__init__(tournament_id)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return await check_recruit_button(interaction, self.persistent_key, active_tournaments.get(interaction.guild.id))
+
+    async def on_timeout(self):
+        """タイムアウト時の処理"""
+        try:
+            # 全てのボタンを無効化
+            for item in self.children:
+                item.disabled = True
+
+            # メッセージが存在する場合のみ更新を試行
+            if hasattr(self, 'message') and self.message:
+                try:
+                    embed = discord.Embed(
+                        title="⏰ トーナメント募集タイムアウト",
+                        description="ボタンの有効期限が切れました。\nコマンドでの操作は引き続き可能です。",
+                        color=0xffa500
+                    )
+                    await self.message.edit(embed=embed, view=self)
+                except Exception as e:
+                    print(f"TournamentView メッセージ更新エラー: {e}")
+
+            print(f"TournamentView タイムアウト処理完了")
+        except Exception as e:
+            print(f"TournamentView タイムアウト処理エラー: {e}")
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
+        """エラーハンドリング"""
+        print(f"TournamentView エラー: {error}")
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+            else:
+                await interaction.followup.send("❌ 操作中にエラーが発生しました。しばらく待ってから再試行してください。", ephemeral=True)
+        except:
+            pass  # エラー通知に失敗しても継続
+
+    @discord.ui.button(label='参加', emoji='✅', style=discord.ButtonStyle.success)
+    async def join_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """参加ボタン"""
+        await interaction.response.defer()
+
+        guild_id = interaction.guild.id
+        user_id = interaction.user.id
+
+        if guild_id not in active_tournaments:
+            await interaction.followup.send("❌ アクティブなトーナメントがありません。", ephemeral=True)
+            return
+
+        tournament = active_tournaments[guild_id]
+
+        if tournament['status'] != 'registration':
+            await interaction.followup.send("❌ 現在参加登録を受け付けていません。", ephemeral=True)
+            return
+
+        if user_id in [p['user_id'] for p in tournament['participants']]:
+            await interaction.followup.send("⚠️ 既に参加登録済みです。", ephemeral=True)
+            return
+
+        if len(tournament['participants']) >= tournament['max_participants']:
+            await interaction.followup.send("❌ 参加者が満員です。", ephemeral=True)
+            return
+
+        # 参加登録
+        participant = {
+            'user_id': user_id,
+            'user': interaction.user,
+            'joined_at': datetime.now(),
+            'wins': 0,
+            'losses': 0
+        }
+
+        tournament['participants'].append(participant)
+        state_store.mark_dirty('active_tournaments', guild_id)
+
+        # トーナメントメッセージを更新
+        guild = interaction.guild
+        request_recruit_render(
+            interaction, self,
+            lambda: create_tournament_embed(tournament, guild),
+            "トーナメントに参加しました！", interaction.user.display_name,
+            lambda: f"({len(tournament['participants'])}/{tournament['max_participants']})"
+        )
+
+    @discord.ui.button(label='離脱', emoji='❌', style=discord.ButtonStyle.danger)
+    async def leave_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """離脱ボタン"""
+        await interaction.response.defer()
+
+        guild_id = interaction.guild.id
+        user_id = interaction.user.id
+
+        if guild_id not in active_tournaments:
+            await interaction.followup.send("❌ アクティブなトーナメントがありません。", ephemeral=True)
+            return
+
+        tournament = active_tournaments[guild_id]
+
+        if tournament['status'] != 'registration':
+            await interaction.followup.send("❌ 既に開始されているため離脱できません。", ephemeral=True)
+            return
+
+        # 参加者から削除
+        for i, participant in enumerate(tournament['participants']):
+            if participant['user_id'] == user_id:
+                del tournament['participants'][i]
+                state_store.mark_dirty('active_tournaments', guild_id)
+
+                # トーナメントメッセージを更新
+                guild = interaction.guild
+                request_recruit_render(
+                    interaction, self,
+                    lambda: create_tournament_embed(tournament, guild),
+                    "トーナメントから離脱しました。", interaction.user.display_name,
+                    lambda: f"({len(tournament['participants'])}/{tournament['max_participants']})"
+                )
+                return
+
+        await interaction.followup.send("❌ トーナメントに参加していません。", ephemeral=True)
+
+    @discord.ui.button(label='ステータス確認', emoji='📊', style=discord.ButtonStyle.secondary)
+    async def status_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """ステータス確認ボタン"""
+        await interaction.response.defer()
+
+        guild_id = interaction.guild.id
+
+        if guild_id not in active_tournaments:
+            await interaction.followup.send("❌ アクティブなトーナメントがありません。", ephemeral=True)
+            return
+
+        tournament = active_tournaments[guild_id]
+
+        status_map = {
+            'registration': '📝 参加者募集中',
+            'ongoing': '⚔️ 進行中',
+            'ended': '🏁 終了'
+        }
+
+        embed = discord.Embed(
+            title="📊 トーナメント詳細ステータス",
+            color=0x00aaff
+        )
+
+        embed.add_field(
+            name="基本情報",
+            value=f"**ステータス:** {status_map.get(tournament['status'], tournament['status'])}\n"
+                  f"**形式:** {tournament['tournament_type']}\n"
+                  f"**参加者:** {len(tournament['participants'])}/{tournament['max_participants']}人\n"
+                  f"**作成者:** {tournament['creator'].display_name}",
+            inline=True
+        )
+
+        # 参加者リスト
+        if tournament['participants']:
+            participants_list = []
+            for i, participant in enumerate(tournament['participants'], 1):
+                participants_list.append(f"{i}. {participant['user'].display_name}")
+
+            embed.add_field(
+                name="👥 参加者一覧",
+                value="\n".join(participants_list[:10]) + ("..." if len(participants_list) > 10 else ""),
+                inline=True
+            )
+
+        if tournament['status'] == 'ongoing':
+            current_round_matches = [m for m in tournament['bracket'] if m['round'] == tournament['current_round']]
+            pending_matches = [m for m in current_round_matches if m['status'] == 'pending']
+
+            embed.add_field(
+                name="進行状況",
+                value=f"**現在ラウンド:** {tournament['current_round']}\n"
+                      f"**待機中試合:** {len(pending_matches)}試合\n"
+                      f"**完了試合:** {len([m for m in tournament['bracket'] if m['status'] == 'completed'])}試合",
+                inline=False
+            )
+
+        embed.set_footer(text=f"ID: {tournament['id'][:8]} | 作成: {tournament['created_at'].strftime('%m/%d %H:%M')}")
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @discord.ui.button(label='開始', emoji='🏁', style=discord.ButtonStyle.primary)
+    async def start_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """開始ボタン（作成者のみ）"""
+        await interaction.response.defer()
+
+        guild_id = interaction.guild.id
+        user_id = interaction.user.id
+
+        if guild_id not in active_tournaments:
+            await interaction.followup.send("❌ アクティブなトーナメントがありません。", ephemeral=True)
+            return
+
+        tournament = active_tournaments[guild_id]
+
+        # 権限チェック
+        if user_id != tournament['creator'].id and not interaction.user.guild_permissions.manage_messages:
+            await interaction.followup.send("❌ トーナメント作成者または管理者のみ開始できます。", ephemeral=True)
+            return
+
+        if tournament['status'] != 'registration':
+            await interaction.followup.send("❌ 既に開始されているか、終了しています。", ephemeral=True)
+            return
+
+        participants = tournament['participants']
+
+        if len(participants) < 4:
+            await interaction.followup.send("❌ トーナメント開始には最低4人必要です。", ephemeral=True)
+            return
+
+        # ブラケット生成処理（start_tournament関数と同じロジック）
+        import math
+
+        # 2の累乗に調整
+        bracket_size = 2 ** math.ceil(math.log2(len(participants)))
+
+        # 参加者をシャッフル
+        shuffled_participants = participants.copy()
+        random.shuffle(shuffled_participants)
+
+        # 不戦勝者（BYE）を追加
+        while len(shuffled_participants) < bracket_size:
+            shuffled_participants.append(None)  # BYE
+
+        # 第1ラウンドの試合を作成
+        matches = []
+        match_id = 1
+
+        for i in range(0, len(shuffled_participants), 2):
+            player1 = shuffled_participants[i]
+            player2 = shuffled_participants[i + 1] if i + 1 < len(shuffled_participants) else None
+
+            match_data = {
+                'id': match_id,
+                'round': 1,
+                'player1': player1,
+                'player2': player2,
+                'winner': None,
+                'status': 'pending'  # pending, completed
+            }
+
+            # BYE の処理
+            if player1 and not player2:
+                match_data['winner'] = player1
+                match_data['status'] = 'completed'
+            elif player2 and not player1:
+                match_data['winner'] = player2
+                match_data['status'] = 'completed'
+
+            matches.append(match_data)
+            match_id += 1
+
+        tournament['bracket'] = matches
+        tournament['status'] = 'ongoing'
+        tournament['current_round'] = 1
+        state_store.mark_dirty('active_tournaments', tournament['guild_id'])
+
+        embed = discord.Embed(
+            title="🏁 トーナメント開始！",
+            description=f"**{tournament['tournament_type']}** トーナメントが開始されました",
+            color=0xffd700
+        )
+
+        embed.add_field(
+            name="📊 情報",
+            value=f"**参加者数:** {len([p for p in participants if p])}人\n"
+                  f"**第1ラウンド試合数:** {len([m for m in matches if m['status'] == 'pending'])}試合\n"
+                  f"**形式:** シングルエリミネーション",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🎯 次のステップ",
+            value="`!tournament bracket` - ブラケット確認\n"
+                  "`!tournament next` - 次の試合確認\n"
+                  "`!tournament result @勝者` - 結果入力",
+            inline=False
+        )
+
+        # ボタンを無効化
+        for item in self.children:
+            item.disabled = True
+
+        await render_coordinator.settle(interaction.message.id)
+        await interaction.edit_original_response(embed=embed, view=self)
+        await interaction.followup.send("🎉 トーナメントが開始されました！", ephemeral=False)
+
+
+async def create_tournament_embed(tournament, guild):
+    """トーナメント募集のEmbed作成"""
+    # 参加者リスト作成
+    participants_list = []
+
+    for participant in tournament['participants']:
+        participants_list.append(f"• {participant['user'].display_name}")
+
+    status_map = {
+        'registration': '📝 参加者募集中',
+        'ongoing': '⚔️ 進行中',
+        'ended': '🏁 終了'
+    }
+
+    current_count = len(tournament['participants'])
+    max_participants = tournament['max_participants']
+
+    title = "🏆 トーナメント募集"
+    if current_count >= 4:
+        title = "🎉 トーナメント募集（開始可能）"
+    if current_count >= max_participants:
+        title = "🔥 トーナメント募集（満員）"
+
+    embed = discord.Embed(
+        title=title,
+        description=f"**{tournament['tournament_type']}** の参加者を募集中",
+        color=0xffd700 if current_count >= 4 else 0x4a90e2
+    )
+
+    embed.add_field(
+        name="📊 募集情報",
+        value=f"**形式:** {tournament['tournament_type']}\n"
+              f"**最大人数:** {max_participants}人\n"
+              f"**最小開始人数:** 4人\n"
+              f"**現在の参加者:** {current_count}/{max_participants}人\n"
+              f"**開始予定:** {tournament.get('scheduled_time', '未設定')}\n"
+              f"**ステータス:** {status_map.get(tournament['status'], tournament['status'])}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="👥 参加者一覧",
+        value="\n".join(participants_list[:8]) + ("..." if len(participants_list) > 8 else "") if participants_list else "なし",
+        inline=True
+    )
+
+    if tournament.get('description'):
+        embed.add_field(
+            name="📝 詳細",
+            value=tournament['description'],
+            inline=False
+        )
+
+    if current_count >= 4:
+        embed.add_field(
+            name="🎯 開始可能",
+            value="開始ボタンまたは `!tournament start` で開始できます！",
+            inline=False
+        )
+
+    embed.set_footer(text=f"作成者: {tournament['creator'].display_name} | ID: {tournament['id'][:8]}")
+
+    return embed
+
+
+async def create_tournament(ctx, args):
+    """トーナメント作成"""
+    guild_id = ctx.guild.id
+
+    # 既存のトーナメントチェック
+    if guild_id in active_tournaments:
+        tournament = active_tournaments[guild_id]
+        if tournament['status'] != 'ended':
+            await ctx.send(f"❌ 既にトーナメントが進行中です。`!tournament end` で終了してください。")
+            return
+
+    # 形式解析
+    tournament_type = "シングル戦"
+    max_participants = 16
+    description = ""
+    scheduled_time = "未設定"
+    parsed_datetime = None
+
+    for arg in args:
+        if "ダブル" in arg or "double" in arg.lower():
+            tournament_type = "ダブル戦"
+        elif "チーム" in arg or "team" in arg.lower():
+            tournament_type = "チーム戦"
+        elif "シングル" in arg or "single" in arg.lower():
+            tournament_type = "シングル戦"
+        elif arg.isdigit() or ('人' in arg and arg.replace('人', '').isdigit()):
+            # 最大参加者数の指定
+            try:
+                max_participants = int(arg.replace('人', ''))
+                max_participants = min(max_participants, 64)  # 最大64人
+            except:
+                pass
+        elif any(char in arg for char in [':', '時', '/', '-']) or arg in ['今から', 'now', 'すぐ', '明日', '今日']:
+            # 時間・日付指定
+            if arg in ['今から', 'now', 'すぐ']:
+                scheduled_time = "今すぐ"
+                parsed_datetime = datetime.now()
+            else:
+                parsed_dt = parse_datetime_input(arg)
+                if parsed_dt:
+                    scheduled_time = format_datetime_display(parsed_dt)
+                    parsed_datetime = parsed_dt
+                else:
+                    scheduled_time = arg
+        else:
+            # 説明文
+            if description:
+                description += f" {arg}"
+            else:
+                description = arg
+
+    # トーナメントデータ作成
+    tournament_data = {
+        'id': f"{guild_id}_{int(datetime.now().timestamp())}",
+        'guild_id': guild_id,
+        'creator': ctx.author,
+        'created_at': datetime.now(),
+        'tournament_type': tournament_type,
+        'max_participants': max_participants,
+        'scheduled_time': scheduled_time,
+        'parsed_datetime': parsed_datetime,
+        'description': description,
+        'participants': [],
+        'status': 'registration',  # registration, ongoing, ended
+        'bracket': [],
+        'current_round': 0,
+        'matches': {}
+    }
+
+    active_tournaments[guild_id] = tournament_data
+    state_store.mark_dirty('active_tournaments', guild_id)
+
+    embed = discord.Embed(
+        title="🏆 トーナメント作成完了！",
+        description=f"**{tournament_type}** トーナメントの参加者募集を開始",
+        color=0xffd700
+    )
+
+    embed.add_field(
+        name="📊 基本情報",
+        value=f"**形式:** {tournament_type}\n"
+              f"**最大参加者:** {max_participants}人\n"
+              f"**現在の参加者:** 0人",
+        inline=True
+    )
+
+    embed.add_field(
+        name="📝 詳細",
+        value=description if description else "なし",
+        inline=True
+    )
+
+    embed.add_field(
+        name="🔧 操作方法",
+        value="`!tournament join` - 参加登録\n"
+              "`!tournament start` - 開始\n"
+              "`!tournament bracket` - ブラケット確認",
+        inline=False
+    )
+
+    # ボタン付き募集メッセージ作成
+    embed = await create_tournament_embed(tournament_data, ctx.guild)
+
+    # 操作方法を追加（ボタンとコマンド両方）
+    embed.add_field(
+        name="🔧 操作方法",
+        value="**ボタン操作:** 下のボタンをクリック\n"
+              "**コマンド操作:** `!tournament join/leave/status`",
+        inline=False
+    )
+
+    view = TournamentView(tournament_data['id'])
+    message = await ctx.send(content="@everyone", embed=embed, view=view)
+    tournament_data['message_id'] = message.id
+    state_store.mark_dirty('active_tournaments', guild_id)
+    view.message = message  # ビューにメッセージオブジェクトを保存
+
+    # 自動リマインダー設定
+    if scheduled_time != "未設定" and scheduled_time != "今すぐ":
+        schedule_tournament_reminder(ctx, tournament_data)
+
+
+def schedule_tournament_reminder(ctx, tournament_data):
+    """トーナメントリマインダーを登録（開始5分前）"""
+    schedule_start_reminder(f"tournament:{tournament_data['id']}", 'tournament', tournament_data.get('parsed_datetime'),
+                            channel_id=ctx.channel.id, guild_id=tournament_data['guild_id'],
+                            tournament_id=tournament_data['id'])
+
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+from urllib.parse import quote
+
+import aiohttp
+
+from metrics import metrics
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
+TRACKER_BASE_URL = "https://api.tracker.gg/api/v2/valorant"
+
+# 接続プール設定
+TRACKER_CONNECTION_LIMIT = int(os.getenv('TRACKER_CONNECTION_LIMIT', '20'))
+TRACKER_LIMIT_PER_HOST = int(os.getenv('TRACKER_LIMIT_PER_HOST', '8'))
+TRACKER_KEEPALIVE_SECONDS = 60
+TRACKER_DNS_CACHE_SECONDS = 600
+TRACKER_TIMEOUT_SECONDS = 10
+
+# レスポンスキャッシュ設定（秒）
+PROFILE_CACHE_TTL = int(os.getenv('TRACKER_PROFILE_CACHE_TTL', '600'))
+MATCHES_CACHE_TTL = int(os.getenv('TRACKER_MATCHES_CACHE_TTL', '180'))
+STALE_CACHE_TTL = 3600  # API制限時は期限切れから1時間まで古いデータで応答
+CACHE_MAX_ENTRIES = 256
+
+# ステータスコード別のエラーメッセージ
+STATUS_MESSAGES = {
+    404: "プレイヤーが見つかりません。Riot ID#Tagを確認してください。",
+    429: "API制限に達しています。しばらく待ってから再試行してください。",
+    403: "API認証エラー: API Keyを確認してください。",
+}
+
+
+def normalize_riot_id(name, tag):
+    """キャッシュキー用に Riot ID を正規化（大文字小文字・前後の空白を無視）"""
+    return f"{name.strip().casefold()}#{tag.strip().casefold()}"
+
+
+class TrackerClient:
+    """Tracker.gg APIクライアント（Bot起動中は1つのセッションを使い回す）"""
+
+    def __init__(self, api_key, base_url=TRACKER_BASE_URL):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._session = None
+        self._session_lock = None
+        self.headers = {
+            "TRN-Api-Key": api_key or "",
+            "User-Agent": "Discord Bot"
+        }
+        # エンドポイントごとのキャッシュ（キーは正規化した name#tag）
+        self.caches = {
+            'profile': TTLCache(CACHE_MAX_ENTRIES, PROFILE_CACHE_TTL, STALE_CACHE_TTL),
+            'matches': TTLCache(CACHE_MAX_ENTRIES, MATCHES_CACHE_TTL, STALE_CACHE_TTL),
+        }
+        # 同じURLへの同時リクエストは1回にまとめる
+        self.flight = SingleFlight('Tracker.gg')
+
+    # --- エンドポイント ---
+
+    def _riot_path(self, name, tag):
+        return f"{quote(name.strip(), safe='')}%23{quote(tag.strip(), safe='')}"
+
+    def profile_url(self, name, tag):
+        return f"{self.base_url}/standard/profile/riot/{self._riot_path(name, tag)}"
+
+    def matches_url(self, name, tag):
+        return f"{self.base_url}/standard/matches/riot/{self._riot_path(name, tag)}"
+
+    # --- セッション管理 ---
+
+    async def _get_session(self):
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=TRACKER_CONNECTION_LIMIT,
+                    limit_per_host=TRACKER_LIMIT_PER_HOST,
+                    keepalive_timeout=TRACKER_KEEPALIVE_SECONDS,
+                    ttl_dns_cache=TRACKER_DNS_CACHE_SECONDS,
+                    use_dns_cache=True,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=TRACKER_TIMEOUT_SECONDS)
+                )
+                print("🔌 Tracker.gg セッションを作成しました")
+        return self._session
+
+    async def close(self):
+        """セッションを閉じる（bot.close() から呼ばれる）"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            print("🔌 Tracker.gg セッションを閉じました")
+        self._session = None
+        self._session_lock = None
+
+    # --- リクエスト ---
+
+    async def fetch(self, url, timeout=None, endpoint='request'):
+        """GETしてJSONを返す。戻り値は (ステータス, データ, エラーメッセージ)"""
+        if not self.api_key:
+            return None, None, "Tracker.gg API Keyが設定されていません。"
+
+        started = time.perf_counter()
+        status, data, error = await self._fetch(url, timeout)
+        metrics.observe(
+            'tracker_request_duration_seconds',
+            time.perf_counter() - started,
+            endpoint=endpoint,
+            status=str(status) if status is not None else 'error'
+        )
+        return status, data, error
+
+    async def _fetch(self, url, timeout=None):
+        session = await self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        try:
+            async with session.get(url, timeout=request_timeout) as response:
+                if response.status == 200:
+                    return 200, await response.json(), None
+                message = STATUS_MESSAGES.get(response.status, f"API エラー: {response.status}")
+                return response.status, None, message
+        except asyncio.TimeoutError:
+            return None, None, "タイムアウト: サーバーへの接続がタイムアウトしました。"
+        except aiohttp.ClientConnectorError:
+            return None, None, "接続エラー: インターネット接続を確認してください。"
+        except Exception as e:
+            return None, None, f"接続エラー: {str(e)}"
+
+    async def _cached_fetch(self, endpoint, name, tag, url, timeout=None):
+        cache = self.caches[endpoint]
+        key = normalize_riot_id(name, tag)
+
+        data = cache.get(key)
+        if data is not None:
+            return data, None
+
+        # キャッシュと同じキーで統合する（URLは入力の大文字・小文字のままなので、表記違いも1回の通信にまとめる）
+        status, data, error = await self.flight.do((endpoint, key),
+                                                   lambda: self.fetch(url, timeout=timeout, endpoint=endpoint))
+        if status == 200:
+            cache.set(key, data)
+            return data, None
+
+        # API制限・通信エラー時は期限切れのキャッシュで応答
+        if status == 429 or status is None:
+            stale = cache.get_stale(key)
+            if stale is not None:
+                print(f"♻️ Tracker.gg {endpoint} の古いキャッシュで応答: {key} ({error})")
+                return stale, None
+        return None, error
+
+    async def get_profile(self, name, tag):
+        """プロフィール（統計）を取得。戻り値は (データ, エラー)"""
+        return await self._cached_fetch('profile', name, tag, self.profile_url(name, tag))
+
+    async def get_matches(self, name, tag):
+        """直近の試合履歴を取得。戻り値は (データ, エラー)"""
+        return await self._cached_fetch('matches', name, tag, self.matches_url(name, tag), timeout=15)
+
+    def peek_profile(self, name, tag):
+        """キャッシュ済みのプロフィールだけを返す（通信しない）。なければ None"""
+        return self.caches['profile'].peek(normalize_riot_id(name, tag))
+
+    def purge_cache(self):
+        """期限切れのキャッシュを削除し、削除件数を返す"""
+        return sum(cache.purge_expired() for cache in self.caches.values())
+
+    def cache_stats_text(self):
+        """!botstatus 用のキャッシュ統計"""
+        lines = []
+        for endpoint, cache in self.caches.items():
+            lines.append(
+                f"{endpoint}: ヒット率 {cache.hit_ratio * 100:.0f}% "
+                f"({cache.hits}/{cache.hits + cache.misses}) "
+                f"古いデータ応答 {cache.stale_hits} / {len(cache)}件"
+            )
+        return "\n".join(lines)
+
+
+# Bot全体で共有するクライアント（セッションはBot終了時に閉じる）
+tracker_client = TrackerClient(os.getenv('TRACKER_API_KEY'))
@@ -0,0 +1,277 @@
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from command_guard import prevent_duplicate_execution
+
+
+class Tracker(commands.Cog):
+    """Tracker.gg のVALORANT統計コマンド（クライアントは bot.tracker_client を共有）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='valorant', help='VALORANT統計を表示します（例: !valorant PlayerName#1234）')
+    @prevent_duplicate_execution
+    async def valorant_stats(self, ctx, *, riot_id=None):
+        """VALORANT統計表示コマンド"""
+        if not riot_id:
+            embed = discord.Embed(
+                title="❌ 使用方法",
+                description="**使用方法:** `!valorant RiotID#Tag`\n**例:** `!valorant SamplePlayer#1234`",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        if '#' not in riot_id:
+            embed = discord.Embed(
+                title="❌ フォーマットエラー",
+                description="Riot IDは `名前#タグ` の形式で入力してください。\n**例:** `SamplePlayer#1234`",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        try:
+            # Riot IDとタグを分離
+            username, tag = riot_id.split('#', 1)
+
+            # 取得中メッセージ
+            loading_msg = await ctx.send("🔍 VALORANT統計を取得中...")
+
+            # API呼び出し
+            data, error = await self.bot.tracker_client.get_profile(username, tag)
+
+            if error:
+                await loading_msg.edit(content=f"❌ {error}")
+                return
+
+            # データ解析
+            profile = data.get('data', {})
+            platform_info = profile.get('platformInfo', {})
+            user_info = profile.get('userInfo', {})
+            segments = profile.get('segments', [])
+
+            # メイン統計（Overview）
+            overview = None
+            for segment in segments:
+                if segment.get('type') == 'overview':
+                    overview = segment
+                    break
+
+            if not overview:
+                await loading_msg.edit(content="❌ 統計データが見つかりません。")
+                return
+
+            stats = overview.get('stats', {})
+
+            # Embed作成
+            embed = discord.Embed(
+                title=f"🎯 VALORANT 統計: {platform_info.get('platformUserHandle', riot_id)}",
+                color=discord.Color.red()  # VALORANTテーマカラー
+            )
+
+            # プロフィール情報
+            if user_info.get('avatarUrl'):
+                embed.set_thumbnail(url=user_info['avatarUrl'])
+
+            # ランク情報
+            rank_info = stats.get('rank', {})
+            if rank_info:
+                rank_name = rank_info.get('displayValue', 'Unranked')
+                rank_icon = rank_info.get('displayIcon')
+                embed.add_field(
+                    name="🏆 現在のランク",
+                    value=rank_name,
+                    inline=True
+                )
+                if rank_icon:
+                    embed.set_author(name="Current Rank", icon_url=rank_icon)
+
+            # Peak Rank（最高ランク）
+            peak_rank = stats.get('peakRank', {})
+            if peak_rank:
+                embed.add_field(
+                    name="⭐ 最高ランク",
+                    value=peak_rank.get('displayValue', 'Unknown'),
+                    inline=True
+                )
+
+            # 基本統計
+            if stats.get('kills'):
+                embed.add_field(
+                    name="💀 Total Kills",
+                    value=f"{stats['kills']['displayValue']:,}",
+                    inline=True
+                )
+
+            if stats.get('deaths'):
+                embed.add_field(
+                    name="☠️ Total Deaths", 
+                    value=f"{stats['deaths']['displayValue']:,}",
+                    inline=True
+                )
+
+            if stats.get('kDRatio'):
+                embed.add_field(
+                    name="📊 K/D Ratio",
+                    value=stats['kDRatio']['displayValue'],
+                    inline=True
+                )
+
+            if stats.get('timePlayed'):
+                embed.add_field(
+                    name="⏰ プレイ時間",
+                    value=stats['timePlayed']['displayValue'],
+                    inline=True
+                )
+
+            if stats.get('matchesPlayed'):
+                embed.add_field(
+                    name="🎮 総試合数",
+                    value=f"{stats['matchesPlayed']['displayValue']:,}",
+                    inline=True
+                )
+
+            if stats.get('wins'):
+                embed.add_field(
+                    name="🏅 勝利数",
+                    value=f"{stats['wins']['displayValue']:,}",
+                    inline=True
+                )
+
+            # Win Rate計算
+            if stats.get('wins') and stats.get('matchesPlayed'):
+                wins = stats['wins']['value']
+                matches = stats['matchesPlayed']['value']
+                if matches > 0:
+                    win_rate = (wins / matches) * 100
+                    embed.add_field(
+                        name="📈 勝率",
+                        value=f"{win_rate:.1f}%",
+                        inline=True
+                    )
+
+            # ヘッドショット率
+            if stats.get('headshotPct'):
+                embed.add_field(
+                    name="🎯 ヘッドショット率",
+                    value=stats['headshotPct']['displayValue'],
+                    inline=True
+                )
+
+            # 平均ダメージ
+            if stats.get('damagePerRound'):
+                embed.add_field(
+                    name="💥 ラウンド平均ダメージ",
+                    value=stats['damagePerRound']['displayValue'],
+                    inline=True
+                )
+
+            # フッター
+            embed.set_footer(
+                text=f"データ提供: Tracker.gg | リクエスト者: {ctx.author.display_name}",
+                icon_url="https://trackercdn.com/cdn/tracker.gg/favicon.ico"
+            )
+
+            await loading_msg.edit(content="", embed=embed)
+
+        except ValueError:
+            await ctx.send("❌ Riot IDの形式が正しくありません。`名前#タグ`の形式で入力してください。")
+        except Exception as e:
+            await loading_msg.edit(content=f"❌ エラーが発生しました: {str(e)}")
+
+    @commands.command(name='valorant_match', help='直近のVALORANT試合履歴を表示します（例: !valorant_match PlayerName#1234）')
+    @prevent_duplicate_execution
+    async def valorant_matches(self, ctx, *, riot_id=None):
+        try:
+            if not riot_id:
+                await ctx.send("❌ Riot IDを指定してください。例: `!valorant_match PlayerName#1234`")
+                return
+
+            # Riot IDをパース
+            if '#' not in riot_id:
+                await ctx.send("❌ 正しい形式で入力してください。例: `PlayerName#1234`")
+                return
+
+            name, tag = riot_id.split('#', 1)
+
+            # Typing開始
+            async with ctx.typing():
+                # プレイヤーの存在確認
+                data, error = await self.bot.tracker_client.get_profile(name, tag)
+                if error:
+                    await ctx.send(f"❌ プレイヤー '{riot_id}' が見つかりませんでした。")
+                    return
+
+                # 試合履歴を取得
+                matches_data, error = await self.bot.tracker_client.get_matches(name, tag)
+                if error:
+                    await ctx.send("❌ 試合履歴の取得に失敗しました。")
+                    return
+
+                if not matches_data.get('data'):
+                    await ctx.send("❌ 試合履歴が見つかりませんでした。")
+                    return
+
+                # 直近5試合を表示
+                matches = matches_data['data'][:5]
+
+                embed = discord.Embed(
+                    title=f"🎯 {name}#{tag} の直近試合履歴",
+                    color=0xff4654
+                )
+
+                for i, match in enumerate(matches, 1):
+                    metadata = match.get('metadata', {})
+                    segments = match.get('segments', [])
+
+                    if not segments:
+                        continue
+
+                    player_stats = segments[0].get('stats', {})
+
+                    # 試合結果
+                    result = "勝利 🏆" if metadata.get('result', {}).get('outcome') == 'victory' else "敗北 💀"
+
+                    # 基本情報
+                    map_name = metadata.get('mapName', '不明')
+                    mode_name = metadata.get('modeName', '不明')
+
+                    # スコア
+                    kills = player_stats.get('kills', {}).get('value', 0)
+                    deaths = player_stats.get('deaths', {}).get('value', 0)
+                    assists = player_stats.get('assists', {}).get('value', 0)
+
+                    # KD比
+                    kd_ratio = round(kills / max(deaths, 1), 2)
+
+                    # 日時
+                    match_date = metadata.get('timestamp')
+                    if match_date:
+                        match_time = datetime.fromisoformat(match_date.replace('Z', '+00:00'))
+                        time_str = match_time.strftime('%m/%d %H:%M')
+                    else:
+                        time_str = '不明'
+
+                    embed.add_field(
+                        name=f"試合 #{i} - {result}",
+                        value=f"🗺️ **{map_name}** ({mode_name})\n"
+                              f"📊 **K/D/A:** {kills}/{deaths}/{assists} (KD: {kd_ratio})\n"
+                              f"⏰ **日時:** {time_str}",
+                        inline=False
+                    )
+
+                    embed.add_field(name="", value="━━━━━━━━━━━━━━━━━━━━", inline=False)
+
+                embed.set_footer(text="📈 VALORANT統計 by Tracker.gg")
+                await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send(f"❌ エラーが発生しました: {str(e)}")
+
+
+async def setup(bot):
+    await bot.add_cog(Tracker(bot))
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """有効期限（TTL）付きのLRUキャッシュ
+
+    期限切れのエントリもすぐには捨てず、stale_ttl 秒の間は get_stale() で
+    取り出せる（API制限時に古いデータで応答するため）。
+    """
+
+    def __init__(self, maxsize, ttl, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()  # key -> (期限, 値)
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key, default=None):
+        """期限内の値を返す（アクセスしたエントリは最新扱いにする）"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, key, default=None):
+        """期限切れでも stale_ttl 内なら値を返す"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] + self.stale_ttl <= time.monotonic():
+            return default
+        self.stale_hits += 1
+        return entry[1]
+
+    def peek(self, key, default=None):
+        """期限切れ（stale_ttl 内）も含めて値を返す。統計やLRU順は変えない"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] + self.stale_ttl <= time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def purge_expired(self):
+        """stale_ttl も過ぎたエントリを削除し、削除件数を返す"""
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self._data.items() if expires + self.stale_ttl <= now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,71 @@
+import discord
+
+from metrics import metrics
+from render_coordinator import render_coordinator
+
+
+class InstrumentedView(discord.ui.View):
+    """ボタン・セレクトのコールバック時間を記録するView"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for item in self.children:
+            callback = getattr(item, 'callback', None)
+            if callback is None:
+                continue
+            name = getattr(getattr(callback, 'callback', callback), '__name__', type(item).__name__)
+            self.prepare_item(item, name)
+            item.callback = metrics.timed(
+                'bot_view_callback_duration_seconds', callback, view=type(self).__name__, callback=name
+            )
+
+    def prepare_item(self, item, name):
+        """各ボタン・セレクトの初期化時に呼ばれる（サブクラス用）"""
+        pass
+
+
+class PersistentView(InstrumentedView):
+    """再起動後もボタンが動くView（custom_id は「接頭辞:コールバック名[:募集ID]」で固定）"""
+
+    custom_id_prefix = None
+
+    def __init__(self, persistent_key=None):
+        self.persistent_key = persistent_key  # 募集・トーナメントのID（パネルは None）
+        super().__init__(timeout=None)
+
+    def prepare_item(self, item, name):
+        custom_id = f"{self.custom_id_prefix}:{name}"
+        if self.persistent_key is not None:
+            custom_id += f":{self.persistent_key}"
+        item.custom_id = custom_id
+
+
+class InstrumentedModal(discord.ui.Modal):
+    """送信処理（on_submit）の時間を記録するModal"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_submit = metrics.timed(
+            'bot_view_callback_duration_seconds', self.on_submit, view=type(self).__name__, callback='on_submit'
+        )
+
+
+async def check_recruit_button(interaction, recruit_id, current):
+    """終了済み・作り直し済みの募集メッセージのボタンを弾く（View.interaction_check 用）"""
+    if recruit_id is None or (current is not None and current.get('id') == recruit_id):
+        return True
+    await interaction.response.send_message("❌ この募集は終了しています。最新の募集メッセージのボタンを使ってください。", ephemeral=True)
+    return False
+
+
+def request_recruit_render(interaction, view, render, action, name, status):
+    """ボタン操作後の募集メッセージ更新と通知を依頼（状態は呼び出し側で更新済み）"""
+    render_coordinator.request(
+        interaction.message.id,
+        render=render,
+        edit=lambda embed: interaction.edit_original_response(embed=embed, view=view),
+        notify=interaction.followup.send,
+        notice=(action, name),
+        status=status
+    )
+
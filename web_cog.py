@@ -0,0 +1,99 @@
+import os
+from datetime import datetime
+
+from aiohttp import web
+from discord.ext import commands
+
+from ai_queue import ai_queue
+from command_guard import bot_stats
+from gemini_gateway import gemini_gateway
+from metrics import loop_lag_monitor, metrics
+from storage import state_store
+
+
+# Render.com Web Service対応のHTTPサーバー
+class WebServer(commands.Cog):
+    """ヘルスチェック・メトリクス用のHTTPサーバー（読み込みで起動、解除で停止）"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.runner = None
+
+    async def handle_health(self, request):
+        """ヘルスチェックエンドポイント"""
+        uptime = datetime.now() - bot_stats['start_time']
+        health_info = {
+            "status": "healthy",
+            "uptime_seconds": int(uptime.total_seconds()),
+            "bot_ready": not self.bot.is_closed(),
+            "commands_executed": bot_stats['commands_executed'],
+            "messages_processed": bot_stats['messages_processed'],
+            "errors_count": bot_stats['errors_count'],
+            "last_heartbeat": bot_stats['last_heartbeat'].isoformat()
+        }
+        return web.json_response(health_info)
+
+    async def handle_root(self, request):
+        """ルートエンドポイント"""
+        return web.Response(text="Discord Bot is running! 🤖", content_type="text/plain")
+
+    async def handle_ping(self, request):
+        """Pingエンドポイント"""
+        return web.json_response({"message": "pong", "timestamp": datetime.now().isoformat()})
+
+    async def handle_metrics(self, request):
+        """Prometheus形式のメトリクス（コマンド・View・外部APIの遅延ヒストグラム）"""
+        uptime = datetime.now() - bot_stats['start_time']
+        gauges = [
+            ("bot_uptime_seconds", "Seconds since the bot started", uptime.total_seconds()),
+            ("bot_commands_executed", "Commands completed successfully", bot_stats['commands_executed']),
+            ("bot_messages_processed", "Messages processed", bot_stats['messages_processed']),
+            ("bot_errors", "Errors recorded in bot_stats", bot_stats['errors_count']),
+            ("bot_event_loop_lag_last_seconds", "Most recent event loop lag sample", loop_lag_monitor.last),
+            ("bot_event_loop_lag_max_seconds", "Largest event loop lag since start", loop_lag_monitor.max),
+            ("gemini_in_flight", "Gemini calls running in worker threads", gemini_gateway.stats['in_flight']),
+            ("gemini_waiting", "Gemini calls waiting for a worker slot", gemini_gateway.stats['waiting']),
+            ("ai_queue_depth", "AI requests waiting in the priority queue", ai_queue.depth),
+            ("state_store_pending", "State changes not yet flushed to SQLite", state_store.pending),
+        ]
+        return web.Response(
+            text=metrics.render(gauges),
+            content_type="text/plain",
+            charset="utf-8"
+        )
+
+    def create_app(self):
+        """aiohttp Webアプリケーションを作成"""
+        app = web.Application()
+        app.router.add_get('/', self.handle_root)
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/ping', self.handle_ping)
+        app.router.add_get('/metrics', self.handle_metrics)
+        return app
+
+    async def cog_load(self):
+        """Webサーバーを起動"""
+        try:
+            port = int(os.environ.get('PORT', 8080))  # Render.comのポート
+
+            runner = web.AppRunner(self.create_app())
+            await runner.setup()
+
+            site = web.TCPSite(runner, '0.0.0.0', port)
+            await site.start()
+            self.runner = runner
+
+            print(f"🌐 HTTPサーバーが起動しました: ポート {port}")
+            print(f"📡 ヘルスチェック: http://localhost:{port}/health")
+        except Exception as e:
+            print(f"❌ Webサーバー起動エラー: {e}")
+
+    async def cog_unload(self):
+        """再読み込み時にポートを解放する"""
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+async def setup(bot):
+    await bot.add_cog(WebServer(bot))